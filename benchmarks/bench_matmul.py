@@ -0,0 +1,60 @@
+# Compara o produto denso em Python puro (transposto uma vez e em blocos) com a
+# implementação anterior, que chamava get_elemento no laço interno.
+#
+# Uso: python benchmarks/bench_matmul.py [--tamanhos 64 128 256 512 1024] [--bloco 256]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from calculadorap import MatrizGeral, definir_tamanho_bloco, usar_motor
+
+def mul_referencia(a, b):
+    resultado = MatrizGeral(a.linhas, b.colunas)
+    for i in range(a.linhas):
+        for j in range(b.colunas):
+            soma = 0.0
+            for k in range(a.colunas):
+                soma += a.get_elemento(i, k) * b.get_elemento(k, j)
+            resultado.dados[i * b.colunas + j] = soma
+    return resultado
+
+def matriz_aleatoria(n):
+    return MatrizGeral(n, n, [random.random() for _ in range(n * n)])
+
+def cronometrar(funcao, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do produto MatrizGeral * MatrizGeral em Python puro")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[64, 128, 256, 512, 1024])
+    parser.add_argument("--bloco", type=int, default=256, help="tamanho do bloco do produto em blocos")
+    parser.add_argument("--repeticoes", type=int, default=1)
+    parser.add_argument("--sem-referencia", action="store_true", help="não executa a implementação anterior")
+    args = parser.parse_args()
+
+    definir_tamanho_bloco(args.bloco)
+    print(f"{'n':>6} {'anterior (s)':>14} {'em blocos (s)':>14} {'aceleração':>11}")
+    with usar_motor("python"):
+        for n in args.tamanhos:
+            a, b = matriz_aleatoria(n), matriz_aleatoria(n)
+            t_novo, c = cronometrar(lambda: a * b, args.repeticoes)
+            if args.sem_referencia:
+                print(f"{n:>6} {'-':>14} {t_novo:>14.4f} {'-':>11}")
+                continue
+            t_ref, r = cronometrar(lambda: mul_referencia(a, b), args.repeticoes)
+            erro = max(abs(x - y) for x, y in zip(c.dados, r.dados))
+            if erro > 1e-9 * n:
+                raise SystemExit(f"Resultados divergentes para n={n} (erro {erro})")
+            print(f"{n:>6} {t_ref:>14.4f} {t_novo:>14.4f} {t_ref / t_novo:>10.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# Mede todas as operações sobre o produto cartesiano dos tipos básicos (MatrizGeral,
+# MatrizDiagonal, MatrizTriangularInferior, MatrizTriangularSuperior): +, - e produto para
+# cada par de tipos; escalar, transposta (criação da vista e cópia com materializar()),
+# traço e determinante para cada tipo. Para cada caso registra o menor tempo entre as
+# repetições, o pico de memória (tracemalloc) e os blocos de memória alocados e ainda
+# vivos ao fim da operação (o resultado e o que ele retém). Cada repetição executa a
+# operação quantas vezes for preciso para durar pelo menos --duracao segundos, para que
+# operações de microssegundos não fiquem abaixo da resolução do relógio.
+#
+# O resultado pode ser gravado em JSON (--saida) e comparado com uma execução anterior
+# (--referencia): casos mais lentos ou com pico maior que a tolerância são marcados como
+# regressão e o script termina com código 1. Os tempos são comparados em unidades de um
+# caso de calibração (um laço fixo em Python puro medido na mesma execução), o que
+# desconta a velocidade da máquina e boa parte da variação de carga. Sem --motor, a
+# comparação usa o motor registrado na referência.
+#
+# benchmarks/referencia.json é a referência versionada, medida com o motor python nos
+# tamanhos padrão. Para verificar regressões:
+#     python benchmarks/bench_operacoes.py --referencia benchmarks/referencia.json
+# Os picos de memória se repetem entre máquinas com a mesma versão do Python; os tempos, mesmo
+# calibrados, só de forma aproximada: ao trocar de máquina, ou depois de uma melhoria que
+# deva virar a nova base, regenere-a com
+#     python benchmarks/bench_operacoes.py --motor python --saida benchmarks/referencia.json
+#
+# Uso: python benchmarks/bench_operacoes.py [--tamanhos 32 64 128] [--motor python]
+#          [--saida atual.json] [--referencia base.json] [--tolerancia 1.0]
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from calculadorap import (MOTORES, MatrizDiagonal, MatrizGeral, MatrizTriangularInferior,
+                          MatrizTriangularSuperior, motor_atual, usar_motor)
+
+TIPOS = {
+    "geral": MatrizGeral,
+    "diagonal": MatrizDiagonal,
+    "inferior": MatrizTriangularInferior,
+    "superior": MatrizTriangularSuperior,
+}
+
+BINARIAS = {
+    "soma": lambda a, b: a + b,
+    "subtracao": lambda a, b: a - b,
+    "produto": lambda a, b: a * b,
+}
+
+UNARIAS = {
+    "escalar": lambda a: a * 2.5,
+    "transposta_vista": lambda a: a.transposta(),
+    "transposta": lambda a: a.transposta().materializar(),
+    "traco": lambda a: a.traço(),
+    "determinante": lambda a: a.determinante(),
+}
+
+def matriz_aleatoria(tipo, n):
+    if tipo is MatrizGeral:
+        return MatrizGeral(n, n, [random.uniform(-1, 1) for _ in range(n * n)])
+    if tipo is MatrizDiagonal:
+        return MatrizDiagonal(n, [random.uniform(1, 2) for _ in range(n)])
+    return tipo(n, [random.uniform(-1, 1) for _ in range(n * (n + 1) // 2)])
+
+def casos(nomes_tipos, operacoes):
+    for operacao in operacoes:
+        if operacao in BINARIAS:
+            for a in nomes_tipos:
+                for b in nomes_tipos:
+                    yield operacao, (a, b)
+        else:
+            for a in nomes_tipos:
+                yield operacao, (a,)
+
+def executar(funcao, operandos):
+    # Descarta caches das matrizes (ex.: a fatoração LU guardada pela MatrizGeral)
+    for m in operandos:
+        m.marcar_modificada()
+    return funcao(*operandos)
+
+def calibracao():
+    # Laço fixo em Python puro: a unidade em que os tempos dos casos são comparados
+    return sum(i * i for i in range(10000))
+
+def rodar(funcao, operandos, vezes):
+    # Tempo por execução de vezes execuções seguidas
+    inicio = time.perf_counter()
+    for _ in range(vezes):
+        executar(funcao, operandos)
+    return (time.perf_counter() - inicio) / vezes
+
+def vezes_por_repeticao(funcao, operandos, duracao):
+    # Dobra vezes até que vezes execuções durem pelo menos duracao
+    vezes = 1
+    while rodar(funcao, operandos, vezes) * vezes < duracao:
+        vezes *= 2
+    return vezes
+
+def cronometrar(funcao, operandos, repeticoes, duracao):
+    # (menor tempo por execução, menor tempo da calibração) entre as repetições. A
+    # calibração é medida intercalada com o caso, para acompanhar a velocidade da máquina
+    # no mesmo momento em que o caso roda.
+    vezes = vezes_por_repeticao(funcao, operandos, duracao)
+    vezes_calibracao = vezes_por_repeticao(calibracao, [], duracao)
+    tempos, calibracoes = [], []
+    for _ in range(repeticoes):
+        calibracoes.append(rodar(calibracao, [], vezes_calibracao))
+        tempos.append(rodar(funcao, operandos, vezes))
+    return min(tempos), min(calibracoes)
+
+def medir_memoria(funcao, operandos):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.take_snapshot()
+        resultado = executar(funcao, operandos)
+        _, pico = tracemalloc.get_traced_memory()
+        depois = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocos = sum(max(s.count_diff, 0) for s in depois.compare_to(antes, "filename"))
+    del resultado
+    return pico, blocos
+
+def medir(tamanhos, nomes_tipos, operacoes, repeticoes, duracao):
+    resultados = []
+    for n in tamanhos:
+        matrizes = {nome: matriz_aleatoria(TIPOS[nome], n) for nome in nomes_tipos}
+        for operacao, tipos in casos(nomes_tipos, operacoes):
+            funcao = BINARIAS.get(operacao) or UNARIAS[operacao]
+            operandos = [matrizes[nome] for nome in tipos]
+            if len(operandos) == 2 and operandos[0] is operandos[1]:
+                operandos[1] = matriz_aleatoria(TIPOS[tipos[1]], n)
+            tempo, unidade = cronometrar(funcao, operandos, repeticoes, duracao)
+            pico, blocos = medir_memoria(funcao, operandos)
+            resultados.append({"operacao": operacao, "tipos": list(tipos), "n": n, "tempo": tempo,
+                               "calibracao": unidade, "pico_bytes": pico, "blocos": blocos})
+            print(f"{operacao:>12} {' x '.join(tipos):>20} {n:>6} {tempo:>12.6f} {pico:>12} {blocos:>8}",
+                  flush=True)
+    return resultados
+
+def chave(caso):
+    return caso["operacao"], tuple(caso["tipos"]), caso["n"]
+
+def comparar(resultados, referencia, tolerancia, tolerancia_memoria, tempo_minimo):
+    # Devolve (caso, campo, valor de referência) para cada regressão. O tempo de referência
+    # é convertido para a máquina atual pela razão entre as calibrações dos dois casos.
+    base = {chave(caso): caso for caso in referencia["resultados"]}
+    regressoes = []
+    for caso in resultados:
+        anterior = base.get(chave(caso))
+        if anterior is None:
+            continue
+        tempo_anterior = anterior["tempo"] * caso["calibracao"] / anterior["calibracao"]
+        # Tempos muito curtos variam demais para serem comparados
+        if max(caso["tempo"], tempo_anterior) >= tempo_minimo and \
+                caso["tempo"] > tempo_anterior * (1 + tolerancia):
+            regressoes.append((caso, "tempo", tempo_anterior))
+        if caso["pico_bytes"] > anterior["pico_bytes"] * (1 + tolerancia_memoria) + 1024:
+            regressoes.append((caso, "pico_bytes", anterior["pico_bytes"]))
+    return regressoes
+
+def resumo_tipos(resultados):
+    # Tempo total das operações binárias entre tipos iguais e entre tipos diferentes
+    print("\nOperações binárias por combinação de tipos (tempo total, s):")
+    print(f"{'n':>6} {'mesmo tipo':>12} {'tipos mistos':>13} {'mistos com geral':>17}")
+    for n in sorted({caso["n"] for caso in resultados}):
+        binarias = [c for c in resultados if c["n"] == n and len(c["tipos"]) == 2]
+        iguais = sum(c["tempo"] for c in binarias if c["tipos"][0] == c["tipos"][1])
+        mistos = [c for c in binarias if c["tipos"][0] != c["tipos"][1]]
+        com_geral = sum(c["tempo"] for c in mistos if "geral" in c["tipos"])
+        print(f"{n:>6} {iguais:>12.6f} {sum(c['tempo'] for c in mistos):>13.6f} {com_geral:>17.6f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de todas as operações entre os tipos de matriz")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--tipos", nargs="+", choices=list(TIPOS), default=list(TIPOS))
+    parser.add_argument("--operacoes", nargs="+", choices=list(BINARIAS) + list(UNARIAS),
+                        default=list(BINARIAS) + list(UNARIAS))
+    parser.add_argument("--motor", choices=MOTORES,
+                        help="padrão: o da referência, se houver, ou o motor atual")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--duracao", type=float, default=0.02,
+                        help="duração mínima (s) de cada repetição (padrão 0.02)")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", help="grava os resultados em JSON neste arquivo")
+    parser.add_argument("--referencia", help="JSON de uma execução anterior para comparação")
+    # Medido na máquina compartilhada que gravou a referência: entre execuções do código
+    # inalterado, a razão de tempo calibrada de cada caso variou entre 0.78 e 1.36; o padrão
+    # deixa margem para outras máquinas e ainda pega mudanças de complexidade
+    parser.add_argument("--tolerancia", type=float, default=1.0,
+                        help="aumento relativo de tempo tolerado antes de marcar regressão (padrão 1.0)")
+    parser.add_argument("--tolerancia-memoria", type=float, default=0.1,
+                        help="aumento relativo do pico de memória tolerado (padrão 0.1)")
+    parser.add_argument("--tempo-minimo", type=float, default=1e-3,
+                        help="tempos abaixo deste valor (s) não são comparados")
+    args = parser.parse_args()
+
+    referencia = None
+    if args.referencia:
+        with open(args.referencia) as arquivo:
+            referencia = json.load(arquivo)
+    if args.motor is None:
+        args.motor = referencia["ambiente"].get("motor", motor_atual()) if referencia else motor_atual()
+
+    random.seed(args.semente)
+    print(f"{'operação':>12} {'tipos':>20} {'n':>6} {'tempo (s)':>12} {'pico (B)':>12} {'blocos':>8}")
+    with usar_motor(args.motor):
+        resultados = medir(args.tamanhos, args.tipos, args.operacoes, args.repeticoes, args.duracao)
+    resumo_tipos(resultados)
+
+    relatorio = {
+        "ambiente": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "motor": args.motor,
+            "repeticoes": args.repeticoes,
+            "duracao": args.duracao,
+        },
+        "resultados": resultados,
+    }
+    if args.saida:
+        with open(args.saida, "w") as arquivo:
+            json.dump(relatorio, arquivo, indent=2)
+        print(f"\nResultados gravados em {args.saida}")
+
+    if referencia is not None:
+        if referencia["ambiente"].get("motor") != args.motor:
+            print(f"Aviso: referência medida com o motor {referencia['ambiente'].get('motor')}")
+        regressoes = comparar(resultados, referencia, args.tolerancia, args.tolerancia_memoria,
+                              args.tempo_minimo)
+        if not regressoes:
+            print("\nNenhuma regressão em relação à referência")
+            return 0
+        print(f"\n{len(regressoes)} regressão(ões) em relação à referência:")
+        for caso, campo, anterior in regressoes:
+            atual = caso[campo]
+            variacao = f" ({atual / anterior - 1:+.0%})" if anterior else ""
+            print(f"  {caso['operacao']} {' x '.join(caso['tipos'])} n={caso['n']}: "
+                  f"{campo} {anterior:.6g} -> {atual:.6g}{variacao}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
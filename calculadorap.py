@@ -1,557 +1,4375 @@
-from abc import ABC, abstractmethod
-from typing import List
-import copy
-
-class Matriz(ABC):
-    def __init__(self, linhas: int, colunas: int, nome: str = ""):
-        self.linhas = linhas
-        self.colunas = colunas
-        self.nome = nome
-
-    @abstractmethod
-    def __add__(self, other):
-        pass
-
-    @abstractmethod
-    def __sub__(self, other):
-        pass
-
-    @abstractmethod
-    def __mul__(self, other):
-        pass
-
-    @abstractmethod
-    def transposta(self):
-        pass
-
-    @abstractmethod
-    def imprimir(self):
-        pass
-
-    def eh_quadrada(self):
-        return self.linhas == self.colunas
-
-    def tipo(self):
-        return self.__class__.__name__
-
-    def traço(self):
-        raise NotImplementedError("Traço só para matrizes quadradas")
-
-    def determinante(self):
-        raise NotImplementedError("Determinante só para matrizes triangulares")
-
-    def get_elemento(self, i, j):
-        raise NotImplementedError
-
-class MatrizGeral(Matriz):
-    def __init__(self, linhas: int, colunas: int, dados: List[List[float]] = None, nome: str = ""):
-        super().__init__(linhas, colunas, nome)
-        if dados:
-            self.dados = dados
-        else:
-            self.dados = [[0.0]*colunas for _ in range(linhas)]
-
-    def __add__(self, other):
-        if not isinstance(other, Matriz):
-            raise TypeError("Operação somente entre matrizes")
-        if self.linhas != other.linhas or self.colunas != other.colunas:
-            raise ValueError("Dimensões incompatíveis para soma")
-        if type(self) == type(other):
-            return self.soma_especializada(other)
-        resultado = MatrizGeral(self.linhas, self.colunas)
-        for i in range(self.linhas):
-            for j in range(self.colunas):
-                resultado.dados[i][j] = self.dados[i][j] + other.get_elemento(i, j)
-        return resultado
-
-    def soma_especializada(self, other):
-        resultado = MatrizGeral(self.linhas, self.colunas)
-        for i in range(self.linhas):
-            for j in range(self.colunas):
-                resultado.dados[i][j] = self.dados[i][j] + other.dados[i][j]
-        return resultado
-
-    def __sub__(self, other):
-        if self.linhas != other.linhas or self.colunas != other.colunas:
-            raise ValueError("Dimensões incompatíveis para subtração")
-        resultado = MatrizGeral(self.linhas, self.colunas)
-        for i in range(self.linhas):
-            for j in range(self.colunas):
-                resultado.dados[i][j] = self.dados[i][j] - other.get_elemento(i, j)
-        return resultado
-
-    def __mul__(self, other):
-        if isinstance(other, (int, float)):
-            resultado = MatrizGeral(self.linhas, self.colunas)
-            for i in range(self.linhas):
-                for j in range(self.colunas):
-                    resultado.dados[i][j] = self.dados[i][j] * other
-            return resultado
-        elif isinstance(other, Matriz):
-            if self.colunas != other.linhas:
-                raise ValueError("Dimensões incompatíveis para multiplicação")
-            resultado = MatrizGeral(self.linhas, other.colunas)
-            for i in range(self.linhas):
-                for j in range(other.colunas):
-                    soma = 0.0
-                    for k in range(self.colunas):
-                        soma += self.dados[i][k] * other.get_elemento(k, j)
-                    resultado.dados[i][j] = soma
-            return resultado
-        else:
-            raise TypeError("Multiplicação inválida")
-
-    def transposta(self):
-        resultado = MatrizGeral(self.colunas, self.linhas)
-        for i in range(self.linhas):
-            for j in range(self.colunas):
-                resultado.dados[j][i] = self.dados[i][j]
-        return resultado
-
-    def get_elemento(self, i, j):
-        return self.dados[i][j]
-
-    def imprimir(self):
-        print(f"Matriz {self.nome} ({self.tipo()} {self.linhas}x{self.colunas}):")
-        for linha in self.dados:
-            print(" ".join(f"{x:.2f}" for x in linha))
-
-    def traço(self):
-        if not self.eh_quadrada():
-            raise ValueError("Traço só definido para matrizes quadradas")
-        soma = 0.0
-        for i in range(self.linhas):
-            soma += self.dados[i][i]
-        return soma
-
-class MatrizDiagonal(Matriz):
-    def __init__(self, n: int, diagonal: List[float] = None, nome: str = ""):
-        super().__init__(n, n, nome)
-        if diagonal:
-            self.diagonal = diagonal
-        else:
-            self.diagonal = [0.0]*n
-
-    def __add__(self, other):
-        if not isinstance(other, MatrizDiagonal):
-            return MatrizGeral(self.linhas, self.colunas, self.to_array()) + other
-        if self.linhas != other.linhas:
-            raise ValueError("Dimensões incompatíveis para soma")
-        resultado = MatrizDiagonal(self.linhas)
-        for i in range(self.linhas):
-            resultado.diagonal[i] = self.diagonal[i] + other.diagonal[i]
-        return resultado
-
-    def __sub__(self, other):
-        if not isinstance(other, MatrizDiagonal):
-            return MatrizGeral(self.linhas, self.colunas, self.to_array()) - other
-        if self.linhas != other.linhas:
-            raise ValueError("Dimensões incompatíveis para subtração")
-        resultado = MatrizDiagonal(self.linhas)
-        for i in range(self.linhas):
-            resultado.diagonal[i] = self.diagonal[i] - other.diagonal[i]
-        return resultado
-
-    def __mul__(self, other):
-        if isinstance(other, (int, float)):
-            resultado = MatrizDiagonal(self.linhas)
-            for i in range(self.linhas):
-                resultado.diagonal[i] = self.diagonal[i] * other
-            return resultado
-        elif isinstance(other, MatrizDiagonal):
-            if self.linhas != other.linhas:
-                raise ValueError("Dimensões incompatíveis para multiplicação")
-            resultado = MatrizDiagonal(self.linhas)
-            for i in range(self.linhas):
-                resultado.diagonal[i] = self.diagonal[i] * other.diagonal[i]
-            return resultado
-        else:
-            return MatrizGeral(self.linhas, self.colunas, self.to_array()) * other
-
-    def transposta(self):
-        return copy.deepcopy(self)
-
-    def traço(self):
-        return sum(self.diagonal)
-
-    def determinante(self):
-        prod = 1.0
-        for val in self.diagonal:
-            prod *= val
-        return prod
-
-    def get_elemento(self, i, j):
-        if i == j:
-            return self.diagonal[i]
-        else:
-            return 0.0
-
-    def to_array(self):
-        matriz = [[0.0]*self.colunas for _ in range(self.linhas)]
-        for i in range(self.linhas):
-            matriz[i][i] = self.diagonal[i]
-        return matriz
-
-    def imprimir(self):
-        print(f"Matriz {self.nome} ({self.tipo()} {self.linhas}x{self.colunas}):")
-        for i in range(self.linhas):
-            linha = []
-            for j in range(self.colunas):
-                linha.append(f"{self.diagonal[i]:.2f}" if i == j else "0.00")
-            print(" ".join(linha))
-
-class MatrizTriangularInferior(Matriz):
-    def __init__(self, n: int, dados: List[List[float]] = None, nome: str = ""):
-        super().__init__(n, n, nome)
-        if dados:
-            self.dados = dados
-        else:
-            self.dados = [[0.0]*(i+1) for i in range(n)]
-
-    def __add__(self, other):
-        if not isinstance(other, MatrizTriangularInferior):
-            return MatrizGeral(self.linhas, self.colunas, self.to_array()) + other
-        if self.linhas != other.linhas:
-            raise ValueError("Dimensões incompatíveis para soma")
-        resultado = MatrizTriangularInferior(self.linhas)
-        for i in range(self.linhas):
-            for j in range(i+1):
-                resultado.dados[i][j] = self.dados[i][j] + other.dados[i][j]
-        return resultado
-
-    def __sub__(self, other):
-        if not isinstance(other, MatrizTriangularInferior):
-            return MatrizGeral(self.linhas, self.colunas, self.to_array()) - other
-        if self.linhas != other.linhas:
-            raise ValueError("Dimensões incompatíveis para subtração")
-        resultado = MatrizTriangularInferior(self.linhas)
-        for i in range(self.linhas):
-            for j in range(i+1):
-                resultado.dados[i][j] = self.dados[i][j] - other.dados[i][j]
-        return resultado
-
-    def __mul__(self, other):
-        if isinstance(other, (int, float)):
-            resultado = MatrizTriangularInferior(self.linhas)
-            for i in range(self.linhas):
-                for j in range(i+1):
-                    resultado.dados[i][j] = self.dados[i][j] * other
-            return resultado
-        else:
-            return MatrizGeral(self.linhas, self.colunas, self.to_array()) * other
-
-    def transposta(self):
-        resultado = MatrizTriangularSuperior(self.linhas)
-        for i in range(self.linhas):
-            for j in range(i+1):
-                resultado.dados[j][i] = self.dados[i][j]
-        return resultado
-
-    def traço(self):
-        return sum(self.dados[i][i] for i in range(self.linhas))
-
-    def determinante(self):
-        prod = 1.0
-        for i in range(self.linhas):
-            prod *= self.dados[i][i]
-        return prod
-
-    def get_elemento(self, i, j):
-        if j <= i:
-            return self.dados[i][j]
-        else:
-            return 0.0
-
-    def to_array(self):
-        matriz = [[0.0]*self.colunas for _ in range(self.linhas)]
-        for i in range(self.linhas):
-            for j in range(i+1):
-                matriz[i][j] = self.dados[i][j]
-        return matriz
-
-    def imprimir(self):
-        print(f"Matriz {self.nome} ({self.tipo()} {self.linhas}x{self.colunas}):")
-        for i in range(self.linhas):
-            linha = []
-            for j in range(self.colunas):
-                linha.append(f"{self.dados[i][j]:.2f}" if j <= i else "0.00")
-            print(" ".join(linha))
-
-class MatrizTriangularSuperior(Matriz):
-    def __init__(self, n: int, dados: List[List[float]] = None, nome: str = ""):
-        super().__init__(n, n, nome)
-        if dados:
-            self.dados = dados
-        else:
-            self.dados = [[0.0]*(n - i) for i in range(n)]
-
-    def __add__(self, other):
-        if not isinstance(other, MatrizTriangularSuperior):
-            return MatrizGeral(self.linhas, self.colunas, self.to_array()) + other
-        if self.linhas != other.linhas:
-            raise ValueError("Dimensões incompatíveis para soma")
-        resultado = MatrizTriangularSuperior(self.linhas)
-        for i in range(self.linhas):
-            for j in range(self.colunas - i):
-                resultado.dados[i][j] = self.dados[i][j] + other.dados[i][j]
-        return resultado
-
-    def __sub__(self, other):
-        if not isinstance(other, MatrizTriangularSuperior):
-            return MatrizGeral(self.linhas, self.colunas, self.to_array()) - other
-        if self.linhas != other.linhas:
-            raise ValueError("Dimensões incompatíveis para subtração")
-        resultado = MatrizTriangularSuperior(self.linhas)
-        for i in range(self.linhas):
-            for j in range(self.colunas - i):
-                resultado.dados[i][j] = self.dados[i][j] - other.dados[i][j]
-        return resultado
-
-    def __mul__(self, other):
-        if isinstance(other, (int, float)):
-            resultado = MatrizTriangularSuperior(self.linhas)
-            for i in range(self.linhas):
-                for j in range(self.colunas - i):
-                    resultado.dados[i][j] = self.dados[i][j] * other
-            return resultado
-        else:
-            return MatrizGeral(self.linhas, self.colunas, self.to_array()) * other
-
-    def transposta(self):
-        resultado = MatrizTriangularInferior(self.linhas)
-        for i in range(self.linhas):
-            for j in range(self.colunas - i):
-                resultado.dados[j][i] = self.dados[i][j]
-        return resultado
-
-    def traço(self):
-        soma = 0.0
-        for i in range(self.linhas):
-            soma += self.dados[i][0] if i == 0 else self.dados[i][0] if i == 0 else self.dados[i][0]  # diagonal está no índice 0 da linha i
-        return soma
-
-    def determinante(self):
-        prod = 1.0
-        for i in range(self.linhas):
-            prod *= self.dados[i][0]  # diagonal principal está na posição 0 de cada linha
-        return prod
-
-    def get_elemento(self, i, j):
-        if j >= i:
-            return self.dados[i][j - i]
-        else:
-            return 0.0
-
-    def to_array(self):
-        matriz = [[0.0]*self.colunas for _ in range(self.linhas)]
-        for i in range(self.linhas):
-            for j in range(self.colunas - i):
-                matriz[i][j + i] = self.dados[i][j]
-        return matriz
-
-    def imprimir(self):
-        print(f"Matriz {self.nome} ({self.tipo()} {self.linhas}x{self.colunas}):")
-        for i in range(self.linhas):
-            linha = []
-            for j in range(self.colunas):
-                linha.append(f"{self.dados[i][j - i]:.2f}" if j >= i else "0.00")
-            print(" ".join(linha))
-
-class CalculadoraMatricial:
-    def __init__(self):
-        self.lista_matrizes = []
-
-    def inserir_matriz(self, matriz: Matriz):
-        self.lista_matrizes.append(matriz)
-
-    def remover_matriz(self, indice: int):
-        if 0 <= indice < len(self.lista_matrizes):
-            del self.lista_matrizes[indice]
-        else:
-            print("Índice inválido")
-
-    def imprimir_matriz(self, indice: int):
-        if 0 <= indice < len(self.lista_matrizes):
-            self.lista_matrizes[indice].imprimir()
-        else:
-            print("Índice inválido")
-
-    def listar_matrizes(self):
-        print("Lista de Matrizes:")
-        for idx, m in enumerate(self.lista_matrizes):
-            print(f"{idx}: {m.nome} - {m.tipo()} {m.linhas}x{m.colunas}")
-
-    def zerar_lista(self):
-        self.lista_matrizes.clear()
-
-    def inserir_identidade(self, n: int, nome: str = ""):
-        diag = [1.0]*n
-        identidade = MatrizDiagonal(n, diag, nome)
-        self.inserir_matriz(identidade)
-
-    def ler_matriz_teclado(self):
-        try:
-            tipo = input("Tipo (Geral, Diagonal, TriangularInferior, TriangularSuperior): ").strip()
-            nome = input("Nome da matriz: ").strip()
-            if tipo.lower() == "geral":
-                m = int(input("Número de linhas: "))
-                n = int(input("Número de colunas: "))
-                dados = []
-                print(f"Digite os elementos da matriz {m}x{n} linha por linha:")
-                for _ in range(m):
-                    linha = list(map(float, input().split()))
-                    if len(linha) != n:
-                        raise ValueError("Número de elementos inválido na linha")
-                    dados.append(linha)
-                matriz = MatrizGeral(m, n, dados, nome)
-            elif tipo.lower() == "diagonal":
-                n = int(input("Ordem da matriz diagonal (n x n): "))
-                diag = list(map(float, input(f"Digite os {n} elementos da diagonal principal: ").split()))
-                if len(diag) != n:
-                    raise ValueError("Número de elementos da diagonal inválido")
-                matriz = MatrizDiagonal(n, diag, nome)
-            elif tipo.lower() == "triangularinferior":
-                n = int(input("Ordem da matriz triangular inferior (n x n): "))
-                dados = []
-                print(f"Digite os elementos da matriz triangular inferior linha por linha (apenas elementos da parte inferior):")
-                for i in range(n):
-                    linha = list(map(float, input(f"Linha {i+1} (tamanho {i+1}): ").split()))
-                    if len(linha) != i+1:
-                        raise ValueError("Número de elementos inválido na linha")
-                    dados.append(linha)
-                matriz = MatrizTriangularInferior(n, dados, nome)
-            elif tipo.lower() == "triangul Superior".lower() or tipo.lower() == "triangularesuperior":
-                n = int(input("Ordem da matriz triangular superior (n x n): "))
-                dados = []
-                print(f"Digite os elementos da matriz triangular superior linha por linha (apenas elementos da parte superior):")
-                for i in range(n):
-                    linha = list(map(float, input(f"Linha {i+1} (tamanho {n - i}): ").split()))
-                    if len(linha) != n - i:
-                        raise ValueError("Número de elementos inválido na linha")
-                    dados.append(linha)
-                matriz = MatrizTriangularSuperior(n, dados, nome)
-            else:
-                print("Tipo inválido")
-                return
-            self.inserir_matriz(matriz)
-            print("Matriz inserida com sucesso!")
-        except Exception as e:
-            print(f"Erro na leitura da matriz: {e}")
-
-    def menu(self):
-        while True:
-            print("\n--- Calculadora Matricial ---")
-            print("1. Listar matrizes")
-            print("2. Imprimir matriz")
-            print("3. Inserir matriz do teclado")
-            print("4. Inserir matriz identidade")
-            print("5. Remover matriz")
-            print("6. Zerar lista")
-            print("7. Operações (Soma, Subtração, Multiplicação, Transposição, Traço, Determinante)")
-            print("0. Sair")
-            opc = input("Escolha uma opção: ")
-            if opc == "1":
-                self.listar_matrizes()
-            elif opc == "2":
-                idx = int(input("Índice da matriz para imprimir: "))
-                self.imprimir_matriz(idx)
-            elif opc == "3":
-                self.ler_matriz_teclado()
-            elif opc == "4":
-                try:
-                    n = int(input("Ordem da matriz identidade: "))
-                    nome = input("Nome da matriz identidade: ")
-                    self.inserir_identidade(n, nome)
-                    print("Matriz identidade inserida.")
-                except:
-                    print("Entrada inválida.")
-            elif opc == "5":
-                idx = int(input("Índice da matriz para remover: "))
-                self.remover_matriz(idx)
-            elif opc == "6":
-                self.zerar_lista()
-                print("Lista zerada.")
-            elif opc == "7":
-                self.menu_operacoes()
-            elif opc == "0":
-                print("Saindo...")
-                break
-            else:
-                print("Opção inválida.")
-
-    def menu_operacoes(self):
-        print("\n--- Operações ---")
-        print("1. Soma (C = A + B)")
-        print("2. Subtração (C = A - B)")
-        print("3. Multiplicação por escalar (C = a * A)")
-        print("4. Multiplicação matricial (C = A * B)")
-        print("5. Transposição")
-        print("6. Traço (matriz quadrada)")
-        print("7. Determinante (matriz triangular)")
-        print("0. Voltar")
-        opc = input("Escolha uma operação: ")
-        try:
-            if opc == "1":
-                a = int(input("Índice da matriz A: "))
-                b = int(input("Índice da matriz B: "))
-                C = self.lista_matrizes[a] + self.lista_matrizes[b]
-                nome = input("Nome para matriz resultado: ")
-                C.nome = nome
-                self.inserir_matriz(C)
-                print("Soma realizada e matriz inserida.")
-            elif opc == "2":
-                a = int(input("Índice da matriz A: "))
-                b = int(input("Índice da matriz B: "))
-                C = self.lista_matrizes[a] - self.lista_matrizes[b]
-                nome = input("Nome para matriz resultado: ")
-                C.nome = nome
-                self.inserir_matriz(C)
-                print("Subtração realizada e matriz inserida.")
-            elif opc == "3":
-                a = int(input("Índice da matriz A: "))
-                escalar = float(input("Valor escalar: "))
-                C = self.lista_matrizes[a] * escalar
-                nome = input("Nome para matriz resultado: ")
-                C.nome = nome
-                self.inserir_matriz(C)
-                print("Multiplicação por escalar realizada e matriz inserida.")
-            elif opc == "4":
-                a = int(input("Índice da matriz A: "))
-                b = int(input("Índice da matriz B: "))
-                C = self.lista_matrizes[a] * self.lista_matrizes[b]
-                nome = input("Nome para matriz resultado: ")
-                C.nome = nome
-                self.inserir_matriz(C)
-                print("Multiplicação matricial realizada e matriz inserida.")
-            elif opc == "5":
-                a = int(input("Índice da matriz A: "))
-                C = self.lista_matrizes[a].transposta()
-                nome = input("Nome para matriz resultado: ")
-                C.nome = nome
-                self.inserir_matriz(C)
-                print("Transposição realizada e matriz inserida.")
-            elif opc == "6":
-                a = int(input("Índice da matriz A: "))
-                matriz = self.lista_matrizes[a]
-                if matriz.eh_quadrada():
-                    print(f"Traço da matriz: {matriz.traço()}")
-                else:
-                    print("Matriz não é quadrada.")
-            elif opc == "7":
-                a = int(input("Índice da matriz A: "))
-                matriz = self.lista_matrizes[a]
-                try:
-                    det = matriz.determinante()
-                    print(f"Determinante da matriz: {det}")
-                except NotImplementedError:
-                    print("Determinante não implementado para este tipo de matriz.")
-            elif opc == "0":
-                return
-            else:
-                print("Opção inválida.")
-        except Exception as e:
-            print(f"Erro na operação: {e}")
-
-if __name__ == "__main__":
-    calc = CalculadoraMatricial()
-    calc.menu()
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager, redirect_stdout
+from functools import lru_cache
+from itertools import chain
+from operator import add, sub, mul
+from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import argparse
+import atexit
+import copy
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+import weakref
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Motor de cálculo: "numpy" ou "python" (ver definir_motor e usar_motor).
+MOTORES = ("python", "numpy")
+
+def _validar_motor(nome: str) -> str:
+    if nome not in MOTORES:
+        raise ValueError(f"Motor desconhecido: {nome} (opções: {', '.join(MOTORES)})")
+    if nome == "numpy" and np is None:
+        raise ValueError("Motor numpy indisponível: NumPy não está instalado")
+    return nome
+
+_motor = _validar_motor(os.environ.get("CALCULADORA_MOTOR", "numpy" if np is not None else "python"))
+
+# Lado dos blocos (em elementos) usado pelo produto denso em Python puro
+_tamanho_bloco = 256
+
+def definir_tamanho_bloco(tamanho: int):
+    global _tamanho_bloco
+    if tamanho < 1:
+        raise ValueError("Tamanho de bloco deve ser positivo")
+    _tamanho_bloco = tamanho
+
+def definir_motor(nome: str):
+    global _motor
+    _motor = _validar_motor(nome)
+
+def motor_atual() -> str:
+    return _motor
+
+@contextmanager
+def usar_motor(nome: str):
+    global _motor
+    anterior = _motor
+    _motor = _validar_motor(nome)
+    try:
+        yield
+    finally:
+        _motor = anterior
+
+# Paralelismo só no motor python, para MatrizGeral com pelo menos _limite_paralelo elementos.
+_trabalhadores = int(os.environ.get("CALCULADORA_TRABALHADORES", "0"))
+_limite_paralelo = 1_000_000
+_pool = None
+
+def definir_paralelismo(trabalhadores: int, limite: int = None):
+    global _trabalhadores, _limite_paralelo
+    if trabalhadores < 0:
+        raise ValueError("Número de trabalhadores não pode ser negativo")
+    if limite is not None:
+        if limite < 1:
+            raise ValueError("Limite de paralelismo deve ser positivo")
+        _limite_paralelo = limite
+    if trabalhadores != _trabalhadores:
+        _encerrar_pool()
+    _trabalhadores = trabalhadores
+
+def paralelismo_atual() -> tuple:
+    return _trabalhadores, _limite_paralelo
+
+@contextmanager
+def usar_paralelismo(trabalhadores: int, limite: int = None):
+    anterior = paralelismo_atual()
+    definir_paralelismo(trabalhadores, limite)
+    try:
+        yield
+    finally:
+        definir_paralelismo(*anterior)
+
+def _usar_paralelo(trabalho: int) -> bool:
+    return _trabalhadores > 1 and _motor == "python" and trabalho >= _limite_paralelo
+
+def _obter_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=_trabalhadores)
+    return _pool
+
+@atexit.register
+def _encerrar_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+# Tolerância de compactar() aplicada aos resultados de +, - e *
+_compactacao = float(os.environ["CALCULADORA_COMPACTAR"]) if os.environ.get("CALCULADORA_COMPACTAR") else None
+
+def definir_compactacao(tolerancia: float = 0.0):
+    global _compactacao
+    if tolerancia is not None and tolerancia < 0:
+        raise ValueError("Tolerância não pode ser negativa")
+    _compactacao = tolerancia
+
+def compactacao_atual():
+    return _compactacao
+
+@contextmanager
+def usar_compactacao(tolerancia: float = 0.0):
+    global _compactacao
+    anterior = _compactacao
+    definir_compactacao(tolerancia)
+    try:
+        yield
+    finally:
+        _compactacao = anterior
+
+def _buffer_float(valores, tamanho: int):
+    # array('d') e memoryviews 'd' são usados sem cópia.
+    if isinstance(valores, array) and valores.typecode == "d":
+        buffer = valores
+    elif isinstance(valores, memoryview) and valores.format == "d":
+        buffer = valores
+    else:
+        buffer = array("d", valores)
+    if len(buffer) != tamanho:
+        raise ValueError(f"Armazenamento com {len(buffer)} elementos, esperado {tamanho}")
+    return buffer
+
+def _nbytes(buffer):
+    return len(buffer) * buffer.itemsize
+
+def _eh_aninhada(dados):
+    return len(dados) > 0 and isinstance(dados[0], (list, tuple))
+
+_NP_OPERACOES = {add: np.add, sub: np.subtract, mul: np.multiply} if np is not None else {}
+
+def _np_vetor(buffer):
+    if isinstance(buffer, memoryview) and not buffer.contiguous:
+        return np.asarray(buffer)  # fatia com passo de um memoryview (ex.: coluna lida por uma vista)
+    return np.frombuffer(buffer, dtype=np.float64)
+
+def _combinar_buffers(x, y, operacao, destino=None):
+    # Elemento a elemento sobre o armazenamento empacotado; destino, se dado, recebe o resultado.
+    if _motor == "numpy":
+        resultado = array("d", bytes(8 * len(x))) if destino is None else destino
+        _NP_OPERACOES[operacao](_np_vetor(x), _np_vetor(y), out=_np_vetor(resultado))
+        return resultado
+    if destino is None:
+        return array("d", map(operacao, x, y))
+    destino[:] = array("d", map(operacao, x, y))
+    return destino
+
+def _escalar_buffer(x, escalar, destino=None):
+    if _motor == "numpy":
+        resultado = array("d", bytes(8 * len(x))) if destino is None else destino
+        np.multiply(_np_vetor(x), escalar, out=_np_vetor(resultado))
+        return resultado
+    if destino is None:
+        return array("d", [v * escalar for v in x])
+    destino[:] = array("d", [v * escalar for v in x])
+    return destino
+
+class Vetor:
+    # Vetor coluna denso sobre array('d'), devolvido por multiplicar_vetor e A @ x.
+    __slots__ = ("dados", "nome")
+
+    def __init__(self, n: int, dados: List[float] = None, nome: str = ""):
+        self.dados = array("d", bytes(8 * n)) if dados is None else _buffer_float(dados, n)
+        self.nome = nome
+
+    def __len__(self):
+        return len(self.dados)
+
+    def __getitem__(self, i):
+        return self.dados[i]
+
+    def __setitem__(self, i, valor):
+        self.dados[i] = valor
+
+    def __iter__(self):
+        return iter(self.dados)
+
+    def tolist(self):
+        return self.dados.tolist()
+
+    def _verificar(self, other, descricao):
+        if not isinstance(other, Vetor):
+            raise TypeError("Operação somente entre vetores")
+        if len(other) != len(self):
+            raise ValueError(f"Dimensões incompatíveis para {descricao}")
+
+    def __add__(self, other):
+        self._verificar(other, "soma")
+        return Vetor(len(self), _combinar_buffers(self.dados, other.dados, add))
+
+    def __sub__(self, other):
+        self._verificar(other, "subtração")
+        return Vetor(len(self), _combinar_buffers(self.dados, other.dados, sub))
+
+    def __mul__(self, other):
+        if not isinstance(other, (int, float)):
+            raise TypeError("Multiplicação inválida")
+        return Vetor(len(self), _escalar_buffer(self.dados, other))
+
+    __rmul__ = __mul__
+
+    def produto_interno(self, other) -> float:
+        self._verificar(other, "produto interno")
+        if _motor == "numpy":
+            return float(np.dot(_np_vetor(self.dados), _np_vetor(other.dados)))
+        return sum(map(mul, self.dados, other.dados))
+
+    def norma(self) -> float:
+        return self.produto_interno(self) ** 0.5
+
+    def tamanho_bytes(self):
+        return _nbytes(self.dados)
+
+    def imprimir(self):
+        print(f"Vetor {self.nome} ({len(self)}):")
+        print(" ".join(f"{v:.2f}" for v in self.dados))
+
+def _vetor_entrada(x, n):
+    # Buffer 'd' de um Vetor ou sequência de números com n elementos
+    dados = x.dados if isinstance(x, Vetor) else x
+    if len(dados) != n:
+        raise ValueError("Dimensões incompatíveis para multiplicação")
+    return _buffer_float(dados, n)
+
+def _dono_armazenamento(m):
+    # _dono aponta direto para a raiz, então não há cadeia a seguir.
+    return m if m._dono is None else m._dono
+
+class Matriz(ABC):
+    # _versao muda a cada alteração; com armazenamento compartilhado vale a do _dono.
+    __slots__ = ("linhas", "colunas", "nome", "_versao", "_dono", "__weakref__")
+
+    def __init__(self, linhas: int, colunas: int, nome: str = ""):
+        self.linhas = linhas
+        self.colunas = colunas
+        self.nome = nome
+        self._versao = 0
+        self._dono = None
+
+    @abstractmethod
+    def __add__(self, other):
+        pass
+
+    @abstractmethod
+    def __sub__(self, other):
+        pass
+
+    @abstractmethod
+    def __mul__(self, other):
+        pass
+
+    @abstractmethod
+    def transposta(self):
+        pass
+
+    @abstractmethod
+    def imprimir(self):
+        pass
+
+    def eh_quadrada(self):
+        return self.linhas == self.colunas
+
+    def tipo(self):
+        return self.__class__.__name__
+
+    def traço(self):
+        raise NotImplementedError("Traço só para matrizes quadradas")
+
+    def multiplicar_vetor(self, x):
+        # Genérico: y[i] += a_ij * x[j] só sobre os elementos armazenados (ver _entradas)
+        x = _vetor_entrada(x, self.colunas)
+        y = array("d", bytes(8 * self.linhas))
+        for i, j, v in _entradas(self):
+            y[i] += v * x[j]
+        return Vetor(self.linhas, y)
+
+    def multiplicar_vetores(self, vetores):
+        # Vetores empilhados como colunas de uma MatrizGeral.
+        vetores = [_vetor_entrada(x, self.colunas) for x in vetores]
+        k = len(vetores)
+        if not k:
+            return []
+        colunas = MatrizGeral(self.colunas, k)
+        for j, x in enumerate(vetores):
+            colunas.dados[j::k] = array("d", x)
+        resultado = multiplicar_matrizes(self, colunas)
+        if not isinstance(resultado, MatrizGeral):
+            resultado = _para_geral(resultado)
+        return [Vetor(self.linhas, array("d", resultado.dados[j::k])) for j in range(k)]
+
+    def __matmul__(self, other):
+        # A @ B, A @ x ou A @ [x1, x2, ...]
+        if isinstance(other, Matriz):
+            return multiplicar_matrizes(self, other)
+        if isinstance(other, (list, tuple)) and other and isinstance(other[0], (Vetor, list, tuple, array)):
+            return self.multiplicar_vetores(other)
+        if isinstance(other, (Vetor, list, tuple, array, memoryview)):
+            return self.multiplicar_vetor(other)
+        return NotImplemented
+
+    def determinante(self):
+        raise NotImplementedError(f"Determinante não disponível para {self.tipo()}")
+
+    def get_elemento(self, i, j):
+        raise NotImplementedError
+
+    def set_elemento(self, i, j, valor):
+        raise NotImplementedError(f"Alteração de elementos não disponível para {self.tipo()}")
+
+    def inversa(self):
+        return _para_geral(self).inversa()
+
+    def resolver(self, b):
+        return _para_geral(self).resolver(b)
+
+    def marcar_modificada(self):
+        # Deve ser chamado após alterar o armazenamento diretamente, para descartar caches
+        self._versao += 1
+        dono = _dono_armazenamento(self)
+        if dono is not self:
+            dono._versao += 1
+
+    def versao_dados(self):
+        return _dono_armazenamento(self)._versao
+
+    def adiar(self):
+        # Passa a montar um grafo de expressão (ver Expressao) em vez de calcular a cada operador
+        return _Folha(self)
+
+    def materializar(self):
+        # Matrizes concretas já têm armazenamento próprio; vistas (MatrizTransposta) o copiam
+        return self
+
+    def compactar(self, tolerancia: float = 0.0):
+        return compactar(self, tolerancia)
+
+    def __pow__(self, k):
+        return potencia(self, k)
+
+    def avaliar_polinomio(self, coeficientes):
+        return avaliar_polinomio(self, coeficientes)
+
+    def _transpor(self):
+        # Cópia explícita da transposta; as subclasses usam o próprio armazenamento
+        return MatrizGeral(self.colunas, self.linhas, [[self.get_elemento(i, j) for i in range(self.linhas)] for j in range(self.colunas)])
+
+    # Alteram o próprio armazenamento quando a estrutura comporta o resultado.
+    def __iadd__(self, other):
+        if isinstance(other, Matriz) and _cabe_em(other, self):
+            return somar(self, other, out=self)
+        return NotImplemented
+
+    def __isub__(self, other):
+        if isinstance(other, Matriz) and _cabe_em(other, self):
+            return subtrair(self, other, out=self)
+        return NotImplemented
+
+    def __imul__(self, other):
+        # In-place só nos tipos básicos; nos demais, NotImplemented faz o Python usar self * other
+        if isinstance(other, (int, float)) and type(self) in _TIPOS_BASICOS:
+            return multiplicar(self, other, out=self)
+        if isinstance(other, Matriz) and other.linhas == other.colunas == self.colunas and _cabe_em(other, self):
+            return multiplicar(self, other, out=self)
+        return NotImplemented
+
+    def __getstate__(self):
+        # memoryview (p.ex. mmap) não é serializável e é copiada para um array.
+        estado = {}
+        for classe in type(self).__mro__:
+            for atributo in getattr(classe, "__slots__", ()):
+                if atributo != "__weakref__" and hasattr(self, atributo):
+                    valor = getattr(self, atributo)
+                    estado[atributo] = array(valor.format, valor) if isinstance(valor, memoryview) else valor
+        return None, estado
+
+    def tamanho_bytes(self):
+        # Bytes ocupados pelo armazenamento dos elementos (as subclasses medem os próprios buffers)
+        return 8 * self.linhas * self.colunas
+
+    def to_array(self):
+        return [[self.get_elemento(i, j) for j in range(self.colunas)] for i in range(self.linhas)]
+
+class MatrizGeral(Matriz):
+    # Armazenamento por linhas; _lu guarda a fatoração usada por resolver().
+    __slots__ = ("dados", "_lu")
+
+    def __init__(self, linhas: int, colunas: int, dados: List[List[float]] = None, nome: str = ""):
+        super().__init__(linhas, colunas, nome)
+        self._lu = None
+        if dados:
+            if _eh_aninhada(dados):
+                dados = chain.from_iterable(dados)
+            self.dados = _buffer_float(dados, linhas * colunas)
+        else:
+            self.dados = array("d", bytes(8 * linhas * colunas))
+
+    def _linha(self, i):
+        inicio = i * self.colunas
+        return inicio, inicio + self.colunas, 0
+
+    def __add__(self, other):
+        if not isinstance(other, Matriz):
+            raise TypeError("Operação somente entre matrizes")
+        if self.linhas != other.linhas or self.colunas != other.colunas:
+            raise ValueError("Dimensões incompatíveis para soma")
+        if type(self) == type(other):
+            return _compactar_resultado(self.soma_especializada(other))
+        if _motor == "numpy" and _np_suporta(other):
+            resultado = MatrizGeral(self.linhas, self.colunas)
+            np.add(_np_denso(self), _np_denso(other), out=_np_denso(resultado))
+            return _compactar_resultado(resultado)
+        resultado = MatrizGeral(self.linhas, self.colunas, array("d", self.dados))
+        _acumular(resultado, other, add)
+        return _compactar_resultado(resultado)
+
+    def soma_especializada(self, other):
+        return _combinar_gerais(self, other, add)
+
+    def __sub__(self, other):
+        if self.linhas != other.linhas or self.colunas != other.colunas:
+            raise ValueError("Dimensões incompatíveis para subtração")
+        if type(self) == type(other):
+            return _compactar_resultado(_combinar_gerais(self, other, sub))
+        if _motor == "numpy" and _np_suporta(other):
+            resultado = MatrizGeral(self.linhas, self.colunas)
+            np.subtract(_np_denso(self), _np_denso(other), out=_np_denso(resultado))
+            return _compactar_resultado(resultado)
+        resultado = MatrizGeral(self.linhas, self.colunas, array("d", self.dados))
+        _acumular(resultado, other, sub)
+        return _compactar_resultado(resultado)
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return MatrizGeral(self.linhas, self.colunas, _escalar_buffer(self.dados, other))
+        elif isinstance(other, Matriz):
+            return multiplicar_matrizes(self, other)
+        else:
+            raise TypeError("Multiplicação inválida")
+
+    def transposta(self):
+        return MatrizTransposta(self)
+
+    def _transpor(self):
+        if _motor == "numpy":
+            resultado = MatrizGeral(self.colunas, self.linhas)
+            _np_denso(resultado)[:] = _np_denso(self).T
+            return resultado
+        if _usar_paralelo(self.linhas * self.colunas):
+            return _transpor_paralelo(self)
+        resultado = array("d")
+        for j in range(self.colunas):
+            resultado.extend(self.dados[j::self.colunas])
+        return MatrizGeral(self.colunas, self.linhas, resultado)
+
+    def get_elemento(self, i, j):
+        return self.dados[i * self.colunas + j]
+
+    def set_elemento(self, i, j, valor):
+        self.dados[i * self.colunas + j] = valor
+        self.marcar_modificada()
+
+    def to_array(self):
+        return [self.dados[i * self.colunas:(i + 1) * self.colunas].tolist() for i in range(self.linhas)]
+
+    def tamanho_bytes(self):
+        return _nbytes(self.dados)
+
+    def imprimir(self):
+        print(f"Matriz {self.nome} ({self.tipo()} {self.linhas}x{self.colunas}):")
+        for i in range(self.linhas):
+            inicio, fim, _ = self._linha(i)
+            print(" ".join(f"{x:.2f}" for x in self.dados[inicio:fim]))
+
+    def traço(self):
+        if not self.eh_quadrada():
+            raise ValueError("Traço só definido para matrizes quadradas")
+        return sum(self.dados[::self.colunas + 1])
+
+    def marcar_modificada(self):
+        super().marcar_modificada()
+        self._lu = None
+
+    def decomposicao_lu(self):
+        # P A = L U com pivoteamento parcial; P é devolvida como lista de índices de linha
+        if self._lu is None:
+            self._lu = _fatorar_lu(self)
+        permutacao, L, U, _ = self._lu
+        return list(permutacao), L, U
+
+    def multiplicar_vetor(self, x):
+        x = _vetor_entrada(x, self.colunas)
+        if _motor == "numpy":
+            y = Vetor(self.linhas)
+            np.matmul(_np_denso(self), _np_vetor(x), out=_np_vetor(y.dados))
+            return y
+        c, dados = self.colunas, self.dados
+        return Vetor(self.linhas, array("d", [sum(map(mul, dados[i * c:(i + 1) * c], x)) for i in range(self.linhas)]))
+
+    def determinante(self):
+        if not self.eh_quadrada():
+            raise ValueError("Determinante só definido para matrizes quadradas")
+        self.decomposicao_lu()
+        _, _, U, sinal = self._lu
+        return sinal * U.determinante()
+
+    def resolver(self, b):
+        self.decomposicao_lu()
+        permutacao, L, U, _ = self._lu
+
+        def resolver_coluna(x):
+            x = array("d", [x[p] for p in permutacao])
+            return U._substituicao(L._substituicao(x))
+        return _resolver_colunas(b, self.linhas, resolver_coluna)
+
+    def inversa(self):
+        return self.resolver(MatrizDiagonal(self.linhas, [1.0] * self.linhas))
+
+class MatrizDiagonal(Matriz):
+    # Armazenamento: array('d') com os n elementos da diagonal principal
+    __slots__ = ("diagonal",)
+
+    def __init__(self, n: int, diagonal: List[float] = None, nome: str = ""):
+        super().__init__(n, n, nome)
+        if diagonal:
+            self.diagonal = _buffer_float(diagonal, n)
+        else:
+            self.diagonal = array("d", bytes(8 * n))
+
+    def __add__(self, other):
+        if isinstance(other, MatrizEsparsa):
+            return MatrizEsparsa.de_matriz(self) + other
+        if isinstance(other, MatrizBanda):
+            return _como_banda(self) + other
+        if isinstance(other, MatrizSimetrica):
+            return _como_simetrica(self) + other
+        if type(other) is MatrizGeral:
+            return self._combinar_com_geral(other, array("d", other.dados), "soma")
+        if not isinstance(other, MatrizDiagonal):
+            return _para_geral(self) + other
+        if self.linhas != other.linhas:
+            raise ValueError("Dimensões incompatíveis para soma")
+        return MatrizDiagonal(self.linhas, _combinar_buffers(self.diagonal, other.diagonal, add))
+
+    def __sub__(self, other):
+        if isinstance(other, MatrizEsparsa):
+            return MatrizEsparsa.de_matriz(self) - other
+        if isinstance(other, MatrizBanda):
+            return _como_banda(self) - other
+        if isinstance(other, MatrizSimetrica):
+            return _como_simetrica(self) - other
+        if type(other) is MatrizGeral:
+            return self._combinar_com_geral(other, _escalar_buffer(other.dados, -1.0), "subtração")
+        if not isinstance(other, MatrizDiagonal):
+            return _para_geral(self) - other
+        if self.linhas != other.linhas:
+            raise ValueError("Dimensões incompatíveis para subtração")
+        return MatrizDiagonal(self.linhas, _combinar_buffers(self.diagonal, other.diagonal, sub))
+
+    def _combinar_com_geral(self, other, dados, descricao):
+        if self.linhas != other.linhas or self.colunas != other.colunas:
+            raise ValueError(f"Dimensões incompatíveis para {descricao}")
+        resultado = MatrizGeral(other.linhas, other.colunas, dados)
+        _acumular(resultado, self, add)
+        return _compactar_resultado(resultado)
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return MatrizDiagonal(self.linhas, _escalar_buffer(self.diagonal, other))
+        elif isinstance(other, Matriz):
+            return multiplicar_matrizes(self, other)
+        else:
+            raise TypeError("Multiplicação inválida")
+
+    def transposta(self):
+        # Uma matriz diagonal é a própria transposta: nova matriz sobre o mesmo armazenamento
+        resultado = MatrizDiagonal(self.linhas, self.diagonal, self.nome)
+        resultado._dono = _dono_armazenamento(self)
+        return resultado
+
+    def traço(self):
+        return sum(self.diagonal)
+
+    def multiplicar_vetor(self, x):
+        # O(n): y[i] = d_i * x[i]
+        return Vetor(self.linhas, _combinar_buffers(self.diagonal, _vetor_entrada(x, self.linhas), mul))
+
+    def determinante(self):
+        prod = 1.0
+        for val in self.diagonal:
+            prod *= val
+        return prod
+
+    def _substituicao(self, x):
+        for i, d in enumerate(self.diagonal):
+            if d == 0.0:
+                raise ValueError("Matriz singular")
+            x[i] /= d
+        return x
+
+    def resolver(self, b):
+        return _resolver_colunas(b, self.linhas, self._substituicao)
+
+    def inversa(self):
+        return MatrizDiagonal(self.linhas, self._substituicao(array("d", [1.0] * self.linhas)))
+
+    def __pow__(self, k):
+        # O(n): potência elemento a elemento da diagonal
+        if not isinstance(k, int):
+            raise TypeError("Expoente deve ser inteiro")
+        if k < 0:
+            return self.inversa() ** -k
+        if _motor == "numpy":
+            resultado = MatrizDiagonal(self.linhas)
+            np.power(_np_vetor(self.diagonal), k, out=_np_vetor(resultado.diagonal))
+            return resultado
+        return MatrizDiagonal(self.linhas, array("d", [v ** k for v in self.diagonal]))
+
+    def get_elemento(self, i, j):
+        if i == j:
+            return self.diagonal[i]
+        else:
+            return 0.0
+
+    def set_elemento(self, i, j, valor):
+        if i != j:
+            if valor != 0.0:
+                raise ValueError("Matriz diagonal só admite valores não nulos na diagonal principal")
+            return
+        self.diagonal[i] = valor
+        self.marcar_modificada()
+
+    def to_array(self):
+        matriz = [[0.0]*self.colunas for _ in range(self.linhas)]
+        for i in range(self.linhas):
+            matriz[i][i] = self.diagonal[i]
+        return matriz
+
+    def tamanho_bytes(self):
+        return _nbytes(self.diagonal)
+
+    def imprimir(self):
+        print(f"Matriz {self.nome} ({self.tipo()} {self.linhas}x{self.colunas}):")
+        for i in range(self.linhas):
+            linha = []
+            for j in range(self.colunas):
+                linha.append(f"{self.diagonal[i]:.2f}" if i == j else "0.00")
+            print(" ".join(linha))
+
+class MatrizTriangularInferior(Matriz):
+    # Empacotada por linhas: a linha i começa em i(i+1)/2.
+    __slots__ = ("dados",)
+
+    def __init__(self, n: int, dados: List[List[float]] = None, nome: str = ""):
+        super().__init__(n, n, nome)
+        if dados:
+            if _eh_aninhada(dados):
+                dados = chain.from_iterable(dados)
+            self.dados = _buffer_float(dados, n * (n + 1) // 2)
+        else:
+            self.dados = array("d", bytes(8 * (n * (n + 1) // 2)))
+
+    def _linha(self, i):
+        inicio = i * (i + 1) // 2
+        return inicio, inicio + i + 1, 0
+
+    def __add__(self, other):
+        if not isinstance(other, MatrizTriangularInferior):
+            return _para_geral(self) + other
+        if self.linhas != other.linhas:
+            raise ValueError("Dimensões incompatíveis para soma")
+        return MatrizTriangularInferior(self.linhas, _combinar_buffers(self.dados, other.dados, add))
+
+    def __sub__(self, other):
+        if not isinstance(other, MatrizTriangularInferior):
+            return _para_geral(self) - other
+        if self.linhas != other.linhas:
+            raise ValueError("Dimensões incompatíveis para subtração")
+        return MatrizTriangularInferior(self.linhas, _combinar_buffers(self.dados, other.dados, sub))
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return MatrizTriangularInferior(self.linhas, _escalar_buffer(self.dados, other))
+        elif isinstance(other, Matriz):
+            return multiplicar_matrizes(self, other)
+        else:
+            raise TypeError("Multiplicação inválida")
+
+    def transposta(self):
+        return MatrizTransposta(self)
+
+    def _transpor(self):
+        # Linha r da transposta = coluna r da original, elementos (k, r) com k >= r
+        n = self.linhas
+        if _motor == "numpy":
+            return _np_empacotar(_np_denso(self).T, MatrizTriangularSuperior(n))
+        resultado = array("d")
+        for r in range(n):
+            resultado.extend(self.dados[k * (k + 1) // 2 + r] for k in range(r, n))
+        return MatrizTriangularSuperior(n, resultado)
+
+    def traço(self):
+        return sum(self.dados[i * (i + 1) // 2 + i] for i in range(self.linhas))
+
+    def multiplicar_vetor(self, x):
+        # Linha i só tem os i + 1 primeiros elementos: O(n²/2)
+        x = _vetor_entrada(x, self.linhas)
+        if _motor == "numpy":
+            return _mul_vetor_empacotada_numpy(self, x)
+        dados = self.dados
+        return Vetor(self.linhas, array("d", [sum(map(mul, dados[i * (i + 1) // 2:i * (i + 1) // 2 + i + 1], x))
+                                             for i in range(self.linhas)]))
+
+    def determinante(self):
+        prod = 1.0
+        for i in range(self.linhas):
+            prod *= self.dados[i * (i + 1) // 2 + i]
+        return prod
+
+    def _substituicao(self, x):
+        # Substituição direta, O(n²): x[i] = (x[i] - soma_{k<i} L[i][k] x[k]) / L[i][i]
+        if _motor == "numpy":
+            # Mesma recorrência, com a soma de cada linha feita por np.dot sobre o buffer
+            dados, xs = _np_vetor(self.dados), _np_vetor(x)
+            for i in range(self.linhas):
+                inicio = i * (i + 1) // 2
+                pivo = dados[inicio + i]
+                if pivo == 0.0:
+                    raise ValueError("Matriz singular")
+                xs[i] = (xs[i] - np.dot(dados[inicio:inicio + i], xs[:i])) / pivo
+            return x
+        for i in range(self.linhas):
+            inicio = i * (i + 1) // 2
+            pivo = self.dados[inicio + i]
+            if pivo == 0.0:
+                raise ValueError("Matriz singular")
+            x[i] = (x[i] - sum(map(mul, self.dados[inicio:inicio + i], x[:i]))) / pivo
+        return x
+
+    def resolver(self, b):
+        return _resolver_colunas(b, self.linhas, self._substituicao)
+
+    def inversa(self):
+        n = self.linhas
+        resultado = MatrizTriangularInferior(n)
+        for j in range(n):
+            x = array("d", bytes(8 * n))
+            x[j] = 1.0
+            self._substituicao(x)
+            for i in range(j, n):
+                resultado.dados[i * (i + 1) // 2 + j] = x[i]
+        return resultado
+
+    def get_elemento(self, i, j):
+        if j <= i:
+            return self.dados[i * (i + 1) // 2 + j]
+        else:
+            return 0.0
+
+    def set_elemento(self, i, j, valor):
+        if j > i:
+            if valor != 0.0:
+                raise ValueError("Matriz triangular inferior só admite valores não nulos com j <= i")
+            return
+        self.dados[i * (i + 1) // 2 + j] = valor
+        self.marcar_modificada()
+
+    def to_array(self):
+        matriz = [[0.0]*self.colunas for _ in range(self.linhas)]
+        for i in range(self.linhas):
+            inicio, fim, _ = self._linha(i)
+            matriz[i][:i + 1] = self.dados[inicio:fim].tolist()
+        return matriz
+
+    def tamanho_bytes(self):
+        return _nbytes(self.dados)
+
+    def imprimir(self):
+        print(f"Matriz {self.nome} ({self.tipo()} {self.linhas}x{self.colunas}):")
+        for i in range(self.linhas):
+            inicio, fim, _ = self._linha(i)
+            linha = [f"{x:.2f}" for x in self.dados[inicio:fim]]
+            linha.extend("0.00" for _ in range(self.colunas - i - 1))
+            print(" ".join(linha))
+
+class MatrizTriangularSuperior(Matriz):
+    # Empacotada por linhas: a linha i começa em i*n - i(i-1)/2, na coluna i.
+    __slots__ = ("dados",)
+
+    def __init__(self, n: int, dados: List[List[float]] = None, nome: str = ""):
+        super().__init__(n, n, nome)
+        if dados:
+            if _eh_aninhada(dados):
+                dados = chain.from_iterable(dados)
+            self.dados = _buffer_float(dados, n * (n + 1) // 2)
+        else:
+            self.dados = array("d", bytes(8 * (n * (n + 1) // 2)))
+
+    def _inicio(self, i):
+        return i * self.colunas - i * (i - 1) // 2
+
+    def _linha(self, i):
+        inicio = self._inicio(i)
+        return inicio, inicio + self.colunas - i, i
+
+    def __add__(self, other):
+        if not isinstance(other, MatrizTriangularSuperior):
+            return _para_geral(self) + other
+        if self.linhas != other.linhas:
+            raise ValueError("Dimensões incompatíveis para soma")
+        return MatrizTriangularSuperior(self.linhas, _combinar_buffers(self.dados, other.dados, add))
+
+    def __sub__(self, other):
+        if not isinstance(other, MatrizTriangularSuperior):
+            return _para_geral(self) - other
+        if self.linhas != other.linhas:
+            raise ValueError("Dimensões incompatíveis para subtração")
+        return MatrizTriangularSuperior(self.linhas, _combinar_buffers(self.dados, other.dados, sub))
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return MatrizTriangularSuperior(self.linhas, _escalar_buffer(self.dados, other))
+        elif isinstance(other, Matriz):
+            return multiplicar_matrizes(self, other)
+        else:
+            raise TypeError("Multiplicação inválida")
+
+    def transposta(self):
+        return MatrizTransposta(self)
+
+    def _transpor(self):
+        # Linha r da transposta = coluna r da original, elementos (k, r) com k <= r
+        n = self.linhas
+        if _motor == "numpy":
+            return _np_empacotar(_np_denso(self).T, MatrizTriangularInferior(n))
+        resultado = array("d")
+        for r in range(n):
+            resultado.extend(self.dados[self._inicio(k) + r - k] for k in range(r + 1))
+        return MatrizTriangularInferior(n, resultado)
+
+    def traço(self):
+        return sum(self.dados[self._inicio(i)] for i in range(self.linhas))  # diagonal é a 1ª posição de cada linha
+
+    def multiplicar_vetor(self, x):
+        # Linha i só tem os elementos das colunas i..n-1: O(n²/2)
+        n = self.linhas
+        x = _vetor_entrada(x, n)
+        if _motor == "numpy":
+            return _mul_vetor_empacotada_numpy(self, x)
+        dados = self.dados
+        return Vetor(n, array("d", [sum(map(mul, dados[self._inicio(i):self._inicio(i) + n - i], x[i:]))
+                                    for i in range(n)]))
+
+    def determinante(self):
+        prod = 1.0
+        for i in range(self.linhas):
+            prod *= self.dados[self._inicio(i)]  # diagonal principal está na 1ª posição de cada linha
+        return prod
+
+    def _substituicao(self, x):
+        # Substituição retroativa, O(n²): x[i] = (x[i] - soma_{k>i} U[i][k] x[k]) / U[i][i]
+        n = self.linhas
+        if _motor == "numpy":
+            dados, xs = _np_vetor(self.dados), _np_vetor(x)
+            for i in range(n - 1, -1, -1):
+                inicio = self._inicio(i)
+                pivo = dados[inicio]
+                if pivo == 0.0:
+                    raise ValueError("Matriz singular")
+                xs[i] = (xs[i] - np.dot(dados[inicio + 1:inicio + n - i], xs[i + 1:])) / pivo
+            return x
+        for i in range(n - 1, -1, -1):
+            inicio = self._inicio(i)
+            pivo = self.dados[inicio]
+            if pivo == 0.0:
+                raise ValueError("Matriz singular")
+            x[i] = (x[i] - sum(map(mul, self.dados[inicio + 1:inicio + n - i], x[i + 1:]))) / pivo
+        return x
+
+    def resolver(self, b):
+        return _resolver_colunas(b, self.linhas, self._substituicao)
+
+    def inversa(self):
+        n = self.linhas
+        resultado = MatrizTriangularSuperior(n)
+        for j in range(n):
+            x = array("d", bytes(8 * n))
+            x[j] = 1.0
+            self._substituicao(x)
+            for i in range(j + 1):
+                resultado.dados[resultado._inicio(i) + j - i] = x[i]
+        return resultado
+
+    def get_elemento(self, i, j):
+        if j >= i:
+            return self.dados[self._inicio(i) + j - i]
+        else:
+            return 0.0
+
+    def set_elemento(self, i, j, valor):
+        if j < i:
+            if valor != 0.0:
+                raise ValueError("Matriz triangular superior só admite valores não nulos com j >= i")
+            return
+        self.dados[self._inicio(i) + j - i] = valor
+        self.marcar_modificada()
+
+    def to_array(self):
+        matriz = [[0.0]*self.colunas for _ in range(self.linhas)]
+        for i in range(self.linhas):
+            inicio, fim, _ = self._linha(i)
+            matriz[i][i:] = self.dados[inicio:fim].tolist()
+        return matriz
+
+    def tamanho_bytes(self):
+        return _nbytes(self.dados)
+
+    def imprimir(self):
+        print(f"Matriz {self.nome} ({self.tipo()} {self.linhas}x{self.colunas}):")
+        for i in range(self.linhas):
+            inicio, fim, _ = self._linha(i)
+            linha = ["0.00"] * i
+            linha.extend(f"{x:.2f}" for x in self.dados[inicio:fim])
+            print(" ".join(linha))
+
+class MatrizTransposta(Matriz):
+    # Vista sobre o armazenamento da base; materializar() devolve uma cópia.
+    __slots__ = ("base",)
+
+    def __init__(self, base: Matriz, nome: str = ""):
+        super().__init__(base.colunas, base.linhas, nome or base.nome)
+        self.base = base
+        self._dono = _dono_armazenamento(base)
+
+    def __add__(self, other):
+        return _operar_com_vista(self, other, add, "soma")
+
+    def __sub__(self, other):
+        return _operar_com_vista(self, other, sub, "subtração")
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return MatrizTransposta(self.base * other)
+        elif isinstance(other, Matriz):
+            return multiplicar_matrizes(self, other)
+        else:
+            raise TypeError("Multiplicação inválida")
+
+    def transposta(self):
+        return self.base
+
+    def materializar(self):
+        resultado = self.base._transpor()
+        resultado.nome = self.nome
+        return resultado
+
+    def get_elemento(self, i, j):
+        return self.base.get_elemento(j, i)
+
+    def set_elemento(self, i, j, valor):
+        # Altera a base (e portanto a versão dela)
+        self.base.set_elemento(j, i, valor)
+
+    def traço(self):
+        return self.base.traço()
+
+    def multiplicar_vetor(self, x):
+        # (Aᵀx)[j] = soma de a_ij * x[i] sobre os elementos armazenados da base
+        x = _vetor_entrada(x, self.colunas)
+        if _motor == "numpy" and _np_suporta(self.base):
+            y = Vetor(self.linhas)
+            np.matmul(_np_denso(self), _np_vetor(x), out=_np_vetor(y.dados))
+            return y
+        y = array("d", bytes(8 * self.linhas))
+        for i, j, v in _entradas(self.base):
+            y[j] += v * x[i]
+        return Vetor(self.linhas, y)
+
+    def determinante(self):
+        return self.base.determinante()
+
+    def inversa(self):
+        return MatrizTransposta(self.base.inversa())
+
+    def resolver(self, b):
+        return self.materializar().resolver(b)
+
+    def tamanho_bytes(self):
+        # Os elementos já são contados na base.
+        return 0
+
+    def imprimir(self):
+        print(f"Matriz {self.nome} ({self.tipo()} de {self.base.tipo()} {self.linhas}x{self.colunas}):")
+        for i in range(self.linhas):
+            print(" ".join(f"{self.base.get_elemento(j, i):.2f}" for j in range(self.colunas)))
+
+def _eh_vista_densa(m):
+    return isinstance(m, MatrizTransposta) and isinstance(m.base, MatrizGeral)
+
+def _linha_densa(m, i):
+    # Linha i de uma MatrizGeral ou de uma vista transposta dela (coluna i da base)
+    if isinstance(m, MatrizTransposta):
+        return m.base.dados[i::m.base.colunas]
+    return m.dados[i * m.colunas:(i + 1) * m.colunas]
+
+def _combinar_densas(a, b, operacao):
+    resultado = MatrizGeral(a.linhas, a.colunas)
+    c = a.colunas
+    for i in range(a.linhas):
+        resultado.dados[i * c:(i + 1) * c] = _combinar_buffers(_linha_densa(a, i), _linha_densa(b, i), operacao)
+    return resultado
+
+def _operar_com_vista(vista, other, operacao, descricao):
+    if not isinstance(other, Matriz):
+        raise TypeError("Operação somente entre matrizes")
+    if vista.linhas != other.linhas or vista.colunas != other.colunas:
+        raise ValueError(f"Dimensões incompatíveis para {descricao}")
+    if isinstance(other, MatrizTransposta):
+        # A^T op B^T = (A op B)^T
+        return MatrizTransposta(operacao(vista.base, other.base))
+    if _eh_vista_densa(vista) and isinstance(other, MatrizGeral):
+        if _motor == "numpy":
+            resultado = MatrizGeral(vista.linhas, vista.colunas)
+            _NP_OPERACOES[operacao](_np_denso(vista), _np_denso(other), out=_np_denso(resultado))
+            return resultado
+        return _combinar_densas(vista, other, operacao)
+    return operacao(vista.materializar(), other)
+
+class MatrizEsparsa(Matriz):
+    # CSR: os não nulos da linha i ficam em ponteiros[i]..ponteiros[i+1]-1.
+    __slots__ = ("ponteiros", "indices", "valores")
+
+    def __init__(self, linhas: int, colunas: int, ponteiros=None, indices=None, valores=None, nome: str = ""):
+        super().__init__(linhas, colunas, nome)
+        if ponteiros is None:
+            self.ponteiros = array("q", bytes(8 * (linhas + 1)))
+            self.indices = array("q")
+            self.valores = array("d")
+        else:
+            self.ponteiros = ponteiros if isinstance(ponteiros, (array, memoryview)) else array("q", ponteiros)
+            self.indices = indices if isinstance(indices, (array, memoryview)) else array("q", indices)
+            self.valores = _buffer_float(valores, len(self.indices))
+            if len(self.ponteiros) != linhas + 1 or self.ponteiros[-1] != len(self.indices):
+                raise ValueError("Ponteiros de linha inconsistentes com os não nulos")
+
+    @classmethod
+    def de_coo(cls, linhas: int, colunas: int, linhas_idx, colunas_idx, valores, nome: str = ""):
+        # Constrói a partir de triplas (i, j, v) em qualquer ordem; repetidas são somadas
+        if not len(linhas_idx) == len(colunas_idx) == len(valores):
+            raise ValueError("Listas de coordenadas com tamanhos diferentes")
+        ordem = sorted(range(len(valores)), key=lambda t: (linhas_idx[t], colunas_idx[t]))
+        ponteiros = array("q", bytes(8 * (linhas + 1)))
+        indices = array("q")
+        dados = array("d")
+        anterior = None
+        for t in ordem:
+            i, j = linhas_idx[t], colunas_idx[t]
+            if not (0 <= i < linhas and 0 <= j < colunas):
+                raise ValueError(f"Índice ({i}, {j}) fora das dimensões da matriz")
+            if (i, j) == anterior:
+                dados[-1] += valores[t]
+            else:
+                ponteiros[i + 1] += 1
+                indices.append(j)
+                dados.append(valores[t])
+                anterior = (i, j)
+        for i in range(linhas):
+            ponteiros[i + 1] += ponteiros[i]
+        return cls(linhas, colunas, ponteiros, indices, dados, nome)
+
+    @classmethod
+    def de_matriz(cls, m: Matriz, nome: str = ""):
+        # Converte percorrendo só os elementos armazenados de m (ver _entradas)
+        linhas_idx, colunas_idx, valores = array("q"), array("q"), array("d")
+        for i, j, v in _entradas(m):
+            if v != 0.0:
+                linhas_idx.append(i)
+                colunas_idx.append(j)
+                valores.append(v)
+        return cls.de_coo(m.linhas, m.colunas, linhas_idx, colunas_idx, valores, nome or m.nome)
+
+    def nao_nulos(self):
+        return len(self.valores)
+
+    def __add__(self, other):
+        return _operar_esparsa(self, other, add, "soma")
+
+    def __sub__(self, other):
+        return _operar_esparsa(self, other, sub, "subtração")
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return MatrizEsparsa(self.linhas, self.colunas, array("q", self.ponteiros), array("q", self.indices),
+                                 _escalar_buffer(self.valores, other))
+        elif isinstance(other, Matriz):
+            return multiplicar_matrizes(self, other)
+        else:
+            raise TypeError("Multiplicação inválida")
+
+    def transposta(self):
+        # CSR da transposta (= CSC da original), por contagem: O(linhas + colunas + não nulos)
+        return self._transpor()
+
+    def _transpor(self):
+        m, n = self.linhas, self.colunas
+        ponteiros = array("q", bytes(8 * (n + 1)))
+        for j in self.indices:
+            ponteiros[j + 1] += 1
+        for j in range(n):
+            ponteiros[j + 1] += ponteiros[j]
+        proxima = array("q", ponteiros[:-1])
+        indices = array("q", bytes(8 * len(self.indices)))
+        valores = array("d", bytes(8 * len(self.valores)))
+        for i in range(m):
+            for t in range(self.ponteiros[i], self.ponteiros[i + 1]):
+                j = self.indices[t]
+                posicao = proxima[j]
+                indices[posicao] = i
+                valores[posicao] = self.valores[t]
+                proxima[j] = posicao + 1
+        return MatrizEsparsa(n, m, ponteiros, indices, valores, self.nome)
+
+    def get_elemento(self, i, j):
+        # Busca binária nas colunas da linha i
+        inicio, fim = self.ponteiros[i], self.ponteiros[i + 1]
+        t = bisect_left(self.indices, j, inicio, fim)
+        if t < fim and self.indices[t] == j:
+            return self.valores[t]
+        return 0.0
+
+    def set_elemento(self, i, j, valor):
+        # Alterar um não nulo existente é O(log); inserir um novo desloca os seguintes, O(não nulos)
+        inicio, fim = self.ponteiros[i], self.ponteiros[i + 1]
+        t = bisect_left(self.indices, j, inicio, fim)
+        if t < fim and self.indices[t] == j:
+            self.valores[t] = valor
+        elif valor != 0.0:
+            # Buffers carregados de arquivo (memoryview) não crescem: copia na 1ª inserção
+            if not isinstance(self.indices, array):
+                self.indices = array("q", self.indices)
+            if not isinstance(self.valores, array):
+                self.valores = array("d", self.valores)
+            self.indices.insert(t, j)
+            self.valores.insert(t, valor)
+            for k in range(i + 1, self.linhas + 1):
+                self.ponteiros[k] += 1
+        self.marcar_modificada()
+
+    def traço(self):
+        if not self.eh_quadrada():
+            raise ValueError("Traço só definido para matrizes quadradas")
+        return sum(self.get_elemento(i, i) for i in range(self.linhas))
+
+    def multiplicar_vetor(self, x):
+        # CSR: cada linha percorre só os seus não nulos, O(linhas + não nulos)
+        x = _vetor_entrada(x, self.colunas)
+        p, indices, valores = self.ponteiros, self.indices, self.valores
+        return Vetor(self.linhas, array("d", [sum(map(mul, valores[p[i]:p[i + 1]], map(x.__getitem__, indices[p[i]:p[i + 1]])))
+                                              for i in range(self.linhas)]))
+
+    def determinante(self):
+        # Eliminação de Gauss sobre um dicionário por linha: memória O(não nulos + preenchimento)
+        if not self.eh_quadrada():
+            raise ValueError("Determinante só definido para matrizes quadradas")
+        n = self.linhas
+        linhas = [dict(zip(self.indices[self.ponteiros[i]:self.ponteiros[i + 1]],
+                           self.valores[self.ponteiros[i]:self.ponteiros[i + 1]])) for i in range(n)]
+        por_coluna = [set() for _ in range(n)]
+        for i, linha in enumerate(linhas):
+            for j in linha:
+                por_coluna[j].add(i)
+        ordem = []
+        det = 1.0
+        for k in range(n):
+            candidatas = [i for i in por_coluna[k] if linhas[i].get(k, 0.0) != 0.0]
+            if not candidatas:
+                return 0.0
+            # Pivô: a linha mais curta entre as com |a_ik| >= 0.1 do maior.
+            maior = max(abs(linhas[i][k]) for i in candidatas)
+            p = min((i for i in candidatas if abs(linhas[i][k]) >= 0.1 * maior), key=lambda i: (len(linhas[i]), i))
+            linha_p = linhas[p]
+            pivo = linha_p[k]
+            det *= pivo
+            ordem.append(p)
+            for j in linha_p:
+                por_coluna[j].discard(p)
+            for i in candidatas:
+                if i == p:
+                    continue
+                linha_i = linhas[i]
+                f = linha_i.pop(k) / pivo
+                for j, v in linha_p.items():
+                    if j != k:
+                        if j not in linha_i:
+                            por_coluna[j].add(i)
+                        linha_i[j] = linha_i.get(j, 0.0) - f * v
+            linhas[p] = None
+        return _sinal_permutacao(ordem) * det
+
+    def tamanho_bytes(self):
+        return _nbytes(self.ponteiros) + _nbytes(self.indices) + _nbytes(self.valores)
+
+    def imprimir(self):
+        print(f"Matriz {self.nome} ({self.tipo()} {self.linhas}x{self.colunas}, {self.nao_nulos()} não nulos):")
+        for i, j, v in _entradas(self):
+            print(f"({i}, {j}) {v:.2f}")
+
+def _operar_esparsa(a, other, operacao, descricao):
+    if not isinstance(other, Matriz):
+        raise TypeError("Operação somente entre matrizes")
+    if a.linhas != other.linhas or a.colunas != other.colunas:
+        raise ValueError(f"Dimensões incompatíveis para {descricao}")
+    if isinstance(other, MatrizEsparsa):
+        return _compactar_resultado(_combinar_esparsas(a, other, operacao))
+    if isinstance(other, MatrizDiagonal):
+        return _compactar_resultado(_combinar_esparsas(a, MatrizEsparsa.de_matriz(other), operacao))
+    # Resultado denso: parte dos dados densos de other e aplica só os não nulos de a
+    resultado = _para_geral(other)
+    if operacao is sub:
+        _escalar_buffer(resultado.dados, -1.0, resultado.dados)
+    _acumular(resultado, a, add)
+    return _compactar_resultado(resultado)
+
+def _sinal_permutacao(ordem):
+    # +1.0 ou -1.0 conforme a paridade da permutação, pela contagem de ciclos
+    visitado = [False] * len(ordem)
+    sinal = 1.0
+    for inicio in range(len(ordem)):
+        tamanho, i = 0, inicio
+        while not visitado[i]:
+            visitado[i] = True
+            i = ordem[i]
+            tamanho += 1
+        if tamanho and tamanho % 2 == 0:
+            sinal = -sinal
+    return sinal
+
+def _combinar_esparsas(a, b, operacao):
+    # Intercala, linha a linha, as colunas ordenadas de a e b: O(não nulos de a + de b)
+    ponteiros = array("q", [0])
+    indices = array("q")
+    valores = array("d")
+    for i in range(a.linhas):
+        p, fim_p = a.ponteiros[i], a.ponteiros[i + 1]
+        q, fim_q = b.ponteiros[i], b.ponteiros[i + 1]
+        while p < fim_p or q < fim_q:
+            ja = a.indices[p] if p < fim_p else a.colunas
+            jb = b.indices[q] if q < fim_q else b.colunas
+            if ja == jb:
+                j, v = ja, operacao(a.valores[p], b.valores[q])
+                p += 1
+                q += 1
+            elif ja < jb:
+                j, v = ja, a.valores[p]
+                p += 1
+            else:
+                j, v = jb, operacao(0.0, b.valores[q])
+                q += 1
+            if v != 0.0:
+                indices.append(j)
+                valores.append(v)
+        ponteiros.append(len(indices))
+    return MatrizEsparsa(a.linhas, a.colunas, ponteiros, indices, valores)
+
+class MatrizBanda(Matriz):
+    # Uma faixa de n posições por diagonal; (i, j) fica em (j - i + inferior) * n + i.
+    __slots__ = ("inferior", "superior", "dados")
+
+    def __init__(self, n: int, inferior: int, superior: int, dados: List[List[float]] = None, nome: str = ""):
+        super().__init__(n, n, nome)
+        if not (0 <= inferior < max(n, 1) and 0 <= superior < max(n, 1)):
+            raise ValueError("Larguras de banda devem estar entre 0 e n - 1")
+        self.inferior = inferior
+        self.superior = superior
+        tamanho = (inferior + superior + 1) * n
+        if dados and _eh_aninhada(dados):
+            if len(dados) != inferior + superior + 1:
+                raise ValueError(f"Esperadas {inferior + superior + 1} diagonais")
+            self.dados = array("d", bytes(8 * tamanho))
+            for k, valores in enumerate(dados, -inferior):
+                inicio, fim = self._faixa(k)
+                self.dados[inicio:fim] = _buffer_float(valores, fim - inicio)
+        elif dados:
+            self.dados = _buffer_float(dados, tamanho)
+        else:
+            self.dados = array("d", bytes(8 * tamanho))
+
+    def _faixa(self, k):
+        # Posições (início, fim) dos elementos válidos da diagonal k no armazenamento
+        n = self.linhas
+        base = (k + self.inferior) * n
+        return base + max(0, -k), base + n - max(0, k)
+
+    def diagonais(self):
+        return range(-self.inferior, self.superior + 1)
+
+    def __add__(self, other):
+        return _operar_banda(self, other, add, "soma")
+
+    def __sub__(self, other):
+        return _operar_banda(self, other, sub, "subtração")
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return MatrizBanda(self.linhas, self.inferior, self.superior, _escalar_buffer(self.dados, other))
+        elif isinstance(other, Matriz):
+            return multiplicar_matrizes(self, other)
+        else:
+            raise TypeError("Multiplicação inválida")
+
+    def multiplicar_vetor(self, x):
+        # y = A x diagonal a diagonal: y[i] += A[i][i+k] * x[i+k], O(n * largura de banda)
+        n = self.linhas
+        x = _vetor_entrada(x, n)
+        y = [0.0] * n
+        for k in self.diagonais():
+            inicio, fim = self._faixa(k)
+            i0 = max(0, -k)
+            i1 = i0 + fim - inicio
+            y[i0:i1] = map(add, y[i0:i1], map(mul, self.dados[inicio:fim], x[i0 + k:i1 + k]))
+        return Vetor(n, y)
+
+    def transposta(self):
+        # A diagonal k vira a diagonal -k: cópia por faixas, O(n * largura de banda)
+        resultado = MatrizBanda(self.linhas, self.superior, self.inferior, nome=self.nome)
+        for k in self.diagonais():
+            inicio, fim = self._faixa(k)
+            destino, _ = resultado._faixa(-k)
+            resultado.dados[destino:destino + fim - inicio] = array("d", self.dados[inicio:fim])
+        return resultado
+
+    def traço(self):
+        inicio, fim = self._faixa(0)
+        return sum(self.dados[inicio:fim])
+
+    def _fatorar(self):
+        # LU com pivoteamento na banda, como na dgbtrf; None se singular.
+        n, p = self.linhas, self.inferior
+        u = p + self.superior
+        lu = array("d", self.dados)
+        lu.frombytes(bytes(8 * p * n))
+        pivos = array("q", range(n))
+        trocas = 0
+        for k in range(n):
+            fim = min(k + p, n - 1)
+            r = max(range(k, fim + 1), key=lambda i: abs(lu[(k - i + p) * n + i]))
+            pivo = lu[(k - r + p) * n + r]
+            if pivo == 0.0:
+                return None
+            ultima = min(k + u, n - 1)
+            if r != k:
+                pivos[k] = r
+                trocas += 1
+                for j in range(k, ultima + 1):
+                    a, b = (j - k + p) * n + k, (j - r + p) * n + r
+                    lu[a], lu[b] = lu[b], lu[a]
+            for i in range(k + 1, fim + 1):
+                posicao = (k - i + p) * n + i
+                f = lu[posicao] / pivo
+                lu[posicao] = f
+                if f != 0.0:
+                    for j in range(k + 1, ultima + 1):
+                        lu[(j - i + p) * n + i] -= f * lu[(j - k + p) * n + k]
+        return lu, pivos, trocas
+
+    def _substituir_lu(self, fatoracao, x):
+        lu, pivos, _ = fatoracao
+        n, p = self.linhas, self.inferior
+        u = p + self.superior
+        for k in range(n):
+            r = pivos[k]
+            if r != k:
+                x[k], x[r] = x[r], x[k]
+            for i in range(k + 1, min(k + p, n - 1) + 1):
+                x[i] -= lu[(k - i + p) * n + i] * x[k]
+        for i in range(n - 1, -1, -1):
+            soma = sum(lu[(j - i + p) * n + i] * x[j] for j in range(i + 1, min(i + u, n - 1) + 1))
+            x[i] = (x[i] - soma) / lu[p * n + i]
+        return x
+
+    def determinante(self):
+        fatoracao = self._fatorar()
+        if fatoracao is None:
+            return 0.0
+        lu, _, trocas = fatoracao
+        n = self.linhas
+        prod = -1.0 if trocas % 2 else 1.0
+        for val in lu[self.inferior * n:(self.inferior + 1) * n]:
+            prod *= val
+        return prod
+
+    def resolver(self, b):
+        fatoracao = self._fatorar()
+
+        def resolver_coluna(x):
+            if fatoracao is None:
+                raise ValueError("Matriz singular")
+            return self._substituir_lu(fatoracao, x)
+        return _resolver_colunas(b, self.linhas, resolver_coluna)
+
+    def get_elemento(self, i, j):
+        k = j - i
+        if -self.inferior <= k <= self.superior:
+            return self.dados[(k + self.inferior) * self.linhas + i]
+        return 0.0
+
+    def set_elemento(self, i, j, valor):
+        k = j - i
+        if not -self.inferior <= k <= self.superior:
+            if valor != 0.0:
+                raise ValueError("Posição fora da banda da matriz")
+            return
+        self.dados[(k + self.inferior) * self.linhas + i] = valor
+        self.marcar_modificada()
+
+    def tamanho_bytes(self):
+        return _nbytes(self.dados)
+
+    def imprimir(self):
+        print(f"Matriz {self.nome} ({self.tipo()} {self.linhas}x{self.colunas}, banda -{self.inferior}/+{self.superior}):")
+        for i in range(self.linhas):
+            print(" ".join(f"{self.get_elemento(i, j):.2f}" for j in range(self.colunas)))
+
+def _como_banda(m):
+    # Diagonal como banda de largura zero, sem cópia
+    if isinstance(m, MatrizDiagonal):
+        return MatrizBanda(m.linhas, 0, 0, m.diagonal)
+    return m
+
+def _operar_banda(a, other, operacao, descricao):
+    if not isinstance(other, Matriz):
+        raise TypeError("Operação somente entre matrizes")
+    if a.linhas != other.linhas or a.colunas != other.colunas:
+        raise ValueError(f"Dimensões incompatíveis para {descricao}")
+    b = _como_banda(other)
+    if not isinstance(b, MatrizBanda):
+        return operacao(_para_geral(a), other)
+    # Banda ± banda: larguras máximas, combinando faixa a faixa
+    resultado = MatrizBanda(a.linhas, max(a.inferior, b.inferior), max(a.superior, b.superior))
+    for k in a.diagonais():
+        inicio, fim = a._faixa(k)
+        destino, _ = resultado._faixa(k)
+        resultado.dados[destino:destino + fim - inicio] = array("d", a.dados[inicio:fim])
+    for k in b.diagonais():
+        inicio, fim = b._faixa(k)
+        destino, final = resultado._faixa(k)
+        resultado.dados[destino:final] = _combinar_buffers(resultado.dados[destino:final], b.dados[inicio:fim], operacao)
+    return _compactar_resultado(resultado)
+
+class MatrizSimetrica(Matriz):
+    # Triângulo superior empacotado como em MatrizTriangularSuperior.
+    __slots__ = ("dados",)
+
+    def __init__(self, n: int, dados: List[List[float]] = None, nome: str = ""):
+        super().__init__(n, n, nome)
+        if dados:
+            if _eh_aninhada(dados):
+                dados = chain.from_iterable(dados)
+            self.dados = _buffer_float(dados, n * (n + 1) // 2)
+        else:
+            self.dados = array("d", bytes(8 * (n * (n + 1) // 2)))
+
+    def _inicio(self, i):
+        return i * self.colunas - i * (i - 1) // 2
+
+    def __add__(self, other):
+        return _operar_simetrica(self, other, add, "soma")
+
+    def __sub__(self, other):
+        return _operar_simetrica(self, other, sub, "subtração")
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return MatrizSimetrica(self.linhas, _escalar_buffer(self.dados, other))
+        elif isinstance(other, Matriz):
+            return multiplicar_matrizes(self, other)
+        else:
+            raise TypeError("Multiplicação inválida")
+
+    def multiplicar_vetor(self, x):
+        # Cada elemento armazenado (i, j), j > i, contribui para y[i] e para y[j]: O(n²/2)
+        n = self.linhas
+        x = _vetor_entrada(x, n)
+        y = [0.0] * n
+        for i in range(n):
+            inicio = self._inicio(i)
+            linha = self.dados[inicio:inicio + n - i]
+            y[i] += sum(map(mul, linha, x[i:]))
+            xi = x[i]
+            y[i + 1:] = [yj + xi * a for yj, a in zip(y[i + 1:], linha[1:])]
+        return Vetor(n, y)
+
+    def transposta(self):
+        # A simétrica é a própria transposta: nova matriz sobre o mesmo armazenamento
+        resultado = MatrizSimetrica(self.linhas, self.dados, self.nome)
+        resultado._dono = _dono_armazenamento(self)
+        return resultado
+
+    def traço(self):
+        return sum(self.dados[self._inicio(i)] for i in range(self.linhas))
+
+    def determinante(self):
+        # Pivô nulo ou pequeno recai na LU com pivoteamento da forma densa.
+        n = self.linhas
+        dados = array("d", self.dados)
+        limiar = 1e-12 * max(map(abs, dados), default=0.0)
+        det = 1.0
+        for k in range(n):
+            inicio_k = self._inicio(k)
+            pivo = dados[inicio_k]
+            if abs(pivo) <= limiar:
+                return _para_geral(self).determinante()
+            det *= pivo
+            linha_k = dados[inicio_k:inicio_k + n - k]
+            for i in range(k + 1, n):
+                f = linha_k[i - k] / pivo
+                if f != 0.0:
+                    inicio_i = self._inicio(i)
+                    dados[inicio_i:inicio_i + n - i] = array("d", map(sub, dados[inicio_i:inicio_i + n - i],
+                                                                      [f * v for v in linha_k[i - k:]]))
+        return det
+
+    def get_elemento(self, i, j):
+        if j < i:
+            i, j = j, i
+        return self.dados[self._inicio(i) + j - i]
+
+    def set_elemento(self, i, j, valor):
+        # Altera (i, j) e (j, i), que compartilham a mesma posição
+        if j < i:
+            i, j = j, i
+        self.dados[self._inicio(i) + j - i] = valor
+        self.marcar_modificada()
+
+    def to_array(self):
+        matriz = [[0.0]*self.colunas for _ in range(self.linhas)]
+        for i in range(self.linhas):
+            inicio = self._inicio(i)
+            for j, v in enumerate(self.dados[inicio:inicio + self.colunas - i], i):
+                matriz[i][j] = matriz[j][i] = v
+        return matriz
+
+    def tamanho_bytes(self):
+        return _nbytes(self.dados)
+
+    def imprimir(self):
+        print(f"Matriz {self.nome} ({self.tipo()} {self.linhas}x{self.colunas}):")
+        for linha in self.to_array():
+            print(" ".join(f"{x:.2f}" for x in linha))
+
+def _como_simetrica(d):
+    resultado = MatrizSimetrica(d.linhas)
+    for i, v in enumerate(d.diagonal):
+        resultado.dados[resultado._inicio(i)] = v
+    return resultado
+
+def _operar_simetrica(a, other, operacao, descricao):
+    if not isinstance(other, Matriz):
+        raise TypeError("Operação somente entre matrizes")
+    if a.linhas != other.linhas or a.colunas != other.colunas:
+        raise ValueError(f"Dimensões incompatíveis para {descricao}")
+    if isinstance(other, MatrizSimetrica):
+        return _compactar_resultado(MatrizSimetrica(a.linhas, _combinar_buffers(a.dados, other.dados, operacao)))
+    if isinstance(other, MatrizDiagonal):
+        # Só a diagonal muda: primeira posição de cada linha empacotada
+        resultado = MatrizSimetrica(a.linhas, array("d", a.dados))
+        for i, d in enumerate(other.diagonal):
+            k = a._inicio(i)
+            resultado.dados[k] = operacao(resultado.dados[k], d)
+        return _compactar_resultado(resultado)
+    return operacao(_para_geral(a), other)
+
+def _entradas(m):
+    # (i, j, valor) de cada elemento armazenado de m (na simétrica, também o espelhado)
+    if isinstance(m, MatrizEsparsa):
+        for i in range(m.linhas):
+            for t in range(m.ponteiros[i], m.ponteiros[i + 1]):
+                yield i, m.indices[t], m.valores[t]
+    elif isinstance(m, MatrizDiagonal):
+        for i, d in enumerate(m.diagonal):
+            yield i, i, d
+    elif isinstance(m, MatrizBanda):
+        for i in range(m.linhas):
+            for k in range(max(-m.inferior, -i), min(m.superior, m.linhas - 1 - i) + 1):
+                yield i, i + k, m.dados[(k + m.inferior) * m.linhas + i]
+    elif isinstance(m, MatrizSimetrica):
+        for i in range(m.linhas):
+            inicio = m._inicio(i)
+            for j, v in enumerate(m.dados[inicio:inicio + m.colunas - i], i):
+                yield i, j, v
+                if j != i:
+                    yield j, i, v
+    elif type(m) in (MatrizGeral, MatrizTriangularInferior, MatrizTriangularSuperior):
+        for i in range(m.linhas):
+            inicio, fim, coluna = m._linha(i)
+            for j, v in enumerate(m.dados[inicio:fim], coluna):
+                yield i, j, v
+    else:
+        for i in range(m.linhas):
+            for j in range(m.colunas):
+                yield i, j, m.get_elemento(i, j)
+
+# Núcleos de multiplicação por par de tipos (esquerda, direita).
+
+def _fatiador_linhas(m):
+    # Na vista transposta, a linha i é a coluna i da base, lida com passo.
+    if isinstance(m, MatrizTransposta):
+        dados, c = m.base.dados, m.base.colunas
+        return lambda i, k0, k1: dados[k0 * c + i:k1 * c + i:c]
+    dados, c = m.dados, m.colunas
+    return lambda i, k0, k1: dados[i * c + k0:i * c + k1]
+
+def _fatiador_colunas(m):
+    # (j, k0, k1) -> elementos k0..k1-1 da coluna j de m
+    if isinstance(m, MatrizTransposta):
+        return _fatiador_linhas(m.base)
+    dados, p = m.dados, m.colunas
+    return lambda j, k0, k1: dados[k0 * p + j:k1 * p + j:p]
+
+def _mul_denso(a, b, destino=None):
+    m, n, p = a.linhas, a.colunas, b.colunas
+    if _usar_paralelo(m * n * p):
+        return _mul_paralelo(a, b, destino)
+    if destino is None:
+        resultado = array("d", bytes(8 * m * p))
+    else:
+        resultado = destino
+        resultado[:] = array("d", bytes(8 * m * p))
+    _produto_linhas(a, b, resultado, 0, m)
+    return MatrizGeral(m, p, resultado)
+
+def _produto_linhas(a, b, resultado, inicio, fim):
+    # Acumula em resultado as linhas inicio..fim-1 de a*b, em blocos de _tamanho_bloco.
+    n, p = a.colunas, b.colunas
+    fatia_a, fatia_b = _fatiador_linhas(a), _fatiador_colunas(b)
+    bloco = _tamanho_bloco
+    for k0 in range(0, n, bloco):
+        k1 = min(k0 + bloco, n)
+        fatias_b = [fatia_b(j, k0, k1) for j in range(p)]
+        for i0 in range(inicio, fim, bloco):
+            fatias_a = [fatia_a(i, k0, k1) for i in range(i0, min(i0 + bloco, fim))]
+            for j0 in range(0, p, bloco):
+                bloco_b = fatias_b[j0:j0 + bloco]
+                for i, linha_a in enumerate(fatias_a, i0 - inicio):
+                    for j, coluna_b in enumerate(bloco_b, i * p + j0):
+                        resultado[j] += sum(map(mul, linha_a, coluna_b))
+
+def _mul_transposta_transposta(a, b):
+    # A^T * B^T = (B * A)^T
+    return MatrizTransposta(multiplicar_matrizes(b.base, a.base))
+
+def _mul_diagonal_diagonal(a, b):
+    return MatrizDiagonal(a.linhas, _combinar_buffers(a.diagonal, b.diagonal, mul))
+
+def _mul_diagonal_linhas(a, b):
+    # D * B escala a linha i de B por d_i
+    resultado = MatrizGeral(b.linhas, b.colunas) if isinstance(b, MatrizGeral) else type(b)(b.linhas)
+    for i in range(b.linhas):
+        inicio, fim, _ = b._linha(i)
+        d = a.diagonal[i]
+        resultado.dados[inicio:fim] = array("d", [d * x for x in b.dados[inicio:fim]])
+    return resultado
+
+def _mul_linhas_diagonal(a, b):
+    # A * D escala a coluna j de A por d_j
+    resultado = MatrizGeral(a.linhas, a.colunas) if isinstance(a, MatrizGeral) else type(a)(a.linhas)
+    for i in range(a.linhas):
+        inicio, fim, coluna = a._linha(i)
+        diagonal = b.diagonal[coluna:coluna + fim - inicio]
+        resultado.dados[inicio:fim] = array("d", map(mul, a.dados[inicio:fim], diagonal))
+    return resultado
+
+def _colunas_armazenadas(m):
+    if isinstance(m, MatrizGeral):
+        return [(0, m.dados[j::m.colunas]) for j in range(m.colunas)]
+    t = m._transpor()
+    colunas = []
+    for j in range(m.colunas):
+        inicio, fim, linha = t._linha(j)
+        colunas.append((linha, t.dados[inicio:fim]))
+    return colunas
+
+def _mul_produtos_internos(a, b, resultado):
+    colunas_b = _colunas_armazenadas(b)
+    dados_a, dados_r = a.dados, resultado.dados
+    for i in range(a.linhas):
+        inicio_a, fim_a, coluna_a = a._linha(i)
+        linha_a = dados_a[inicio_a:fim_a]
+        fim_coluna_a = coluna_a + fim_a - inicio_a
+        inicio_r, fim_r, coluna_r = resultado._linha(i)
+        linha = []
+        for linha_b, coluna_b in colunas_b[coluna_r:coluna_r + fim_r - inicio_r]:
+            k0 = max(coluna_a, linha_b)
+            k1 = min(fim_coluna_a, linha_b + len(coluna_b))
+            linha.append(sum(map(mul, linha_a[k0 - coluna_a:k1 - coluna_a], coluna_b[k0 - linha_b:k1 - linha_b]))
+                         if k0 < k1 else 0.0)
+        dados_r[inicio_r:fim_r] = array("d", linha)
+    return resultado
+
+def _mul_inferior_inferior(a, b):
+    return _mul_produtos_internos(a, b, MatrizTriangularInferior(a.linhas))
+
+def _mul_superior_superior(a, b):
+    return _mul_produtos_internos(a, b, MatrizTriangularSuperior(a.linhas))
+
+def _mul_para_geral(a, b):
+    return _mul_produtos_internos(a, b, MatrizGeral(a.linhas, b.colunas))
+
+def _mul_esparsa_esparsa(a, b):
+    # Gustavson: linha i do resultado = soma de a[i][k] * (linha k de b) sobre os não nulos
+    ponteiros = array("q", [0])
+    indices = array("q")
+    valores = array("d")
+    for i in range(a.linhas):
+        acumulador = {}
+        for t in range(a.ponteiros[i], a.ponteiros[i + 1]):
+            k, aik = a.indices[t], a.valores[t]
+            for u in range(b.ponteiros[k], b.ponteiros[k + 1]):
+                j = b.indices[u]
+                acumulador[j] = acumulador.get(j, 0.0) + aik * b.valores[u]
+        for j in sorted(acumulador):
+            if acumulador[j] != 0.0:
+                indices.append(j)
+                valores.append(acumulador[j])
+        ponteiros.append(len(indices))
+    return MatrizEsparsa(a.linhas, b.colunas, ponteiros, indices, valores)
+
+def _mul_esparsa_densa(a, b):
+    # Linha i do resultado = combinação das linhas de b indicadas pelos não nulos da linha i de a
+    if not isinstance(b, MatrizGeral):
+        b = _para_geral(b)
+    p = b.colunas
+    resultado = array("d", bytes(8 * a.linhas * p))
+    for i in range(a.linhas):
+        linha = None
+        for t in range(a.ponteiros[i], a.ponteiros[i + 1]):
+            k, aik = a.indices[t], a.valores[t]
+            linha_b = b.dados[k * p:(k + 1) * p]
+            if linha is None:
+                linha = [aik * x for x in linha_b]
+            else:
+                linha = [r + aik * x for r, x in zip(linha, linha_b)]
+        if linha is not None:
+            resultado[i * p:(i + 1) * p] = array("d", linha)
+    return MatrizGeral(a.linhas, p, resultado)
+
+def _mul_densa_esparsa(a, b):
+    # Para cada a[i][k] não nulo, espalha a[i][k] * (não nulos da linha k de b) na linha i
+    if not isinstance(a, MatrizGeral):
+        a = _para_geral(a)
+    n, p = a.colunas, b.colunas
+    resultado = array("d", bytes(8 * a.linhas * p))
+    for i in range(a.linhas):
+        base = i * p
+        for k, aik in enumerate(a.dados[i * n:(i + 1) * n]):
+            if aik == 0.0:
+                continue
+            for t in range(b.ponteiros[k], b.ponteiros[k + 1]):
+                resultado[base + b.indices[t]] += aik * b.valores[t]
+    return MatrizGeral(a.linhas, p, resultado)
+
+def _mul_diagonal_esparsa(a, b):
+    # Escalonamento das linhas: cada não nulo da linha i multiplicado por d_i
+    valores = array("d", b.valores)
+    for i, d in enumerate(a.diagonal):
+        inicio, fim = b.ponteiros[i], b.ponteiros[i + 1]
+        valores[inicio:fim] = array("d", [d * v for v in valores[inicio:fim]])
+    return MatrizEsparsa(b.linhas, b.colunas, array("q", b.ponteiros), array("q", b.indices), valores)
+
+def _mul_esparsa_diagonal(a, b):
+    # Escalonamento das colunas: cada não nulo (i, j) multiplicado por d_j
+    d = b.diagonal
+    valores = array("d", [v * d[j] for v, j in zip(a.valores, a.indices)])
+    return MatrizEsparsa(a.linhas, a.colunas, array("q", a.ponteiros), array("q", a.indices), valores)
+
+def _mul_banda_banda(a, b):
+    # C[i][i+ka+kb] += A[i][i+ka] * B[i+ka][i+ka+kb], faixa a faixa: O(n * banda_a * banda_b)
+    n = a.linhas
+    resultado = MatrizBanda(n, min(a.inferior + b.inferior, n - 1), min(a.superior + b.superior, n - 1))
+    dados_r = resultado.dados
+    for ka in a.diagonais():
+        base_a = (ka + a.inferior) * n
+        for kb in b.diagonais():
+            k = ka + kb
+            if not -resultado.inferior <= k <= resultado.superior:
+                continue
+            i0, i1 = max(0, -ka, -k), min(n, n - ka, n - k)
+            if i0 >= i1:
+                continue
+            base_b = (kb + b.inferior) * n + ka
+            base_r = (k + resultado.inferior) * n
+            dados_r[base_r + i0:base_r + i1] = array("d", map(add, dados_r[base_r + i0:base_r + i1],
+                                                              map(mul, a.dados[base_a + i0:base_a + i1], b.dados[base_b + i0:base_b + i1])))
+    return resultado
+
+def _mul_banda_diagonal(a, b):
+    # Escalonamento das colunas: A[i][i+k] * d[i+k]
+    resultado = MatrizBanda(a.linhas, a.inferior, a.superior)
+    for k in a.diagonais():
+        inicio, fim = a._faixa(k)
+        j0 = max(0, k)
+        resultado.dados[inicio:fim] = array("d", map(mul, a.dados[inicio:fim], b.diagonal[j0:j0 + fim - inicio]))
+    return resultado
+
+def _mul_diagonal_banda(a, b):
+    # Escalonamento das linhas: d[i] * B[i][i+k]
+    resultado = MatrizBanda(b.linhas, b.inferior, b.superior)
+    for k in b.diagonais():
+        inicio, fim = b._faixa(k)
+        i0 = max(0, -k)
+        resultado.dados[inicio:fim] = array("d", map(mul, a.diagonal[i0:i0 + fim - inicio], b.dados[inicio:fim]))
+    return resultado
+
+def _mul_banda_densa(a, b):
+    # Linha i do resultado = soma, sobre as diagonais k, de A[i][i+k] * (linha i+k de b)
+    if not isinstance(b, MatrizGeral):
+        b = _para_geral(b)
+    n, p = a.linhas, b.colunas
+    resultado = array("d", bytes(8 * n * p))
+    for i in range(n):
+        linha = [0.0] * p
+        for k in range(max(-a.inferior, -i), min(a.superior, n - 1 - i) + 1):
+            aik = a.dados[(k + a.inferior) * n + i]
+            if aik != 0.0:
+                linha = [r + aik * x for r, x in zip(linha, b.dados[(i + k) * p:(i + k + 1) * p])]
+        resultado[i * p:(i + 1) * p] = array("d", linha)
+    return MatrizGeral(n, p, resultado)
+
+def _mul_densa_banda(a, b):
+    # Coluna j do resultado recebe A[:, j-k] * B[j-k][j]; por linha de a, uma fatia por diagonal
+    if not isinstance(a, MatrizGeral):
+        a = _para_geral(a)
+    m, n = a.linhas, b.linhas
+    resultado = array("d", bytes(8 * m * n))
+    for i in range(m):
+        linha_a = a.dados[i * n:(i + 1) * n]
+        linha = [0.0] * n
+        for k in b.diagonais():
+            inicio, fim = b._faixa(k)
+            j0 = max(0, -k)
+            j1 = j0 + fim - inicio
+            linha[j0 + k:j1 + k] = map(add, linha[j0 + k:j1 + k], map(mul, linha_a[j0:j1], b.dados[inicio:fim]))
+        resultado[i * n:(i + 1) * n] = array("d", linha)
+    return MatrizGeral(m, n, resultado)
+
+def _mul_via_densa(a, b):
+    if type(a) not in _TIPOS_BASICOS and not isinstance(a, MatrizEsparsa):
+        a = _para_geral(a)
+    if type(b) not in _TIPOS_BASICOS and not isinstance(b, MatrizEsparsa):
+        b = _para_geral(b)
+    return multiplicar_matrizes(a, b)
+
+_NUCLEOS_MULTIPLICACAO = {
+    (MatrizGeral, MatrizGeral): _mul_denso,
+    (MatrizDiagonal, MatrizDiagonal): _mul_diagonal_diagonal,
+    (MatrizDiagonal, MatrizGeral): _mul_diagonal_linhas,
+    (MatrizDiagonal, MatrizTriangularInferior): _mul_diagonal_linhas,
+    (MatrizDiagonal, MatrizTriangularSuperior): _mul_diagonal_linhas,
+    (MatrizGeral, MatrizDiagonal): _mul_linhas_diagonal,
+    (MatrizTriangularInferior, MatrizDiagonal): _mul_linhas_diagonal,
+    (MatrizTriangularSuperior, MatrizDiagonal): _mul_linhas_diagonal,
+    (MatrizTriangularInferior, MatrizTriangularInferior): _mul_inferior_inferior,
+    (MatrizTriangularSuperior, MatrizTriangularSuperior): _mul_superior_superior,
+    (MatrizTriangularInferior, MatrizTriangularSuperior): _mul_para_geral,
+    (MatrizTriangularSuperior, MatrizTriangularInferior): _mul_para_geral,
+    (MatrizTriangularInferior, MatrizGeral): _mul_para_geral,
+    (MatrizTriangularSuperior, MatrizGeral): _mul_para_geral,
+    (MatrizGeral, MatrizTriangularInferior): _mul_para_geral,
+    (MatrizGeral, MatrizTriangularSuperior): _mul_para_geral,
+    (MatrizGeral, MatrizTransposta): _mul_denso,
+    (MatrizTransposta, MatrizGeral): _mul_denso,
+    (MatrizTransposta, MatrizTransposta): _mul_transposta_transposta,
+    (MatrizEsparsa, MatrizEsparsa): _mul_esparsa_esparsa,
+    (MatrizEsparsa, MatrizGeral): _mul_esparsa_densa,
+    (MatrizEsparsa, MatrizTriangularInferior): _mul_esparsa_densa,
+    (MatrizEsparsa, MatrizTriangularSuperior): _mul_esparsa_densa,
+    (MatrizGeral, MatrizEsparsa): _mul_densa_esparsa,
+    (MatrizTriangularInferior, MatrizEsparsa): _mul_densa_esparsa,
+    (MatrizTriangularSuperior, MatrizEsparsa): _mul_densa_esparsa,
+    (MatrizDiagonal, MatrizEsparsa): _mul_diagonal_esparsa,
+    (MatrizEsparsa, MatrizDiagonal): _mul_esparsa_diagonal,
+    (MatrizBanda, MatrizBanda): _mul_banda_banda,
+    (MatrizBanda, MatrizDiagonal): _mul_banda_diagonal,
+    (MatrizDiagonal, MatrizBanda): _mul_diagonal_banda,
+    (MatrizBanda, MatrizGeral): _mul_banda_densa,
+    (MatrizGeral, MatrizBanda): _mul_densa_banda,
+}
+
+def multiplicar_matrizes(a: Matriz, b: Matriz) -> Matriz:
+    if a.colunas != b.linhas:
+        raise ValueError("Dimensões incompatíveis para multiplicação")
+    if isinstance(a, MatrizTransposta) and not _vista_consumivel(a, b):
+        a = a.materializar()
+    if isinstance(b, MatrizTransposta) and not _vista_consumivel(b, a):
+        b = b.materializar()
+    if _motor == "numpy" and _np_suporta(a) and _np_suporta(b):
+        return _compactar_resultado(_mul_numpy(a, b))
+    nucleo = _NUCLEOS_MULTIPLICACAO.get((type(a), type(b)), _mul_via_densa)
+    return _compactar_resultado(nucleo(a, b))
+
+def _vista_consumivel(vista, outro):
+    if not isinstance(vista.base, MatrizGeral):
+        return False
+    if _motor == "numpy":
+        return _np_suporta(outro)
+    return isinstance(outro, MatrizGeral) or _eh_vista_densa(outro)
+
+def _resolver_colunas(b, n, resolver_coluna):
+    if isinstance(b, Matriz):
+        if b.linhas != n:
+            raise ValueError("Dimensões incompatíveis para resolver o sistema")
+        k = b.colunas
+        resultado = MatrizGeral(n, k)
+        for j in range(k):
+            coluna = array("d", [b.get_elemento(i, j) for i in range(n)])
+            resultado.dados[j::k] = resolver_coluna(coluna)
+        return resultado
+    if len(b) != n:
+        raise ValueError("Dimensões incompatíveis para resolver o sistema")
+    if isinstance(b, Vetor):
+        return Vetor(n, resolver_coluna(array("d", b.dados)))
+    return resolver_coluna(array("d", b)).tolist()
+
+def _fatorar_lu(a):
+    # Devolve (permutação, L, U, sinal), com L e U empacotadas.
+    if not a.eh_quadrada():
+        raise ValueError("Decomposição LU só definida para matrizes quadradas")
+    n = a.linhas
+    permutacao = list(range(n))
+    sinal = 1.0
+    if _motor == "numpy":
+        m = _np_denso(a).copy()
+        for k in range(n):
+            p = k + int(np.argmax(np.abs(m[k:, k])))
+            if p != k:
+                m[[k, p]] = m[[p, k]]
+                permutacao[k], permutacao[p] = permutacao[p], permutacao[k]
+                sinal = -sinal
+            pivo = m[k, k]
+            if pivo != 0.0:
+                m[k + 1:, k] /= pivo
+                m[k + 1:, k + 1:] -= np.outer(m[k + 1:, k], m[k, k + 1:])
+        L = _np_empacotar(np.tril(m, -1) + np.eye(n), MatrizTriangularInferior(n))
+        U = _np_empacotar(m, MatrizTriangularSuperior(n))
+        return permutacao, L, U, sinal
+    linhas = [array("d", a.dados[i * n:(i + 1) * n]) for i in range(n)]
+    for k in range(n):
+        p = max(range(k, n), key=lambda i: abs(linhas[i][k]))
+        if p != k:
+            linhas[k], linhas[p] = linhas[p], linhas[k]
+            permutacao[k], permutacao[p] = permutacao[p], permutacao[k]
+            sinal = -sinal
+        linha_k = linhas[k]
+        pivo = linha_k[k]
+        if pivo == 0.0:
+            continue
+        resto_k = linha_k[k + 1:]
+        for linha_i in linhas[k + 1:]:
+            f = linha_i[k] / pivo
+            linha_i[k] = f
+            if f != 0.0:
+                linha_i[k + 1:] = array("d", [x - f * y for x, y in zip(linha_i[k + 1:], resto_k)])
+    L = MatrizTriangularInferior(n, array("d", chain.from_iterable(chain(linha[:i], (1.0,)) for i, linha in enumerate(linhas))))
+    U = MatrizTriangularSuperior(n, array("d", chain.from_iterable(linha[i:] for i, linha in enumerate(linhas))))
+    return permutacao, L, U, sinal
+
+# API funcional com destino opcional (out=).
+
+_TIPOS_BASICOS = (MatrizGeral, MatrizDiagonal, MatrizTriangularInferior, MatrizTriangularSuperior)
+
+def _buffer(m):
+    return m.diagonal if isinstance(m, MatrizDiagonal) else m.dados
+
+def _cabe_em(m, destino):
+    # A estrutura de destino comporta todos os elementos possivelmente não nulos de m?
+    if type(destino) not in _TIPOS_BASICOS:
+        return False
+    if isinstance(destino, MatrizGeral):
+        return True
+    if type(m) not in _TIPOS_BASICOS:
+        return False
+    return type(m) is type(destino) or (isinstance(m, MatrizDiagonal) and not isinstance(destino, MatrizDiagonal))
+
+def _classe_produto(a, b):
+    # Tipo de resultado que os núcleos de multiplicação devolvem para o par
+    if type(a) not in _TIPOS_BASICOS or type(b) not in _TIPOS_BASICOS:
+        return MatrizGeral
+    if type(a) is type(b) and not isinstance(a, MatrizGeral):
+        return type(a)
+    if isinstance(a, MatrizDiagonal) and not isinstance(b, MatrizGeral):
+        return type(b)
+    if isinstance(b, MatrizDiagonal) and not isinstance(a, MatrizGeral):
+        return type(a)
+    return MatrizGeral
+
+def _zerar(m):
+    buffer = _buffer(m)
+    buffer[:] = array("d", bytes(8 * len(buffer)))
+
+def _acumular(destino, m, operacao):
+    # Pressupõe _cabe_em(m, destino).
+    if m is not destino and _dono_armazenamento(m) is _dono_armazenamento(destino):
+        # A += A.transposta(): m lê o armazenamento que está sendo escrito.
+        m = m.materializar() if isinstance(m, MatrizTransposta) else copy.deepcopy(m)
+    if type(m) is type(destino):
+        _combinar_buffers(_buffer(destino), _buffer(m), operacao, _buffer(destino))
+        return
+    dados = destino.dados
+    if isinstance(m, MatrizDiagonal):
+        for i, d in enumerate(m.diagonal):
+            inicio, _, coluna = destino._linha(i)
+            k = inicio + i - coluna
+            dados[k] = operacao(dados[k], d)
+    elif type(m) in _TIPOS_BASICOS:
+        for i in range(m.linhas):
+            inicio_m, fim_m, coluna_m = m._linha(i)
+            inicio_d, _, coluna_d = destino._linha(i)
+            k = inicio_d + coluna_m - coluna_d
+            fim = k + fim_m - inicio_m
+            dados[k:fim] = _combinar_buffers(dados[k:fim], m.dados[inicio_m:fim_m], operacao)
+    elif isinstance(m, MatrizEsparsa):
+        c = destino.colunas
+        for i in range(m.linhas):
+            base = i * c
+            for t in range(m.ponteiros[i], m.ponteiros[i + 1]):
+                k = base + m.indices[t]
+                dados[k] = operacao(dados[k], m.valores[t])
+    elif _eh_vista_densa(m):
+        c = destino.colunas
+        for i in range(m.linhas):
+            dados[i * c:(i + 1) * c] = _combinar_buffers(dados[i * c:(i + 1) * c], _linha_densa(m, i), operacao)
+    else:
+        c = destino.colunas
+        for i, j, v in _entradas(m):
+            dados[i * c + j] = operacao(dados[i * c + j], v)
+
+def _copiar_para(origem, destino):
+    if not _cabe_em(origem, destino):
+        raise TypeError(f"Resultado {origem.tipo()} não cabe na matriz de destino {destino.tipo()}")
+    if type(origem) is type(destino):
+        _buffer(destino)[:] = array("d", _buffer(origem))
+    else:
+        _zerar(destino)
+        _acumular(destino, origem, add)
+
+def _operar_elementos(a, b, operacao, out, descricao):
+    if not isinstance(a, Matriz) or not isinstance(b, Matriz):
+        raise TypeError("Operação somente entre matrizes")
+    if a.linhas != b.linhas or a.colunas != b.colunas:
+        raise ValueError(f"Dimensões incompatíveis para {descricao}")
+    if out is None:
+        return operacao(a, b)
+    if out.linhas != a.linhas or out.colunas != a.colunas:
+        raise ValueError("Dimensões incompatíveis com a matriz de destino")
+    # Operando que compartilha o armazenamento de out: calcula num temporário.
+    if (out is not a and _dono_armazenamento(a) is _dono_armazenamento(out)) or \
+            (b is not a and _dono_armazenamento(b) is _dono_armazenamento(out)):
+        _copiar_para(operacao(a, b), out)
+    else:
+        if not _cabe_em(b, out):
+            raise TypeError(f"Resultado não cabe na matriz de destino {out.tipo()}")
+        if out is not a:
+            _copiar_para(a, out)
+        _acumular(out, b, operacao)
+    out.marcar_modificada()
+    return out
+
+def somar(a: Matriz, b: Matriz, out: Matriz = None) -> Matriz:
+    return _operar_elementos(a, b, add, out, "soma")
+
+def subtrair(a: Matriz, b: Matriz, out: Matriz = None) -> Matriz:
+    return _operar_elementos(a, b, sub, out, "subtração")
+
+def _multiplicar_em(a, b, out):
+    # Devolve False se o tipo de out não comporta o resultado.
+    if type(a) not in _TIPOS_BASICOS or type(b) not in _TIPOS_BASICOS:
+        return False
+    classe = _classe_produto(a, b)
+    if type(out) is not classe and not isinstance(out, MatrizGeral):
+        return False
+    if isinstance(a, MatrizDiagonal) and isinstance(b, MatrizDiagonal):
+        if isinstance(out, MatrizDiagonal):
+            _combinar_buffers(a.diagonal, b.diagonal, mul, out.diagonal)
+            return True
+        return False
+    if _motor == "numpy":
+        if isinstance(out, MatrizGeral):
+            np.matmul(_np_denso(a), _np_denso(b), out=_np_denso(out))
+        else:
+            _np_empacotar(_np_denso(a) @ _np_denso(b), out)
+        return True
+    if isinstance(a, MatrizGeral) and isinstance(b, MatrizGeral):
+        _mul_denso(a, b, out.dados)
+        return True
+    if isinstance(a, MatrizDiagonal) or isinstance(b, MatrizDiagonal):
+        return False
+    _mul_produtos_internos(a, b, out)
+    return True
+
+def multiplicar(a: Matriz, b, out: Matriz = None) -> Matriz:
+    if out is None:
+        return a * b
+    if isinstance(b, (int, float)):
+        if out.linhas != a.linhas or out.colunas != a.colunas:
+            raise ValueError("Dimensões incompatíveis com a matriz de destino")
+        if type(out) is type(a) and type(a) in _TIPOS_BASICOS:
+            _escalar_buffer(_buffer(a), b, _buffer(out))
+        else:
+            _copiar_para(a * b, out)
+    elif isinstance(b, Matriz):
+        if a.colunas != b.linhas:
+            raise ValueError("Dimensões incompatíveis para multiplicação")
+        if out.linhas != a.linhas or out.colunas != b.colunas:
+            raise ValueError("Dimensões incompatíveis com a matriz de destino")
+        if _dono_armazenamento(a) is _dono_armazenamento(out) or \
+                _dono_armazenamento(b) is _dono_armazenamento(out) or not _multiplicar_em(a, b, out):
+            _copiar_para(multiplicar_matrizes(a, b), out)
+    else:
+        raise TypeError("Multiplicação inválida")
+    out.marcar_modificada()
+    return out
+
+def _identidade_como(m):
+    # Identidade n x n na estrutura de m (densa para os tipos sem estrutura própria)
+    n = m.linhas
+    uns = array("d", [1.0]) * n
+    if isinstance(m, MatrizDiagonal):
+        return MatrizDiagonal(n, uns)
+    if type(m) in (MatrizTriangularInferior, MatrizTriangularSuperior, MatrizSimetrica):
+        resultado = type(m)(n)
+        for i in range(n):
+            resultado.set_elemento(i, i, 1.0)
+        return resultado
+    if isinstance(m, MatrizBanda):
+        return MatrizBanda(n, 0, 0, uns)
+    resultado = MatrizGeral(n, n)
+    resultado.dados[::n + 1] = uns
+    return resultado
+
+def potencia(m: Matriz, k: int) -> Matriz:
+    if not isinstance(k, int):
+        raise TypeError("Expoente deve ser inteiro")
+    if not m.eh_quadrada():
+        raise ValueError("Potência só definida para matrizes quadradas")
+    if k < 0:
+        m, k = m.inversa(), -k
+    if k == 0:
+        return _identidade_como(m)
+    resultado, base = None, m
+    while True:
+        if k & 1:
+            resultado = base if resultado is None else resultado * base
+        k >>= 1
+        if not k:
+            break
+        base = base * base
+    # A ** 1 não devolve o próprio operando
+    return _copia_resultado(resultado) if resultado is m else resultado
+
+def avaliar_polinomio(m: Matriz, coeficientes) -> Matriz:
+    coeficientes = [float(c) for c in coeficientes]
+    if not coeficientes:
+        raise ValueError("Polinômio sem coeficientes")
+    if not m.eh_quadrada():
+        raise ValueError("Polinômio só definido para matrizes quadradas")
+    m = _concreta(m)
+    n = m.linhas
+    classe = type(m) if type(m) in _TIPOS_BASICOS else MatrizGeral
+    atual, proximo = (MatrizGeral(n, n) if classe is MatrizGeral else classe(n) for _ in range(2))
+    _acumular(atual, MatrizDiagonal(n, array("d", [coeficientes[-1]]) * n), add)
+    for c in reversed(coeficientes[:-1]):
+        multiplicar(atual, m, out=proximo)
+        if c:
+            _acumular(proximo, MatrizDiagonal(n, array("d", [c]) * n), add)
+        atual, proximo = proximo, atual
+    atual.marcar_modificada()
+    return atual
+
+def _para_geral(m):
+    # Conversão explícita para o armazenamento denso (fallback entre tipos diferentes)
+    if isinstance(m, MatrizGeral):
+        return MatrizGeral(m.linhas, m.colunas, array("d", m.dados))
+    if _motor == "numpy" and _np_suporta(m):
+        resultado = MatrizGeral(m.linhas, m.colunas)
+        _np_denso(resultado)[:] = _np_denso(m)
+        return resultado
+    return MatrizGeral(m.linhas, m.colunas, m.to_array())
+
+
+def _larguras_banda(m, tolerancia):
+    # (inferior, superior): maiores i - j e j - i entre os elementos não nulos de m
+    inferior = superior = 0
+    if isinstance(m, MatrizGeral):
+        n = m.colunas
+        if _motor == "numpy":
+            i, j = np.nonzero(np.abs(_np_denso(m)) > tolerancia)
+            if i.size:
+                deslocamentos = j - i
+                inferior, superior = max(0, -int(deslocamentos.min())), max(0, int(deslocamentos.max()))
+            return inferior, superior
+        for i in range(m.linhas):
+            nao_nulos = [j for j, v in enumerate(m.dados[i * n:(i + 1) * n]) if abs(v) > tolerancia]
+            if nao_nulos:
+                inferior = max(inferior, i - nao_nulos[0])
+                superior = max(superior, nao_nulos[-1] - i)
+        return inferior, superior
+    for i, j, v in _entradas(m):
+        if abs(v) > tolerancia:
+            inferior, superior = max(inferior, i - j), max(superior, j - i)
+    return inferior, superior
+
+def _eh_simetrica(denso, tolerancia):
+    n, dados = denso.linhas, denso.dados
+    if _motor == "numpy":
+        d = _np_denso(denso)
+        return bool(np.all(np.abs(d - d.T) <= tolerancia))
+    return all(abs(x - y) <= tolerancia
+               for i in range(n)
+               for x, y in zip(dados[i * n + i + 1:(i + 1) * n], dados[(i + 1) * n + i::n]))
+
+def _extrair_estrutura(denso, classe, inferior, superior):
+    # Copia de uma MatrizGeral n x n só as posições da estrutura de classe
+    n, dados = denso.linhas, denso.dados
+    if classe is MatrizDiagonal:
+        return MatrizDiagonal(n, array("d", dados[::n + 1]), denso.nome)
+    if classe is MatrizTriangularInferior:
+        buffer = array("d")
+        for i in range(n):
+            buffer.extend(dados[i * n:i * n + i + 1])
+        return MatrizTriangularInferior(n, buffer, denso.nome)
+    if classe in (MatrizTriangularSuperior, MatrizSimetrica):
+        buffer = array("d")
+        for i in range(n):
+            buffer.extend(dados[i * n + i:(i + 1) * n])
+        return classe(n, buffer, denso.nome)
+    # Banda: a diagonal k (elementos (i, i + k)) fica no passo n + 1 do buffer denso
+    banda = MatrizBanda(n, inferior, superior, nome=denso.nome)
+    for k in range(-inferior, superior + 1):
+        inicio, fim = banda._faixa(k)
+        i0 = max(0, -k)
+        banda.dados[inicio:fim] = array("d", dados[i0 * (n + 1) + k::n + 1][:fim - inicio])
+    return banda
+
+def _estrutura_de_entradas(m, classe, inferior, superior):
+    # Esparsa, banda etc.: copia os elementos armazenados que caem na estrutura, sem a forma densa
+    n = m.linhas
+    resultado = MatrizBanda(n, inferior, superior, nome=m.nome) if classe is MatrizBanda else classe(n, nome=m.nome)
+    for i, j, v in _entradas(m):
+        if -inferior <= j - i <= superior and (classe is not MatrizSimetrica or j >= i):
+            resultado.set_elemento(i, j, v)
+    return resultado
+
+def compactar(m: Matriz, tolerancia: float = 0.0) -> Matriz:
+    m = _concreta(m)
+    if not m.eh_quadrada() or isinstance(m, MatrizDiagonal):
+        return m
+    n = m.linhas
+    inferior, superior = _larguras_banda(m, tolerancia)
+    # (elementos armazenados, classe); em caso de empate vale a ordem da lista
+    candidatos = [((inferior + superior + 1) * n, MatrizBanda)]
+    if inferior == superior == 0:
+        candidatos.append((n, MatrizDiagonal))
+    if superior == 0:
+        candidatos.append((n * (n + 1) // 2, MatrizTriangularInferior))
+    if inferior == 0:
+        candidatos.append((n * (n + 1) // 2, MatrizTriangularSuperior))
+    ordem = (MatrizDiagonal, MatrizTriangularInferior, MatrizTriangularSuperior, MatrizBanda, MatrizSimetrica)
+    custo, classe = min(candidatos, key=lambda c: (c[0], ordem.index(c[1])))
+    # Numa vista transposta, compara com o armazenamento da base, que é o que ela representa
+    atual = (m.base if isinstance(m, MatrizTransposta) else m).tamanho_bytes()
+    denso = m if isinstance(m, MatrizGeral) else None
+    if inferior and superior and n * (n + 1) // 2 < custo and 4 * n * (n + 1) < atual:
+        denso = denso or _para_geral(m)
+        if _eh_simetrica(denso, tolerancia):
+            custo, classe = n * (n + 1) // 2, MatrizSimetrica
+    if 8 * custo >= atual:
+        return m
+    if denso is None:
+        return _estrutura_de_entradas(m, classe, inferior, superior)
+    return _extrair_estrutura(denso, classe, inferior, superior)
+
+_TIPOS_COMPACTAVEIS = (MatrizGeral, MatrizEsparsa, MatrizBanda, MatrizSimetrica)
+
+def _compactar_resultado(resultado):
+    if _compactacao is None or type(resultado) not in _TIPOS_COMPACTAVEIS:
+        return resultado
+    return compactar(resultado, _compactacao)
+
+# Núcleos do motor numpy.
+
+_NP_TIPOS = _TIPOS_BASICOS
+
+def _np_suporta(m):
+    if isinstance(m, MatrizTransposta):
+        return type(m.base) in _NP_TIPOS
+    return type(m) in _NP_TIPOS
+
+@lru_cache(maxsize=32)
+def _np_indices_empacotados(n, inferior):
+    # (linhas, colunas) de cada posição do armazenamento empacotado, na ordem do buffer
+    return np.tril_indices(n) if inferior else np.triu_indices(n)
+
+def _np_indices(m):
+    return _np_indices_empacotados(m.linhas, isinstance(m, MatrizTriangularInferior))
+
+def _mul_vetor_empacotada_numpy(m, x):
+    # Triangular empacotada: y[i] = soma dos produtos da linha i, acumulados por np.bincount
+    linhas, colunas = _np_indices(m)
+    y = Vetor(m.linhas)
+    _np_vetor(y.dados)[:] = np.bincount(linhas, weights=_np_vetor(m.dados) * _np_vetor(x)[colunas], minlength=m.linhas)
+    return y
+
+def _np_denso(m):
+    # Visão 2-D sem cópia para MatrizGeral (e sua transposta); as demais são desempacotadas
+    if isinstance(m, MatrizTransposta):
+        return _np_denso(m.base).T
+    if isinstance(m, MatrizGeral):
+        return _np_vetor(m.dados).reshape(m.linhas, m.colunas)
+    denso = np.zeros((m.linhas, m.colunas))
+    if isinstance(m, MatrizDiagonal):
+        np.fill_diagonal(denso, _np_vetor(m.diagonal))
+    else:
+        denso[_np_indices(m)] = _np_vetor(m.dados)
+    return denso
+
+def _np_empacotar(denso, resultado):
+    if isinstance(resultado, MatrizGeral):
+        _np_denso(resultado)[:] = denso
+    elif isinstance(resultado, MatrizDiagonal):
+        _np_vetor(resultado.diagonal)[:] = np.diagonal(denso)
+    else:
+        _np_vetor(resultado.dados)[:] = denso[_np_indices(resultado)]
+    return resultado
+
+def _mul_numpy(a, b):
+    classe = _classe_produto(a, b)
+    resultado = MatrizGeral(a.linhas, b.colunas) if classe is MatrizGeral else classe(a.linhas)
+    if isinstance(a, MatrizDiagonal) and isinstance(b, MatrizDiagonal):
+        np.multiply(_np_vetor(a.diagonal), _np_vetor(b.diagonal), out=_np_vetor(resultado.diagonal))
+    elif isinstance(a, MatrizDiagonal):
+        # Escalonamento das linhas de b, direto sobre o armazenamento
+        d = _np_vetor(a.diagonal)
+        if classe is MatrizGeral:
+            np.multiply(d[:, None], _np_denso(b), out=_np_denso(resultado))
+        else:
+            np.multiply(d[_np_indices(b)[0]], _np_vetor(b.dados), out=_np_vetor(resultado.dados))
+    elif isinstance(b, MatrizDiagonal):
+        # Escalonamento das colunas de a
+        d = _np_vetor(b.diagonal)
+        if classe is MatrizGeral:
+            np.multiply(_np_denso(a), d[None, :], out=_np_denso(resultado))
+        else:
+            np.multiply(_np_vetor(a.dados), d[_np_indices(a)[1]], out=_np_vetor(resultado.dados))
+    elif isinstance(resultado, MatrizGeral):
+        np.matmul(_np_denso(a), _np_denso(b), out=_np_denso(resultado))
+    else:
+        _np_empacotar(_np_denso(a) @ _np_denso(b), resultado)
+    return resultado
+
+# Execução paralela sobre blocos de multiprocessing.shared_memory.
+
+def _compartilhar(buffer):
+    memoria = shared_memory.SharedMemory(create=True, size=max(_nbytes(buffer), 8))
+    memoria.buf[:_nbytes(buffer)] = memoryview(buffer).cast("B")
+    return memoria
+
+def _distribuir(tarefa, buffers, tamanho_saida, total, *argumentos):
+    memorias = []
+    try:
+        for buffer in buffers:
+            memorias.append(_compartilhar(buffer))
+        entradas = [(memoria.name, len(buffer)) for memoria, buffer in zip(memorias, buffers)]
+        saida = shared_memory.SharedMemory(create=True, size=max(8 * tamanho_saida, 8))
+        memorias.append(saida)
+        limites = [total * k // _trabalhadores for k in range(_trabalhadores + 1)]
+        pool = _obter_pool()
+        futuros = [pool.submit(tarefa, entradas, (saida.name, tamanho_saida), inicio, fim, *argumentos)
+                   for inicio, fim in zip(limites, limites[1:]) if inicio < fim]
+        for futuro in futuros:
+            futuro.result()
+        resultado = array("d")
+        resultado.frombytes(saida.buf[:8 * tamanho_saida])
+        return resultado
+    finally:
+        for memoria in memorias:
+            memoria.close()
+            memoria.unlink()
+
+@contextmanager
+def _abrir_compartilhadas(descricoes):
+    # Vistas 'd' dos blocos (nome, elementos); liberadas antes de fechar cada bloco
+    memorias, vistas = [], []
+    try:
+        for nome, tamanho in descricoes:
+            memoria = shared_memory.SharedMemory(name=nome)
+            memorias.append(memoria)
+            vistas.append(memoria.buf[:8 * tamanho].cast("d"))
+        yield vistas
+    finally:
+        for vista in vistas:
+            vista.release()
+        for memoria in memorias:
+            memoria.close()
+
+def _forma_densa(m):
+    # (linhas, colunas, transposta) da MatrizGeral que guarda os dados de m
+    if isinstance(m, MatrizTransposta):
+        return m.base.linhas, m.base.colunas, True
+    return m.linhas, m.colunas, False
+
+def _reconstruir_densa(dados, linhas, colunas, transposta):
+    base = MatrizGeral(linhas, colunas, dados)
+    return MatrizTransposta(base) if transposta else base
+
+def _tarefa_produto(entradas, saida, inicio, fim, formas, bloco):
+    global _tamanho_bloco
+    _tamanho_bloco = bloco
+    with _abrir_compartilhadas(entradas + [saida]) as (dados_a, dados_b, dados_c):
+        a = _reconstruir_densa(dados_a, *formas[0])
+        b = _reconstruir_densa(dados_b, *formas[1])
+        p = b.colunas
+        faixa = dados_c[inicio * p:fim * p]
+        faixa[:] = array("d", bytes(8 * len(faixa)))
+        _produto_linhas(a, b, faixa, inicio, fim)
+        faixa.release()
+
+def _tarefa_elementos(entradas, saida, inicio, fim, operacao):
+    with _abrir_compartilhadas(entradas + [saida]) as (dados_a, dados_b, dados_c):
+        dados_c[inicio:fim] = array("d", map(operacao, dados_a[inicio:fim], dados_b[inicio:fim]))
+
+def _tarefa_transposta(entradas, saida, inicio, fim, linhas, colunas):
+    # Linhas inicio..fim-1 da transposta de uma matriz linhas x colunas
+    with _abrir_compartilhadas(entradas + [saida]) as (dados, dados_t):
+        for j in range(inicio, fim):
+            dados_t[j * linhas:(j + 1) * linhas] = array("d", dados[j::colunas])
+
+def _mul_paralelo(a, b, destino=None):
+    m, p = a.linhas, b.colunas
+    buffers = [a.base.dados if isinstance(a, MatrizTransposta) else a.dados,
+               b.base.dados if isinstance(b, MatrizTransposta) else b.dados]
+    resultado = _distribuir(_tarefa_produto, buffers, m * p, m,
+                            (_forma_densa(a), _forma_densa(b)), _tamanho_bloco)
+    if destino is not None:
+        destino[:] = resultado
+        resultado = destino
+    return MatrizGeral(m, p, resultado)
+
+def _combinar_gerais(a, b, operacao):
+    tamanho = a.linhas * a.colunas
+    if _usar_paralelo(tamanho):
+        dados = _distribuir(_tarefa_elementos, [a.dados, b.dados], tamanho, tamanho, operacao)
+    else:
+        dados = _combinar_buffers(a.dados, b.dados, operacao)
+    return MatrizGeral(a.linhas, a.colunas, dados)
+
+def _transpor_paralelo(m):
+    dados = _distribuir(_tarefa_transposta, [m.dados], m.linhas * m.colunas, m.colunas,
+                        m.linhas, m.colunas)
+    return MatrizGeral(m.colunas, m.linhas, dados)
+
+# Avaliação preguiçosa: A.adiar() devolve uma Expressao.
+
+class Expressao(Matriz):
+    __slots__ = ("_valor",)
+
+    def __init__(self, linhas: int, colunas: int):
+        super().__init__(linhas, colunas)
+        self._valor = None
+
+    def avaliar(self) -> Matriz:
+        if self._valor is None:
+            valor = self._calcular()
+            # Um operando devolvido como resultado (p.ex. E * 1.0) é copiado antes de ser renomeado
+            if any(valor is m or isinstance(m, MatrizTransposta) and valor is m.base
+                   for m in (f.avaliar() for f in self._filhos())):
+                valor = _copia_resultado(valor)
+            valor.nome = self.nome
+            self._valor = valor
+        return self._valor
+
+    def _filhos(self):
+        return ()
+
+    def __add__(self, other):
+        return _combinar_expressoes(self, other, 1.0, "soma")
+
+    def __sub__(self, other):
+        return _combinar_expressoes(self, other, -1.0, "subtração")
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return _Combinacao([(c * other, termo) for c, termo in _termos(self)])
+        if not isinstance(other, Matriz):
+            raise TypeError("Multiplicação inválida")
+        if self.colunas != other.linhas:
+            raise ValueError("Dimensões incompatíveis para multiplicação")
+        return _Produto(_fatores(self) + _fatores(_como_expressao(other)))
+
+    def __rmul__(self, other):
+        if isinstance(other, (int, float)):
+            return self * other
+        return NotImplemented
+
+    def transposta(self):
+        return _Transposta(self)
+
+    def get_elemento(self, i, j):
+        return self.avaliar().get_elemento(i, j)
+
+    def to_array(self):
+        return self.avaliar().to_array()
+
+    def traço(self):
+        return self.avaliar().traço()
+
+    def multiplicar_vetor(self, x):
+        return self.avaliar().multiplicar_vetor(x)
+
+    def determinante(self):
+        return self.avaliar().determinante()
+
+    def tamanho_bytes(self):
+        return 0 if self._valor is None else self._valor.tamanho_bytes()
+
+    def imprimir(self):
+        self.avaliar().imprimir()
+
+    def tipo(self):
+        return f"Expressao[{self.avaliar().tipo()}]" if self._valor is not None else "Expressao"
+
+class _Folha(Expressao):
+    __slots__ = ("matriz",)
+
+    def __init__(self, matriz: Matriz):
+        super().__init__(matriz.linhas, matriz.colunas)
+        self.matriz = matriz
+        self.nome = matriz.nome
+
+    def _calcular(self):
+        return self.matriz
+
+    def avaliar(self):
+        return self.matriz
+
+    def tamanho_bytes(self):
+        return self.matriz.tamanho_bytes()
+
+    def transposta(self):
+        if isinstance(self.matriz, MatrizDiagonal):
+            return self
+        return _Transposta(self)
+
+class _Transposta(Expressao):
+    __slots__ = ("filho",)
+
+    def __new__(cls, filho):
+        if isinstance(filho, _Transposta):
+            return filho.filho
+        return super().__new__(cls)
+
+    def __init__(self, filho):
+        super().__init__(filho.colunas, filho.linhas)
+        self.filho = filho
+
+    def _filhos(self):
+        return (self.filho,)
+
+    def _calcular(self):
+        return self.filho.avaliar().transposta()
+
+class _Produto(Expressao):
+    __slots__ = ("fatores",)
+
+    def __init__(self, fatores):
+        super().__init__(fatores[0].linhas, fatores[-1].colunas)
+        self.fatores = fatores
+
+    def _filhos(self):
+        return self.fatores
+
+    def _calcular(self):
+        matrizes = [f.avaliar() for f in self.fatores]
+        dimensoes = [m.linhas for m in matrizes] + [matrizes[-1].colunas]
+        divisao = _ordem_cadeia(dimensoes)
+
+        def multiplicar_intervalo(i, j):
+            if i == j:
+                return matrizes[i]
+            k = divisao[i][j]
+            return multiplicar_matrizes(multiplicar_intervalo(i, k), multiplicar_intervalo(k + 1, j))
+        return multiplicar_intervalo(0, len(matrizes) - 1)
+
+class _Combinacao(Expressao):
+    __slots__ = ("termos",)
+
+    def __init__(self, termos):
+        super().__init__(termos[0][1].linhas, termos[0][1].colunas)
+        self.termos = termos
+
+    def _filhos(self):
+        return [termo for _, termo in self.termos]
+
+    def _calcular(self):
+        coeficientes = [c for c, _ in self.termos]
+        matrizes = [termo.avaliar() for _, termo in self.termos]
+        classes = {type(m) for m in matrizes}
+        if len(classes) == 1 and not classes <= set(_TIPOS_BASICOS):
+            resultado = None
+            for c, m in zip(coeficientes, matrizes):
+                termo = m if c == 1.0 else m * c
+                resultado = termo if resultado is None else resultado + termo
+            return resultado
+        classe = _classe_soma(classes)
+        if classes == {classe}:
+            # Mesmo tipo: todos os buffers têm o mesmo layout
+            buffers = [_buffer(m) for m in matrizes]
+            if _motor == "numpy":
+                resultado = array("d", bytes(8 * len(buffers[0])))
+                saida = _np_vetor(resultado)
+                for c, buffer in zip(coeficientes, buffers):
+                    saida += c * _np_vetor(buffer)
+            else:
+                resultado = array("d", [sum(map(mul, coeficientes, valores)) for valores in zip(*buffers)])
+            if classe is MatrizGeral:
+                return MatrizGeral(self.linhas, self.colunas, resultado)
+            return classe(self.linhas, resultado)
+        resultado = MatrizGeral(self.linhas, self.colunas) if classe is MatrizGeral else classe(self.linhas)
+        for c, m in zip(coeficientes, matrizes):
+            if c == 1.0:
+                _acumular(resultado, m, add)
+            elif c == -1.0:
+                _acumular(resultado, m, sub)
+            else:
+                _acumular(resultado, m * c, add)
+        return resultado
+
+def _classe_soma(classes):
+    # Tipo mais econômico capaz de guardar a soma de matrizes dessas classes
+    if len(classes) == 1:
+        classe = next(iter(classes))
+        return classe if classe in _TIPOS_BASICOS else MatrizGeral
+    for triangular in (MatrizTriangularInferior, MatrizTriangularSuperior):
+        if classes <= {MatrizDiagonal, triangular}:
+            return triangular
+    return MatrizGeral
+
+def _ordem_cadeia(dimensoes):
+    # A matriz i tem dimensões dimensoes[i] x dimensoes[i+1].
+    n = len(dimensoes) - 1
+    custo = [[0] * n for _ in range(n)]
+    divisao = [[0] * n for _ in range(n)]
+    for tamanho in range(2, n + 1):
+        for i in range(n - tamanho + 1):
+            j = i + tamanho - 1
+            custo[i][j] = None
+            for k in range(i, j):
+                c = custo[i][k] + custo[k + 1][j] + dimensoes[i] * dimensoes[k + 1] * dimensoes[j + 1]
+                if custo[i][j] is None or c < custo[i][j]:
+                    custo[i][j] = c
+                    divisao[i][j] = k
+    return divisao
+
+def _como_expressao(m):
+    return m if isinstance(m, Expressao) else _Folha(m)
+
+def _termos(e):
+    return e.termos if isinstance(e, _Combinacao) else [(1.0, e)]
+
+def _fatores(e):
+    return e.fatores if isinstance(e, _Produto) else [e]
+
+def _combinar_expressoes(a, b, sinal, descricao):
+    if not isinstance(b, Matriz):
+        raise TypeError("Operação somente entre matrizes")
+    if a.linhas != b.linhas or a.colunas != b.colunas:
+        raise ValueError(f"Dimensões incompatíveis para {descricao}")
+    return _Combinacao(_termos(a) + [(sinal * c, termo) for c, termo in _termos(_como_expressao(b))])
+
+# Lotes: matrizes do mesmo tipo e dimensão em um único array('d').
+
+@lru_cache(maxsize=None)
+def _posicoes_lote(tipo, linhas, colunas):
+    # Índice denso (i * colunas + j) de cada posição do armazenamento de tipo, em ordem
+    if tipo is MatrizGeral:
+        return tuple(range(linhas * colunas))
+    if tipo is MatrizDiagonal:
+        return tuple(i * colunas + i for i in range(linhas))
+    if tipo is MatrizTriangularInferior:
+        return tuple(i * colunas + j for i in range(linhas) for j in range(i + 1))
+    return tuple(i * colunas + j for i in range(linhas) for j in range(i, colunas))
+
+@lru_cache(maxsize=None)
+def _diagonal_lote(tipo, n):
+    # Posições do armazenamento que estão na diagonal principal
+    return tuple(s for s, p in enumerate(_posicoes_lote(tipo, n, n)) if p % (n + 1) == 0)
+
+@lru_cache(maxsize=None)
+def _pares_conversao(origem, destino, linhas, colunas):
+    # (posição em origem, posição em destino) para cada elemento presente nos dois layouts
+    posicoes = {p: s for s, p in enumerate(_posicoes_lote(destino, linhas, colunas))}
+    return tuple((s, posicoes[p]) for s, p in enumerate(_posicoes_lote(origem, linhas, colunas))
+                 if p in posicoes)
+
+_TRANSPOSTA_LOTE = {
+    MatrizGeral: MatrizGeral,
+    MatrizDiagonal: MatrizDiagonal,
+    MatrizTriangularInferior: MatrizTriangularSuperior,
+    MatrizTriangularSuperior: MatrizTriangularInferior,
+}
+
+@lru_cache(maxsize=None)
+def _pares_transposta(tipo, linhas, colunas):
+    origem = {p: s for s, p in enumerate(_posicoes_lote(tipo, linhas, colunas))}
+    return tuple((origem[(p % linhas) * colunas + p // linhas], s)
+                 for s, p in enumerate(_posicoes_lote(_TRANSPOSTA_LOTE[tipo], colunas, linhas)))
+
+def _reorganizar_lote(dados, passo, pares, passo_destino, quantidade):
+    # Copia a posição s de cada matriz para a posição d do novo layout, para cada (s, d)
+    resultado = array("d", bytes(8 * passo_destino * quantidade))
+    if not pares:
+        return resultado
+    if _motor == "numpy":
+        origem, destino = (list(x) for x in zip(*pares))
+        _np_vetor(resultado).reshape(quantidade, passo_destino)[:, destino] = \
+            _np_vetor(dados).reshape(quantidade, passo)[:, origem]
+        return resultado
+    for s, d in pares:
+        resultado[d::passo_destino] = array("d", dados[s::passo])
+    return resultado
+
+def _produto_lote(a, ka, b, kb, m, n, p, quantidade):
+    # quantidade produtos densos (m x n) * (n x p); ka/kb == 1 repete o mesmo operando
+    resultado = array("d", bytes(8 * quantidade * m * p))
+    if _motor == "numpy":
+        np.einsum("...ij,...jl->...il", _np_vetor(a).reshape(ka, m, n), _np_vetor(b).reshape(kb, n, p),
+                  out=_np_vetor(resultado).reshape(quantidade, m, p))
+        return resultado
+    tamanho_a, tamanho_b, tamanho_r = m * n, n * p, m * p
+    colunas = [b[j:tamanho_b:p] for j in range(p)]
+    for k in range(quantidade):
+        inicio = k * tamanho_a if ka > 1 else 0
+        linhas_a = [a[inicio + i * n:inicio + (i + 1) * n] for i in range(m)]
+        if kb > 1:
+            inicio = k * tamanho_b
+            colunas = [b[inicio + j:inicio + tamanho_b:p] for j in range(p)]
+        resultado[k * tamanho_r:(k + 1) * tamanho_r] = array(
+            "d", [sum(map(mul, linha, coluna)) for linha in linhas_a for coluna in colunas])
+    return resultado
+
+def _det_denso(valores, n):
+    # Eliminação de Gauss com pivoteamento parcial sobre uma cópia em listas, sem objetos Matriz
+    linhas = [list(valores[i * n:(i + 1) * n]) for i in range(n)]
+    det = 1.0
+    for k in range(n):
+        pivo = max(range(k, n), key=lambda i: abs(linhas[i][k]))
+        if linhas[pivo][k] == 0:
+            return 0.0
+        if pivo != k:
+            linhas[k], linhas[pivo] = linhas[pivo], linhas[k]
+            det = -det
+        linha_k = linhas[k]
+        det *= linha_k[k]
+        for i in range(k + 1, n):
+            fator = linhas[i][k] / linha_k[k]
+            if fator:
+                linhas[i][k:] = [x - fator * y for x, y in zip(linhas[i][k:], linha_k[k:])]
+    return det
+
+def _tipo_produto_lote(a, b):
+    if a is MatrizDiagonal:
+        a = b
+    elif b is MatrizDiagonal:
+        b = a
+    return a if a is b and a in _TIPOS_BASICOS else MatrizGeral
+
+class LoteMatrizes:
+    __slots__ = ("tipo", "linhas", "colunas", "quantidade", "dados")
+
+    def __init__(self, tipo, linhas: int, colunas: int, quantidade: int, dados=None):
+        if tipo not in _TIPOS_BASICOS:
+            raise TypeError(f"Lotes aceitam apenas {', '.join(c.__name__ for c in _TIPOS_BASICOS)}")
+        if tipo is not MatrizGeral and linhas != colunas:
+            raise ValueError(f"{tipo.__name__} deve ser quadrada")
+        self.tipo = tipo
+        self.linhas = linhas
+        self.colunas = colunas
+        self.quantidade = quantidade
+        tamanho = quantidade * self.passo
+        self.dados = array("d", bytes(8 * tamanho)) if dados is None else _buffer_float(dados, tamanho)
+
+    @classmethod
+    def de_matrizes(cls, matrizes):
+        matrizes = list(matrizes)
+        if not matrizes:
+            raise ValueError("Lote vazio")
+        primeira = matrizes[0]
+        dados = array("d")
+        for m in matrizes:
+            if type(m) is not type(primeira) or (m.linhas, m.colunas) != (primeira.linhas, primeira.colunas):
+                raise ValueError("Matrizes do lote devem ter o mesmo tipo e dimensão")
+            dados.frombytes(memoryview(_buffer(m)).cast("B"))
+        return cls(type(primeira), primeira.linhas, primeira.colunas, len(matrizes), dados)
+
+    @property
+    def passo(self) -> int:
+        # Elementos armazenados por matriz
+        return len(_posicoes_lote(self.tipo, self.linhas, self.colunas))
+
+    def __len__(self):
+        return self.quantidade
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += self.quantidade
+        if not 0 <= k < self.quantidade:
+            raise IndexError("Índice fora do lote")
+        passo = self.passo
+        fatia = memoryview(self.dados)[k * passo:(k + 1) * passo]
+        if self.tipo is MatrizGeral:
+            return MatrizGeral(self.linhas, self.colunas, fatia)
+        return self.tipo(self.linhas, fatia)
+
+    def __iter__(self):
+        for k in range(self.quantidade):
+            yield self[k]
+
+    def _novo(self, tipo, linhas, colunas, dados):
+        return LoteMatrizes(tipo, linhas, colunas, self.quantidade, dados)
+
+    def converter(self, tipo):
+        # Mesmo lote no layout de tipo; elementos fora da estrutura de tipo são descartados
+        if tipo is self.tipo:
+            return self._novo(tipo, self.linhas, self.colunas, array("d", self.dados))
+        pares = _pares_conversao(self.tipo, tipo, self.linhas, self.colunas)
+        passo = len(_posicoes_lote(tipo, self.linhas, self.colunas))
+        return self._novo(tipo, self.linhas, self.colunas,
+                          _reorganizar_lote(self.dados, self.passo, pares, passo, self.quantidade))
+
+    def _densos(self):
+        return self.dados if self.tipo is MatrizGeral else self.converter(MatrizGeral).dados
+
+    def _alinhar(self, other, descricao):
+        if not isinstance(other, LoteMatrizes):
+            raise TypeError("Operação somente entre lotes")
+        if self.quantidade != other.quantidade or (self.linhas, self.colunas) != (other.linhas, other.colunas):
+            raise ValueError(f"Dimensões incompatíveis para {descricao}")
+        # Tipos diferentes: a diagonal cabe em qualquer estrutura; os demais pares ficam densos
+        if self.tipo is other.tipo:
+            return self, other
+        if self.tipo is MatrizDiagonal:
+            return self.converter(other.tipo), other
+        if other.tipo is MatrizDiagonal:
+            return self, other.converter(self.tipo)
+        return self.converter(MatrizGeral), other.converter(MatrizGeral)
+
+    def __add__(self, other):
+        a, b = self._alinhar(other, "soma")
+        return a._novo(a.tipo, a.linhas, a.colunas, _combinar_buffers(a.dados, b.dados, add))
+
+    def __sub__(self, other):
+        a, b = self._alinhar(other, "subtração")
+        return a._novo(a.tipo, a.linhas, a.colunas, _combinar_buffers(a.dados, b.dados, sub))
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return self._novo(self.tipo, self.linhas, self.colunas, _escalar_buffer(self.dados, other))
+        if isinstance(other, Matriz):
+            # Todas as matrizes do lote multiplicadas pela mesma matriz
+            return self._multiplicar(other.linhas, other.colunas, type(other), _para_geral(other).dados, 1, False)
+        if isinstance(other, LoteMatrizes):
+            if self.quantidade != other.quantidade:
+                raise ValueError("Lotes com quantidades diferentes")
+            if self.tipo is MatrizDiagonal and other.tipo is MatrizDiagonal and self.linhas == other.linhas:
+                return self._novo(MatrizDiagonal, self.linhas, self.colunas, _combinar_buffers(self.dados, other.dados, mul))
+            return self._multiplicar(other.linhas, other.colunas, other.tipo, other._densos(), other.quantidade, False)
+        raise TypeError("Multiplicação inválida")
+
+    def __rmul__(self, other):
+        if isinstance(other, (int, float)):
+            return self * other
+        raise TypeError("Multiplicação inválida")
+
+    def multiplicar_esquerda(self, m: Matriz):
+        # m * lote[k] para todo k
+        return self._multiplicar(m.linhas, m.colunas, type(m), _para_geral(m).dados, 1, True)
+
+    def _multiplicar(self, linhas, colunas, tipo, densos, quantidade, esquerda):
+        proprios = self._densos()
+        if esquerda:
+            if colunas != self.linhas:
+                raise ValueError("Dimensões incompatíveis para multiplicação")
+            m, n, p = linhas, colunas, self.colunas
+            dados = _produto_lote(densos, quantidade, proprios, self.quantidade, m, n, p, self.quantidade)
+            tipos = (tipo, self.tipo)
+        else:
+            if self.colunas != linhas:
+                raise ValueError("Dimensões incompatíveis para multiplicação")
+            m, n, p = self.linhas, self.colunas, colunas
+            dados = _produto_lote(proprios, self.quantidade, densos, quantidade, m, n, p, self.quantidade)
+            tipos = (self.tipo, tipo)
+        resultado = self._novo(MatrizGeral, m, p, dados)
+        tipo_resultado = _tipo_produto_lote(*tipos)
+        return resultado if tipo_resultado is MatrizGeral else resultado.converter(tipo_resultado)
+
+    def transposta(self):
+        tipo = _TRANSPOSTA_LOTE[self.tipo]
+        pares = _pares_transposta(self.tipo, self.linhas, self.colunas)
+        return self._novo(tipo, self.colunas, self.linhas,
+                          _reorganizar_lote(self.dados, self.passo, pares, self.passo, self.quantidade))
+
+    def _diagonais(self, operacao, inicial):
+        # Combina (soma ou produto) as posições da diagonal de cada matriz
+        resultado = array("d", [inicial]) * self.quantidade
+        passo = self.passo
+        for s in _diagonal_lote(self.tipo, self.linhas):
+            resultado = _combinar_buffers(resultado, array("d", self.dados[s::passo]), operacao)
+        return resultado
+
+    def traço(self):
+        if self.linhas != self.colunas:
+            raise ValueError("Traço só definido para matrizes quadradas")
+        if _motor == "numpy" and self.tipo is MatrizGeral:
+            n = self.linhas
+            return array("d", np.einsum("kii->k", _np_vetor(self.dados).reshape(self.quantidade, n, n)))
+        return self._diagonais(add, 0.0)
+
+    def determinante(self):
+        if self.linhas != self.colunas:
+            raise ValueError("Determinante só definido para matrizes quadradas")
+        if self.tipo is not MatrizGeral:
+            # Diagonal e triangulares: produto da diagonal
+            return self._diagonais(mul, 1.0)
+        n = self.linhas
+        if _motor == "numpy":
+            return array("d", np.linalg.det(_np_vetor(self.dados).reshape(self.quantidade, n, n)))
+        tamanho = n * n
+        return array("d", [_det_denso(self.dados[k * tamanho:(k + 1) * tamanho], n)
+                           for k in range(self.quantidade)])
+
+    def tamanho_bytes(self):
+        return _nbytes(self.dados)
+
+    def imprimir(self):
+        print(f"Lote de {self.quantidade} {self.tipo.__name__} {self.linhas}x{self.colunas}:")
+        for m in self:
+            m.imprimir()
+
+# Instrumentação opcional (ativar_instrumentacao, CALCULADORA_INSTRUMENTACAO).
+
+_METODOS_INSTRUMENTADOS = {
+    "__add__": "soma",
+    "__sub__": "subtracao",
+    "__mul__": "produto",
+    "__rmul__": "produto",
+    "transposta": "transposta",
+    "traço": "traco",
+    "determinante": "determinante",
+    "inversa": "inversa",
+    "resolver": "resolver",
+    "__matmul__": "produto",
+    "__pow__": "potencia",
+    "avaliar_polinomio": "polinomio",
+    "multiplicar_vetor": "multiplicar_vetor",
+    "multiplicar_vetores": "multiplicar_vetores",
+}
+
+class Instrumentacao:
+    # As tabelas guardam [chamadas, segundos, bytes].
+    def __init__(self, arquivo: str = None):
+        self.arquivo = arquivo
+        self.operacoes = {}  # (operação, esquerda, direita, dimensões)
+        self.promocoes = {}  # (via, tipo, dimensões)
+        self.acessos = {}    # tipo -> chamadas de get_elemento
+        # Operações e promoções em andamento: só a mais externa de cada é registrada
+        self.profundidade = 0
+        self.promovendo = 0
+
+    @staticmethod
+    def _registrar(tabela, chave, segundos, nbytes):
+        entrada = tabela.get(chave)
+        if entrada is None:
+            tabela[chave] = [1, segundos, nbytes]
+        else:
+            entrada[0] += 1
+            entrada[1] += segundos
+            entrada[2] += nbytes
+
+    def como_dict(self):
+        ordem = lambda item: -item[1][1]
+        return {
+            "operacoes": [{"operacao": op, "esquerda": esquerda, "direita": direita, "dimensoes": dimensoes,
+                           "chamadas": chamadas, "tempo": tempo, "bytes": nbytes}
+                          for (op, esquerda, direita, dimensoes), (chamadas, tempo, nbytes)
+                          in sorted(self.operacoes.items(), key=ordem)],
+            "promocoes": [{"via": via, "tipo": tipo, "dimensoes": dimensoes,
+                           "chamadas": chamadas, "tempo": tempo, "bytes": nbytes}
+                          for (via, tipo, dimensoes), (chamadas, tempo, nbytes)
+                          in sorted(self.promocoes.items(), key=ordem)],
+            "get_elemento": dict(self.acessos),
+        }
+
+    def relatorio(self) -> str:
+        dados = self.como_dict()
+        linhas = [f"{'operação':<18} {'esquerda':<26} {'direita':<26} {'dimensões':<16} "
+                  f"{'chamadas':>9} {'tempo (s)':>11} {'bytes':>12}"]
+        for e in dados["operacoes"]:
+            linhas.append(f"{e['operacao']:<18} {e['esquerda']:<26} {e['direita']:<26} {e['dimensoes']:<16} "
+                          f"{e['chamadas']:>9} {e['tempo']:>11.6f} {e['bytes']:>12}")
+        if dados["promocoes"]:
+            linhas.append("Promoções para o armazenamento denso:")
+            for e in dados["promocoes"]:
+                linhas.append(f"  {e['via']:<12} {e['tipo']:<26} {e['dimensoes']:<16} "
+                              f"{e['chamadas']:>9} {e['tempo']:>11.6f} {e['bytes']:>12}")
+        if dados["get_elemento"]:
+            linhas.append("Chamadas a get_elemento: " +
+                          ", ".join(f"{tipo} {n}" for tipo, n in sorted(dados["get_elemento"].items())))
+        return "\n".join(linhas)
+
+    def salvar(self, caminho: str):
+        texto = json.dumps(self.como_dict(), indent=2, ensure_ascii=False)
+        if caminho == "-":
+            print(texto, file=sys.stderr)
+            return
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto)
+
+_coletor = Instrumentacao()
+_originais = []  # (dono, nome, original); dono None = global do módulo
+
+def _salvar_ao_sair():
+    if _coletor.arquivo:
+        _coletor.salvar(_coletor.arquivo)
+
+# Registrado uma única vez; ativações repetidas só trocam _coletor.arquivo.
+atexit.register(_salvar_ao_sair)
+
+def _dimensoes(m):
+    return f"{m.linhas}x{m.colunas}"
+
+def _instrumentar_operacao(metodo, operacao):
+    def instrumentado(self, *args, **kwargs):
+        coletor = _coletor
+        if coletor.profundidade:
+            return metodo(self, *args, **kwargs)
+        coletor.profundidade += 1
+        try:
+            inicio = time.perf_counter()
+            resultado = metodo(self, *args, **kwargs)
+            segundos = time.perf_counter() - inicio
+        finally:
+            coletor.profundidade -= 1
+        outro = args[0] if args else None
+        if isinstance(outro, Matriz):
+            op, direita, dimensoes = operacao, type(outro).__name__, f"{_dimensoes(self)}, {_dimensoes(outro)}"
+        else:
+            op = "escalar" if operacao == "produto" and isinstance(outro, (int, float)) else operacao
+            direita, dimensoes = ("-" if outro is None else type(outro).__name__), _dimensoes(self)
+        alocado = resultado.tamanho_bytes() if isinstance(resultado, (Matriz, Vetor)) else 0
+        Instrumentacao._registrar(coletor.operacoes, (op, type(self).__name__, direita, dimensoes),
+                                  segundos, alocado)
+        return resultado
+    return instrumentado
+
+def _instrumentar_to_array(metodo):
+    def instrumentado(self):
+        coletor = _coletor
+        if coletor.promovendo:
+            return metodo(self)
+        inicio = time.perf_counter()
+        resultado = metodo(self)
+        Instrumentacao._registrar(coletor.promocoes, ("to_array", type(self).__name__, _dimensoes(self)),
+                                  time.perf_counter() - inicio, 8 * self.linhas * self.colunas)
+        return resultado
+    return instrumentado
+
+def _instrumentar_para_geral(funcao):
+    def instrumentado(m):
+        coletor = _coletor
+        coletor.promovendo += 1
+        try:
+            inicio = time.perf_counter()
+            resultado = funcao(m)
+            segundos = time.perf_counter() - inicio
+        finally:
+            coletor.promovendo -= 1
+        Instrumentacao._registrar(coletor.promocoes, ("_para_geral", type(m).__name__, _dimensoes(m)),
+                                  segundos, resultado.tamanho_bytes())
+        return resultado
+    return instrumentado
+
+def _contar_acessos(metodo):
+    def instrumentado(self, i, j):
+        nome = type(self).__name__
+        _coletor.acessos[nome] = _coletor.acessos.get(nome, 0) + 1
+        return metodo(self, i, j)
+    return instrumentado
+
+def _classes_matriz():
+    pendentes, classes = [Matriz], []
+    while pendentes:
+        classe = pendentes.pop()
+        classes.append(classe)
+        pendentes.extend(classe.__subclasses__())
+    return classes
+
+def ativar_instrumentacao(arquivo: str = None):
+    # Com arquivo, as estatísticas são gravadas nele (JSON; "-" = saída de erro) ao sair
+    if not _originais:
+        for classe in _classes_matriz():
+            for nome, metodo in list(vars(classe).items()):
+                if getattr(metodo, "__isabstractmethod__", False):
+                    continue
+                if nome in _METODOS_INSTRUMENTADOS:
+                    substituto = _instrumentar_operacao(metodo, _METODOS_INSTRUMENTADOS[nome])
+                elif nome == "to_array":
+                    substituto = _instrumentar_to_array(metodo)
+                elif nome == "get_elemento":
+                    substituto = _contar_acessos(metodo)
+                else:
+                    continue
+                _originais.append((classe, nome, metodo))
+                setattr(classe, nome, substituto)
+        _originais.append((None, "_para_geral", _para_geral))
+        globals()["_para_geral"] = _instrumentar_para_geral(_para_geral)
+    if arquivo:
+        _coletor.arquivo = arquivo
+
+def desativar_instrumentacao():
+    while _originais:
+        dono, nome, original = _originais.pop()
+        if dono is None:
+            globals()[nome] = original
+        else:
+            setattr(dono, nome, original)
+
+def instrumentacao_ativa() -> bool:
+    return bool(_originais)
+
+def estatisticas_instrumentacao() -> dict:
+    return _coletor.como_dict()
+
+def zerar_instrumentacao():
+    global _coletor
+    _coletor = Instrumentacao(_coletor.arquivo)
+
+@contextmanager
+def instrumentar():
+    # Coleta só o que acontece dentro do bloco, em um Instrumentacao próprio
+    global _coletor
+    anterior, ativa = _coletor, instrumentacao_ativa()
+    _coletor = Instrumentacao()
+    ativar_instrumentacao()
+    try:
+        yield _coletor
+    finally:
+        _coletor = anterior
+        if not ativa:
+            desativar_instrumentacao()
+
+if os.environ.get("CALCULADORA_INSTRUMENTACAO"):
+    ativar_instrumentacao(os.environ["CALCULADORA_INSTRUMENTACAO"])
+
+# Formato binário: cabeçalho do arquivo e, por matriz, cabeçalho de 48 bytes, nome e dados.
+
+_MAGICO = b"CALCMAT1"
+_VERSAO_FORMATO = 1
+_CABECALHO_ARQUIVO = struct.Struct("<8sII")
+_CABECALHO_REGISTRO = struct.Struct("<BBHIQQQQQ")
+_FLAG_RESULTADO = 1
+
+_TIPOS_BINARIOS = {
+    1: MatrizGeral,
+    2: MatrizDiagonal,
+    3: MatrizTriangularInferior,
+    4: MatrizTriangularSuperior,
+    5: MatrizEsparsa,
+    6: MatrizBanda,
+    7: MatrizSimetrica,
+}
+_CODIGOS_BINARIOS = {classe: codigo for codigo, classe in _TIPOS_BINARIOS.items()}
+
+def _registro_binario(m):
+    # (código do tipo, parâmetro 1, parâmetro 2, buffers na ordem do arquivo)
+    if isinstance(m, Expressao):
+        m = m.avaliar()
+    m = m.materializar()
+    if type(m) not in _CODIGOS_BINARIOS:
+        m = _para_geral(m)
+    codigo = _CODIGOS_BINARIOS[type(m)]
+    if isinstance(m, MatrizEsparsa):
+        return codigo, m.nao_nulos(), 0, (m.ponteiros, m.indices, m.valores)
+    if isinstance(m, MatrizBanda):
+        return codigo, m.inferior, m.superior, (m.dados,)
+    return codigo, 0, 0, (_buffer(m),)
+
+def _escrever_registro(arquivo, m, flags=0):
+    codigo, parametro1, parametro2, buffers = _registro_binario(m)
+    nome = m.nome.encode("utf-8")
+    tamanho = sum(_nbytes(buffer) for buffer in buffers)
+    arquivo.write(_CABECALHO_REGISTRO.pack(codigo, flags, len(nome), 0, m.linhas, m.colunas, parametro1, parametro2, tamanho))
+    arquivo.write(nome + bytes(-len(nome) % 8))
+    for buffer in buffers:
+        if sys.byteorder != "little":
+            buffer = array(buffer.typecode if isinstance(buffer, array) else buffer.format, buffer)
+            buffer.byteswap()
+        arquivo.write(buffer)
+
+def salvar_binario(matrizes, caminho: str, flags=None):
+    # matrizes: uma Matriz ou uma sequência delas; flags opcionais por matriz (ver sessões)
+    if isinstance(matrizes, Matriz):
+        matrizes = [matrizes]
+    flags = flags or [0] * len(matrizes)
+    # O arquivo antigo pode estar mapeado por carregar_binario: grava num temporário e troca.
+    descritor, temporario = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(caminho)))
+    try:
+        with os.fdopen(descritor, "wb") as arquivo:
+            arquivo.write(_CABECALHO_ARQUIVO.pack(_MAGICO, _VERSAO_FORMATO, len(matrizes)))
+            for m, f in zip(matrizes, flags):
+                _escrever_registro(arquivo, m, f)
+        if os.path.exists(caminho):
+            os.chmod(temporario, os.stat(caminho).st_mode & 0o777)
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.remove(temporario)
+        raise
+
+def eh_arquivo_binario(caminho: str) -> bool:
+    with open(caminho, "rb") as arquivo:
+        return arquivo.read(len(_MAGICO)) == _MAGICO
+
+def _ler_registros(caminho, mapear):
+    with open(caminho, "rb") as arquivo:
+        if mapear:
+            conteudo = memoryview(mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_COPY))
+        else:
+            conteudo = memoryview(bytearray(arquivo.read()))
+    if len(conteudo) < _CABECALHO_ARQUIVO.size:
+        raise ValueError(f"{caminho} não é um arquivo de matrizes")
+    magico, versao, quantidade = _CABECALHO_ARQUIVO.unpack_from(conteudo)
+    if magico != _MAGICO:
+        raise ValueError(f"{caminho} não é um arquivo de matrizes")
+    if versao != _VERSAO_FORMATO:
+        raise ValueError(f"Versão {versao} do formato não suportada")
+    posicao = _CABECALHO_ARQUIVO.size
+
+    def fatia(formato, quantidade_itens):
+        nonlocal posicao
+        fim = posicao + 8 * quantidade_itens
+        if fim > len(conteudo):
+            raise ValueError(f"{caminho} truncado")
+        buffer = conteudo[posicao:fim].cast(formato)
+        posicao = fim
+        if sys.byteorder != "little":
+            buffer = array(formato, buffer)
+            buffer.byteswap()
+        return buffer
+
+    for _ in range(quantidade):
+        codigo, flags, tamanho_nome, _, linhas, colunas, parametro1, parametro2, tamanho = \
+            _CABECALHO_REGISTRO.unpack_from(conteudo, posicao)
+        posicao += _CABECALHO_REGISTRO.size
+        nome = bytes(conteudo[posicao:posicao + tamanho_nome]).decode("utf-8")
+        posicao += tamanho_nome + (-tamanho_nome % 8)
+        classe = _TIPOS_BINARIOS.get(codigo)
+        if classe is None:
+            raise ValueError(f"Tipo de matriz desconhecido no arquivo: {codigo}")
+        inicio = posicao
+        if classe is MatrizEsparsa:
+            ponteiros = fatia("q", linhas + 1)
+            indices = fatia("q", parametro1)
+            m = MatrizEsparsa(linhas, colunas, ponteiros, indices, fatia("d", parametro1), nome)
+        elif classe is MatrizGeral:
+            m = MatrizGeral(linhas, colunas, fatia("d", linhas * colunas), nome)
+        elif classe is MatrizDiagonal:
+            m = MatrizDiagonal(linhas, fatia("d", linhas), nome)
+        elif classe is MatrizBanda:
+            m = MatrizBanda(linhas, parametro1, parametro2, fatia("d", (parametro1 + parametro2 + 1) * linhas), nome)
+        else:
+            m = classe(linhas, fatia("d", linhas * (linhas + 1) // 2), nome)
+        if posicao - inicio != tamanho:
+            raise ValueError(f"Registro {nome!r} com tamanho inconsistente")
+        yield m, flags
+
+def carregar_binario(caminho: str, mapear: bool = True) -> List[Matriz]:
+    return [m for m, _ in _ler_registros(caminho, mapear)]
+
+class CacheOperacoes:
+    def __init__(self, capacidade: int = 128, limite_bytes: int = None):
+        self.capacidade = capacidade
+        self.limite_bytes = limite_bytes
+        self.bytes = 0
+        self._entradas = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+
+    def calcular(self, operacao: str, operandos, funcao, escalar=None):
+        matrizes = [m for m in operandos if isinstance(m, Matriz)]
+        chave = (operacao, tuple(_chave_operando(m) for m in operandos), escalar)
+        entrada = self._entradas.get(chave)
+        if entrada is not None and all(ref() is m for ref, m in zip(entrada[1], matrizes)):
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return _copia_resultado(entrada[0])
+        self.falhas += 1
+        resultado = funcao()
+        if self.capacidade > 0 and not _referencia_operandos(resultado, matrizes):
+            self._remover(chave)
+            descartar = lambda _, chave=chave: self._remover(chave, so_mortas=True)
+            tamanho = _tamanho_resultado(resultado)
+            self._entradas[chave] = (_copia_resultado(resultado), [weakref.ref(m, descartar) for m in matrizes], tamanho)
+            self.bytes += tamanho
+            self.liberar()
+        return resultado
+
+    def _remover(self, chave, so_mortas=False):
+        # A chave pode já ter sido reaproveitada por outro operando que herdou o id.
+        entrada = self._entradas.get(chave)
+        if entrada is None or so_mortas and all(ref() is not None for ref in entrada[1]):
+            return
+        del self._entradas[chave]
+        self.bytes -= entrada[2]
+
+    def liberar(self, bytes_necessarios: int = 0):
+        limite = self.bytes - bytes_necessarios
+        if self.limite_bytes is not None:
+            limite = min(limite, self.limite_bytes)
+        while self._entradas and (len(self._entradas) > self.capacidade or self.bytes > limite):
+            _, entrada = self._entradas.popitem(last=False)
+            self.bytes -= entrada[2]
+
+    def limpar(self):
+        self._entradas.clear()
+        self.bytes = 0
+
+    def estatisticas(self):
+        return {"acertos": self.acertos, "falhas": self.falhas, "entradas": len(self._entradas),
+                "capacidade": self.capacidade, "bytes": self.bytes}
+
+    def __len__(self):
+        return len(self._entradas)
+
+def _tamanho_resultado(resultado):
+    if isinstance(resultado, (Matriz, Vetor)):
+        return resultado.tamanho_bytes()
+    if isinstance(resultado, list):
+        return 8 * len(resultado)
+    return 0
+
+def _chave_operando(m):
+    # Vetores e sequências de números não têm versão nem aceitam referência fraca: valem pelo valor
+    if isinstance(m, Matriz):
+        return (id(m), m.versao_dados())
+    return (type(m).__name__, bytes(array("d", m.dados if isinstance(m, Vetor) else m)))
+
+def _referencia_operandos(resultado, operandos):
+    if not isinstance(resultado, Matriz):
+        return False
+    dono = _dono_armazenamento(resultado)
+    return any(dono is _dono_armazenamento(m) for m in operandos)
+
+_ATRIBUTOS_BUFFER = ("dados", "diagonal", "ponteiros", "indices", "valores")
+
+def _copia_resultado(resultado):
+    if isinstance(resultado, MatrizTransposta):
+        return MatrizTransposta(_copia_resultado(resultado.base), resultado.nome)
+    if isinstance(resultado, Matriz):
+        copia = copy.copy(resultado)
+        for atributo in _ATRIBUTOS_BUFFER:
+            buffer = getattr(copia, atributo, None)
+            if buffer is not None:
+                setattr(copia, atributo, array(buffer.typecode if isinstance(buffer, array) else buffer.format, buffer))
+        copia._dono = None
+        copia._versao = 0
+        if isinstance(copia, MatrizGeral):
+            copia._lu = None
+        return copia
+    if isinstance(resultado, Vetor):
+        return Vetor(len(resultado), array("d", resultado.dados))
+    if isinstance(resultado, list):
+        return list(resultado)
+    return resultado
+
+# Operações de CalculadoraMatricial.calcular: (a, b, escalar) -> resultado
+_OPERACOES_CALCULADORA = {
+    "soma": lambda a, b, escalar: a + b,
+    "subtracao": lambda a, b, escalar: a - b,
+    "escalar": lambda a, b, escalar: a * escalar,
+    "produto": lambda a, b, escalar: a * b,
+    "transposta": lambda a, b, escalar: a.transposta(),
+    "traco": lambda a, b, escalar: a.traço(),
+    "determinante": lambda a, b, escalar: a.determinante(),
+    "inversa": lambda a, b, escalar: a.inversa(),
+    "resolver": lambda a, b, escalar: a.resolver(b),
+    "potencia": lambda a, b, escalar: a ** escalar,
+    "polinomio": lambda a, b, escalar: avaliar_polinomio(a, escalar),
+}
+
+class _MatrizDespejada:
+    # Marcador de um resultado despejado para disco: guarda só o caminho e a descrição
+    __slots__ = ("caminho", "nome", "linhas", "colunas", "tipo_original")
+
+    def __init__(self, caminho: str, matriz: Matriz):
+        self.caminho = caminho
+        self.nome = matriz.nome
+        self.linhas = matriz.linhas
+        self.colunas = matriz.colunas
+        self.tipo_original = matriz.tipo()
+
+    def tipo(self):
+        return self.tipo_original
+
+class CalculadoraMatricial:
+    def __init__(self, limite_memoria: int = None, pasta_despejo: str = None, capacidade_cache: int = 128):
+        self._matrizes = {}
+        self._bytes = {}
+        self._resultados = OrderedDict()
+        self._contador = 0
+        self.bytes_em_memoria = 0
+        self.limite_memoria = limite_memoria
+        self.pasta_despejo = pasta_despejo
+        self.cache = CacheOperacoes(capacidade_cache)
+
+    @property
+    def lista_matrizes(self):
+        # Compatibilidade com o acesso por posição; recarrega as matrizes despejadas
+        return [self.obter_matriz(nome) for nome in list(self._matrizes)]
+
+    def _novo_nome(self, nome):
+        if not nome:
+            self._contador += 1
+            nome = f"M{self._contador}"
+        base, k = nome, 2
+        while nome in self._matrizes:
+            nome = f"{base}_{k}"
+            k += 1
+        return nome
+
+    def _chave(self, chave):
+        # Aceita o nome ou, por compatibilidade, a posição na ordem de inserção (O(n))
+        if chave in self._matrizes:
+            return chave
+        if isinstance(chave, str) and chave.strip().isdigit():
+            chave = int(chave)
+        if isinstance(chave, int) and 0 <= chave < len(self._matrizes):
+            return list(self._matrizes)[chave]
+        raise KeyError(f"Matriz não encontrada: {chave}")
+
+    def inserir_matriz(self, matriz: Matriz, resultado: bool = False) -> str:
+        nome = self._novo_nome(matriz.nome)
+        matriz.nome = nome
+        self._matrizes[nome] = matriz
+        self._bytes[nome] = matriz.tamanho_bytes()
+        self.bytes_em_memoria += self._bytes[nome]
+        if resultado:
+            self._resultados[nome] = None
+        self._aplicar_limite(manter=nome)
+        return nome
+
+    def obter_matriz(self, chave) -> Matriz:
+        nome = self._chave(chave)
+        matriz = self._matrizes[nome]
+        if isinstance(matriz, _MatrizDespejada):
+            matriz = self._recarregar(nome, matriz)
+        elif nome in self._resultados:
+            self._resultados.move_to_end(nome)
+        return matriz
+
+    def remover_matriz(self, chave):
+        try:
+            nome = self._chave(chave)
+        except KeyError:
+            print("Matriz não encontrada")
+            return
+        matriz = self._matrizes.pop(nome)
+        self._resultados.pop(nome, None)
+        if isinstance(matriz, _MatrizDespejada):
+            os.remove(matriz.caminho)
+        else:
+            self.bytes_em_memoria -= self._bytes[nome]
+        del self._bytes[nome]
+
+    def definir_limite_memoria(self, limite_memoria: int = None, pasta_despejo: str = None):
+        self.limite_memoria = limite_memoria
+        if pasta_despejo is not None:
+            self.pasta_despejo = pasta_despejo
+        self._aplicar_limite()
+
+    def _aplicar_limite(self, manter=None):
+        if self.limite_memoria is None:
+            return
+        self.cache.liberar(self.bytes_em_memoria + self.cache.bytes - self.limite_memoria)
+        for nome in list(self._resultados):
+            if self.bytes_em_memoria + self.cache.bytes <= self.limite_memoria:
+                break
+            # Vistas (0 bytes) não liberariam nada: gravá-las só as materializaria no recarregamento
+            if nome != manter and self._bytes[nome]:
+                self._despejar(nome)
+
+    def _despejar(self, nome):
+        matriz = self._matrizes[nome]
+        del self._resultados[nome]
+        self.bytes_em_memoria -= self._bytes[nome]
+        if self.pasta_despejo is None:
+            del self._matrizes[nome]
+            del self._bytes[nome]
+            return
+        os.makedirs(self.pasta_despejo, exist_ok=True)
+        descritor, caminho = tempfile.mkstemp(suffix=".cmat", dir=self.pasta_despejo)
+        os.close(descritor)
+        salvar_binario(matriz, caminho)
+        self._matrizes[nome] = _MatrizDespejada(caminho, matriz)
+
+    def _recarregar(self, nome, despejada):
+        matriz = carregar_binario(despejada.caminho, mapear=False)[0]
+        os.remove(despejada.caminho)
+        self._matrizes[nome] = matriz
+        self._bytes[nome] = matriz.tamanho_bytes()
+        self.bytes_em_memoria += self._bytes[nome]
+        self._resultados[nome] = None
+        self._aplicar_limite(manter=nome)
+        return matriz
+
+    def salvar_sessao(self, caminho: str):
+        # Todas as matrizes registradas em um único arquivo binário, na ordem de inserção
+        matrizes, flags = [], []
+        for nome, m in self._matrizes.items():
+            despejada = isinstance(m, _MatrizDespejada)
+            if despejada:
+                m = carregar_binario(m.caminho)[0]
+            matrizes.append(m)
+            flags.append(_FLAG_RESULTADO if despejada or nome in self._resultados else 0)
+        salvar_binario(matrizes, caminho, flags)
+
+    def carregar_sessao(self, caminho: str):
+        # Substitui o conteúdo atual; os dados ficam mapeados do arquivo (ver carregar_binario)
+        registros = list(_ler_registros(caminho, mapear=True))
+        self.zerar_lista()
+        for m, flags in registros:
+            self.inserir_matriz(m, resultado=bool(flags & _FLAG_RESULTADO))
+
+    def calcular(self, operacao: str, a: Matriz, b: Matriz = None, escalar: float = None):
+        if operacao not in _OPERACOES_CALCULADORA:
+            raise ValueError(f"Operação desconhecida: {operacao}")
+        funcao = _OPERACOES_CALCULADORA[operacao]
+        operandos = (a,) if b is None else (a, b)
+        resultado = self.cache.calcular(operacao, operandos, lambda: funcao(a, b, escalar), escalar)
+        self._aplicar_limite()
+        return resultado
+
+    def imprimir_matriz(self, chave):
+        try:
+            self.obter_matriz(chave).imprimir()
+        except KeyError:
+            print("Matriz não encontrada")
+
+    def listar_matrizes(self):
+        print("Lista de Matrizes:")
+        for idx, (nome, m) in enumerate(self._matrizes.items()):
+            local = " [em disco]" if isinstance(m, _MatrizDespejada) else ""
+            print(f"{idx}: {nome} - {m.tipo()} {m.linhas}x{m.colunas} ({self._bytes[nome]} bytes){local}")
+        limite = "sem limite" if self.limite_memoria is None else f"limite {self.limite_memoria}"
+        print(f"Memória em uso: {self.bytes_em_memoria} bytes, mais {self.cache.bytes} no cache ({limite})")
+
+    def zerar_lista(self):
+        for m in self._matrizes.values():
+            if isinstance(m, _MatrizDespejada):
+                os.remove(m.caminho)
+        self._matrizes.clear()
+        self._bytes.clear()
+        self._resultados.clear()
+        self.bytes_em_memoria = 0
+
+    def inserir_identidade(self, n: int, nome: str = ""):
+        diag = [1.0]*n
+        identidade = MatrizDiagonal(n, diag, nome)
+        return self.inserir_matriz(identidade)
+
+    def executar_script(self, linhas, saida=None) -> int:
+        saida = saida or sys.stdout
+        quantidade, total = 0, 0.0
+        for numero, linha in enumerate(linhas, 1):
+            tokens = linha.split("#", 1)[0].split()
+            if not tokens:
+                continue
+            inicio = time.perf_counter()
+            try:
+                descricao = self._executar_comando(tokens, saida)
+            except KeyError as e:
+                raise ValueError(f"Linha {numero}: {e.args[0]}") from e
+            except Exception as e:
+                raise ValueError(f"Linha {numero}: {e}") from e
+            tempo = time.perf_counter() - inicio
+            quantidade += 1
+            total += tempo
+            print(f"[{numero}] {descricao} ({tempo * 1000:.3f} ms)", file=saida)
+        print(f"{quantidade} comandos em {total:.3f} s", file=saida)
+        return quantidade
+
+    def _executar_comando(self, tokens, saida):
+        # DESTINO = A + B | A - B | A * B | A * escalar | escalar * A | A ^ k
+        # DESTINO = transposta A | inversa A | resolver A B | soma/subtracao/produto A B | escalar A x
+        # DESTINO = polinomio A c0 c1 ... cd
+        # carregar NOME ARQUIVO | salvar NOME ARQUIVO | identidade NOME n
+        # salvar_sessao ARQUIVO | carregar_sessao ARQUIVO
+        # traco A | determinante A | imprimir A | remover A | listar
+        # instrumentacao ligar|desligar|zerar|mostrar | instrumentacao salvar ARQUIVO
+        if len(tokens) >= 3 and tokens[1] == "=":
+            destino = tokens[0]
+            resultado = self._avaliar_expressao(tokens[2:])
+            self._substituir(destino, resultado)
+            return f"{destino} = {' '.join(tokens[2:])}: {resultado.tipo()} {resultado.linhas}x{resultado.colunas}"
+        comando, argumentos = tokens[0].lower(), tokens[1:]
+        if comando == "carregar" and len(argumentos) == 2:
+            matriz = carregar_arquivo(argumentos[1], argumentos[0])
+            self._substituir(argumentos[0], matriz, resultado=False)
+            return f"carregar {argumentos[0]}: {matriz.tipo()} {matriz.linhas}x{matriz.colunas}"
+        if comando == "salvar" and len(argumentos) == 2:
+            salvar_arquivo(self.obter_matriz(argumentos[0]), argumentos[1])
+            return f"salvar {argumentos[0]} em {argumentos[1]}"
+        if comando == "salvar_sessao" and len(argumentos) == 1:
+            self.salvar_sessao(argumentos[0])
+            return f"salvar_sessao {argumentos[0]}: {len(self._matrizes)} matrizes"
+        if comando == "carregar_sessao" and len(argumentos) == 1:
+            self.carregar_sessao(argumentos[0])
+            return f"carregar_sessao {argumentos[0]}: {len(self._matrizes)} matrizes"
+        if comando == "identidade" and len(argumentos) == 2:
+            n = int(argumentos[1])
+            self._substituir(argumentos[0], MatrizDiagonal(n, [1.0] * n), resultado=False)
+            return f"identidade {argumentos[0]}: {n}x{n}"
+        if comando in ("traco", "determinante") and len(argumentos) == 1:
+            return f"{comando} {argumentos[0]} = {self.calcular(comando, self.obter_matriz(argumentos[0]))!r}"
+        if comando == "imprimir" and len(argumentos) == 1:
+            with redirect_stdout(saida):
+                self.obter_matriz(argumentos[0]).imprimir()
+            return f"imprimir {argumentos[0]}"
+        if comando == "remover" and len(argumentos) == 1:
+            self.obter_matriz(argumentos[0])
+            self.remover_matriz(argumentos[0])
+            return f"remover {argumentos[0]}"
+        if comando == "listar" and not argumentos:
+            with redirect_stdout(saida):
+                self.listar_matrizes()
+            return "listar"
+        if comando == "instrumentacao" and argumentos:
+            return self._comando_instrumentacao(argumentos, saida)
+        raise ValueError(f"Comando inválido: {' '.join(tokens)}")
+
+    def _comando_instrumentacao(self, argumentos, saida):
+        acao = argumentos[0].lower()
+        if acao == "ligar" and len(argumentos) == 1:
+            ativar_instrumentacao()
+        elif acao == "desligar" and len(argumentos) == 1:
+            desativar_instrumentacao()
+        elif acao == "zerar" and len(argumentos) == 1:
+            zerar_instrumentacao()
+        elif acao == "mostrar" and len(argumentos) == 1:
+            print(_coletor.relatorio(), file=saida)
+        elif acao == "salvar" and len(argumentos) == 2:
+            _coletor.salvar(argumentos[1])
+        else:
+            raise ValueError(f"Comando inválido: instrumentacao {' '.join(argumentos)}")
+        return f"instrumentacao {' '.join(argumentos)}"
+
+    def _avaliar_expressao(self, tokens):
+        if len(tokens) == 3 and tokens[1] == "^":
+            return self.calcular("potencia", self.obter_matriz(tokens[0]), escalar=int(tokens[2]))
+        if len(tokens) == 3 and tokens[1] in ("+", "-", "*"):
+            a, b = self._operando(tokens[0]), self._operando(tokens[2])
+            if tokens[1] == "*" and isinstance(b, float):
+                return self.calcular("escalar", a, escalar=b)
+            if tokens[1] == "*" and isinstance(a, float):
+                return self.calcular("escalar", b, escalar=a)
+            return self.calcular({"+": "soma", "-": "subtracao", "*": "produto"}[tokens[1]], a, b)
+        operacao = tokens[0].lower()
+        if operacao in ("transposta", "inversa") and len(tokens) == 2:
+            return self.calcular(operacao, self.obter_matriz(tokens[1]))
+        if operacao in ("resolver", "soma", "subtracao", "produto") and len(tokens) == 3:
+            return self.calcular(operacao, self.obter_matriz(tokens[1]), self.obter_matriz(tokens[2]))
+        if operacao == "escalar" and len(tokens) == 3:
+            return self.calcular(operacao, self.obter_matriz(tokens[1]), escalar=float(tokens[2]))
+        if operacao == "polinomio" and len(tokens) >= 3:
+            coeficientes = tuple(float(c) for c in tokens[2:])
+            return self.calcular(operacao, self.obter_matriz(tokens[1]), escalar=coeficientes)
+        raise ValueError(f"Expressão inválida: {' '.join(tokens)}")
+
+    def _operando(self, token):
+        try:
+            return float(token)
+        except ValueError:
+            return self.obter_matriz(token)
+
+    def _substituir(self, nome, matriz, resultado=True):
+        # No script, atribuir a um nome existente substitui a matriz anterior
+        if nome in self._matrizes:
+            self.remover_matriz(nome)
+        matriz.nome = nome
+        self.inserir_matriz(matriz, resultado)
+
+    def ler_matriz_teclado(self):
+        try:
+            tipo = input("Tipo (Geral, Diagonal, TriangularInferior, TriangularSuperior, Esparsa, Banda, Simetrica): ").strip()
+            nome = input("Nome da matriz: ").strip()
+            if tipo.lower() == "geral":
+                m = int(input("Número de linhas: "))
+                n = int(input("Número de colunas: "))
+                dados = []
+                print(f"Digite os elementos da matriz {m}x{n} linha por linha:")
+                for _ in range(m):
+                    linha = list(map(float, input().split()))
+                    if len(linha) != n:
+                        raise ValueError("Número de elementos inválido na linha")
+                    dados.append(linha)
+                matriz = MatrizGeral(m, n, dados, nome)
+            elif tipo.lower() == "diagonal":
+                n = int(input("Ordem da matriz diagonal (n x n): "))
+                diag = list(map(float, input(f"Digite os {n} elementos da diagonal principal: ").split()))
+                if len(diag) != n:
+                    raise ValueError("Número de elementos da diagonal inválido")
+                matriz = MatrizDiagonal(n, diag, nome)
+            elif tipo.lower() == "triangularinferior":
+                n = int(input("Ordem da matriz triangular inferior (n x n): "))
+                dados = []
+                print(f"Digite os elementos da matriz triangular inferior linha por linha (apenas elementos da parte inferior):")
+                for i in range(n):
+                    linha = list(map(float, input(f"Linha {i+1} (tamanho {i+1}): ").split()))
+                    if len(linha) != i+1:
+                        raise ValueError("Número de elementos inválido na linha")
+                    dados.append(linha)
+                matriz = MatrizTriangularInferior(n, dados, nome)
+            elif tipo.lower() == "triangularsuperior":
+                n = int(input("Ordem da matriz triangular superior (n x n): "))
+                dados = []
+                print(f"Digite os elementos da matriz triangular superior linha por linha (apenas elementos da parte superior):")
+                for i in range(n):
+                    linha = list(map(float, input(f"Linha {i+1} (tamanho {n - i}): ").split()))
+                    if len(linha) != n - i:
+                        raise ValueError("Número de elementos inválido na linha")
+                    dados.append(linha)
+                matriz = MatrizTriangularSuperior(n, dados, nome)
+            elif tipo.lower() == "esparsa":
+                m = int(input("Número de linhas: "))
+                n = int(input("Número de colunas: "))
+                quantidade = int(input("Quantidade de elementos não nulos: "))
+                linhas_idx, colunas_idx, valores = [], [], []
+                print("Digite cada elemento não nulo como: linha coluna valor (índices a partir de 0)")
+                for _ in range(quantidade):
+                    i, j, v = input().split()
+                    linhas_idx.append(int(i))
+                    colunas_idx.append(int(j))
+                    valores.append(float(v))
+                matriz = MatrizEsparsa.de_coo(m, n, linhas_idx, colunas_idx, valores, nome)
+            elif tipo.lower() == "banda":
+                n = int(input("Ordem da matriz de banda (n x n): "))
+                inferior = int(input("Largura de banda inferior: "))
+                superior = int(input("Largura de banda superior: "))
+                dados = []
+                print("Digite cada diagonal, da mais baixa para a mais alta:")
+                for k in range(-inferior, superior + 1):
+                    diagonal = list(map(float, input(f"Diagonal {k} (tamanho {n - abs(k)}): ").split()))
+                    if len(diagonal) != n - abs(k):
+                        raise ValueError("Número de elementos inválido na diagonal")
+                    dados.append(diagonal)
+                matriz = MatrizBanda(n, inferior, superior, dados, nome)
+            elif tipo.lower() == "simetrica":
+                n = int(input("Ordem da matriz simétrica (n x n): "))
+                dados = []
+                print("Digite a parte superior da matriz simétrica linha por linha (da diagonal em diante):")
+                for i in range(n):
+                    linha = list(map(float, input(f"Linha {i+1} (tamanho {n - i}): ").split()))
+                    if len(linha) != n - i:
+                        raise ValueError("Número de elementos inválido na linha")
+                    dados.append(linha)
+                matriz = MatrizSimetrica(n, dados, nome)
+            else:
+                print("Tipo inválido")
+                return
+            nome = self.inserir_matriz(matriz)
+            print(f"Matriz inserida com sucesso como {nome}!")
+        except Exception as e:
+            print(f"Erro na leitura da matriz: {e}")
+
+    def menu(self):
+        while True:
+            print("\n--- Calculadora Matricial ---")
+            print("1. Listar matrizes")
+            print("2. Imprimir matriz")
+            print("3. Inserir matriz do teclado")
+            print("4. Inserir matriz identidade")
+            print("5. Remover matriz")
+            print("6. Zerar lista")
+            print("7. Operações (Soma, Subtração, Multiplicação, Transposição, Traço, Determinante, Inversa, Sistemas)")
+            print("8. Limite de memória para resultados")
+            print("9. Cache de operações")
+            print("10. Salvar sessão")
+            print("11. Carregar sessão")
+            print("12. Instrumentação")
+            print("0. Sair")
+            opc = input("Escolha uma opção: ")
+            if opc == "1":
+                self.listar_matrizes()
+            elif opc == "2":
+                self.imprimir_matriz(input("Nome da matriz para imprimir: ").strip())
+            elif opc == "3":
+                self.ler_matriz_teclado()
+            elif opc == "4":
+                try:
+                    n = int(input("Ordem da matriz identidade: "))
+                    nome = input("Nome da matriz identidade: ")
+                    nome = self.inserir_identidade(n, nome)
+                    print(f"Matriz identidade inserida como {nome}.")
+                except:
+                    print("Entrada inválida.")
+            elif opc == "5":
+                self.remover_matriz(input("Nome da matriz para remover: ").strip())
+            elif opc == "6":
+                self.zerar_lista()
+                print("Lista zerada.")
+            elif opc == "7":
+                self.menu_operacoes()
+            elif opc == "8":
+                try:
+                    limite = input("Limite em bytes (vazio = sem limite): ").strip()
+                    pasta = input("Pasta para despejar resultados (vazio = descartar): ").strip()
+                    self.definir_limite_memoria(int(limite) if limite else None, pasta or None)
+                    print("Limite de memória atualizado.")
+                except ValueError:
+                    print("Entrada inválida.")
+            elif opc == "9":
+                e = self.cache.estatisticas()
+                print(f"Cache: {e['acertos']} acertos, {e['falhas']} falhas, {e['entradas']}/{e['capacidade']} entradas, {e['bytes']} bytes")
+                if input("Limpar o cache? (s/n): ").strip().lower() == "s":
+                    self.cache.limpar()
+            elif opc == "10":
+                try:
+                    self.salvar_sessao(input("Arquivo da sessão: ").strip())
+                    print("Sessão salva.")
+                except (OSError, ValueError) as e:
+                    print(f"Erro ao salvar a sessão: {e}")
+            elif opc == "11":
+                try:
+                    self.carregar_sessao(input("Arquivo da sessão: ").strip())
+                    print("Sessão carregada.")
+                except (OSError, ValueError) as e:
+                    print(f"Erro ao carregar a sessão: {e}")
+            elif opc == "12":
+                self.menu_instrumentacao()
+            elif opc == "0":
+                print("Saindo...")
+                break
+            else:
+                print("Opção inválida.")
+
+    def menu_instrumentacao(self):
+        print(f"\nInstrumentação {'ativa' if instrumentacao_ativa() else 'desativada'}")
+        print("1. Ativar" if not instrumentacao_ativa() else "1. Desativar")
+        print("2. Mostrar estatísticas")
+        print("3. Zerar estatísticas")
+        print("4. Salvar estatísticas em JSON")
+        opc = input("Escolha uma opção: ")
+        if opc == "1":
+            if instrumentacao_ativa():
+                desativar_instrumentacao()
+            else:
+                ativar_instrumentacao()
+        elif opc == "2":
+            print(_coletor.relatorio())
+        elif opc == "3":
+            zerar_instrumentacao()
+        elif opc == "4":
+            try:
+                _coletor.salvar(input("Arquivo: ").strip())
+                print("Estatísticas salvas.")
+            except OSError as e:
+                print(f"Erro ao salvar: {e}")
+        else:
+            print("Opção inválida.")
+
+    def menu_operacoes(self):
+        print("\n--- Operações ---")
+        print("1. Soma (C = A + B)")
+        print("2. Subtração (C = A - B)")
+        print("3. Multiplicação por escalar (C = a * A)")
+        print("4. Multiplicação matricial (C = A * B)")
+        print("5. Transposição")
+        print("6. Traço (matriz quadrada)")
+        print("7. Determinante")
+        print("8. Inversa")
+        print("9. Resolver sistema (A X = B)")
+        print("10. Potência (C = A^k)")
+        print("11. Polinômio (C = c0 I + c1 A + ... + cd A^d)")
+        print("0. Voltar")
+        opc = input("Escolha uma operação: ")
+        try:
+            if opc == "1":
+                a = input("Matriz A (nome): ").strip()
+                b = input("Matriz B (nome): ").strip()
+                C = self.calcular("soma", self.obter_matriz(a), self.obter_matriz(b))
+                nome = input("Nome para matriz resultado: ")
+                C.nome = nome
+                nome = self.inserir_matriz(C, resultado=True)
+                print(f"Soma realizada e matriz inserida como {nome}.")
+            elif opc == "2":
+                a = input("Matriz A (nome): ").strip()
+                b = input("Matriz B (nome): ").strip()
+                C = self.calcular("subtracao", self.obter_matriz(a), self.obter_matriz(b))
+                nome = input("Nome para matriz resultado: ")
+                C.nome = nome
+                nome = self.inserir_matriz(C, resultado=True)
+                print(f"Subtração realizada e matriz inserida como {nome}.")
+            elif opc == "3":
+                a = input("Matriz A (nome): ").strip()
+                escalar = float(input("Valor escalar: "))
+                C = self.calcular("escalar", self.obter_matriz(a), escalar=escalar)
+                nome = input("Nome para matriz resultado: ")
+                C.nome = nome
+                nome = self.inserir_matriz(C, resultado=True)
+                print(f"Multiplicação por escalar realizada e matriz inserida como {nome}.")
+            elif opc == "4":
+                a = input("Matriz A (nome): ").strip()
+                b = input("Matriz B (nome): ").strip()
+                C = self.calcular("produto", self.obter_matriz(a), self.obter_matriz(b))
+                nome = input("Nome para matriz resultado: ")
+                C.nome = nome
+                nome = self.inserir_matriz(C, resultado=True)
+                print(f"Multiplicação matricial realizada e matriz inserida como {nome}.")
+            elif opc == "5":
+                a = input("Matriz A (nome): ").strip()
+                C = self.calcular("transposta", self.obter_matriz(a))
+                nome = input("Nome para matriz resultado: ")
+                C.nome = nome
+                nome = self.inserir_matriz(C, resultado=True)
+                print(f"Transposição realizada e matriz inserida como {nome}.")
+            elif opc == "6":
+                a = input("Matriz A (nome): ").strip()
+                matriz = self.obter_matriz(a)
+                if matriz.eh_quadrada():
+                    print(f"Traço da matriz: {self.calcular('traco', matriz)}")
+                else:
+                    print("Matriz não é quadrada.")
+            elif opc == "7":
+                a = input("Matriz A (nome): ").strip()
+                matriz = self.obter_matriz(a)
+                try:
+                    det = self.calcular("determinante", matriz)
+                    print(f"Determinante da matriz: {det}")
+                except NotImplementedError:
+                    print("Determinante não implementado para este tipo de matriz.")
+            elif opc == "8":
+                a = input("Matriz A (nome): ").strip()
+                C = self.calcular("inversa", self.obter_matriz(a))
+                nome = input("Nome para matriz resultado: ")
+                C.nome = nome
+                nome = self.inserir_matriz(C, resultado=True)
+                print(f"Inversa calculada e matriz inserida como {nome}.")
+            elif opc == "9":
+                a = input("Matriz A (nome): ").strip()
+                b = input("Matriz B (nome): ").strip()
+                C = self.calcular("resolver", self.obter_matriz(a), self.obter_matriz(b))
+                nome = input("Nome para matriz resultado: ")
+                C.nome = nome
+                nome = self.inserir_matriz(C, resultado=True)
+                print(f"Sistema resolvido e matriz solução inserida como {nome}.")
+            elif opc == "10":
+                a = input("Matriz A (nome): ").strip()
+                k = int(input("Expoente inteiro k: "))
+                C = self.calcular("potencia", self.obter_matriz(a), escalar=k)
+                nome = input("Nome para matriz resultado: ")
+                C.nome = nome
+                nome = self.inserir_matriz(C, resultado=True)
+                print(f"Potência calculada e matriz inserida como {nome}.")
+            elif opc == "11":
+                a = input("Matriz A (nome): ").strip()
+                coeficientes = tuple(float(c) for c in input("Coeficientes c0 c1 ... cd: ").split())
+                C = self.calcular("polinomio", self.obter_matriz(a), escalar=coeficientes)
+                nome = input("Nome para matriz resultado: ")
+                C.nome = nome
+                nome = self.inserir_matriz(C, resultado=True)
+                print(f"Polinômio avaliado e matriz inserida como {nome}.")
+            elif opc == "0":
+                return
+            else:
+                print("Opção inválida.")
+        except Exception as e:
+            print(f"Erro na operação: {e}")
+
+# Formatos de texto (CSV e Matrix Market).
+
+# Abaixo dessa fração de não nulos a matriz lida é guardada como MatrizEsparsa
+_DENSIDADE_ESPARSA = 0.1
+
+def _estruturar(dados, linhas, colunas, inferior, superior, nome):
+    # Cada linha empacotada só se move para trás, então a compactação no lugar é segura.
+    if linhas == colunas and linhas > 0:
+        n = linhas
+        if inferior and superior:
+            for i in range(n):
+                dados[i] = dados[i * n + i]
+            del dados[n:]
+            return MatrizDiagonal(n, dados, nome)
+        if inferior:
+            for i in range(1, n):
+                inicio = i * (i + 1) // 2
+                dados[inicio:inicio + i + 1] = dados[i * n:i * n + i + 1]
+            del dados[n * (n + 1) // 2:]
+            return MatrizTriangularInferior(n, dados, nome)
+        if superior:
+            for i in range(1, n):
+                inicio = i * n - i * (i - 1) // 2
+                dados[inicio:inicio + n - i] = dados[i * n + i:(i + 1) * n]
+            del dados[n * (n + 1) // 2:]
+            return MatrizTriangularSuperior(n, dados, nome)
+    if len(dados) - dados.count(0.0) <= _DENSIDADE_ESPARSA * linhas * colunas and linhas * colunas > 0:
+        return MatrizEsparsa.de_matriz(MatrizGeral(linhas, colunas, dados), nome)
+    return MatrizGeral(linhas, colunas, dados, nome)
+
+def _linha_csv(dados, modo, i, n):
+    # Linha i inteira a partir do buffer no layout de modo
+    if modo == "geral":
+        return dados[i * n:(i + 1) * n]
+    linha = array("d", bytes(8 * n))
+    if modo == "diagonal":
+        linha[i] = dados[i]
+    elif modo == "inferior":
+        inicio = i * (i + 1) // 2
+        linha[:i + 1] = dados[inicio:inicio + i + 1]
+    else:
+        inicio = i * n - i * (i - 1) // 2
+        linha[i:] = dados[inicio:inicio + n - i]
+    return linha
+
+def _empacotar_linha_csv(linha, modo, i):
+    if modo == "diagonal":
+        return linha[i:i + 1]
+    if modo == "inferior":
+        return linha[:i + 1]
+    if modo == "superior":
+        return linha[i:]
+    return linha
+
+def _mudar_modo_csv(dados, modo, novo, linhas, colunas):
+    resultado = array("d")
+    for i in range(linhas):
+        resultado.extend(_empacotar_linha_csv(_linha_csv(dados, modo, i, colunas), novo, i))
+    return resultado
+
+def ler_csv(caminho: str, nome: str = "", separador: str = ",", detectar: bool = True) -> Matriz:
+    dados = array("d")
+    linhas = colunas = 0
+    modo = "diagonal" if detectar else "geral"
+    with open(caminho) as arquivo:
+        for texto in arquivo:
+            if not texto.strip():
+                continue
+            linha = array("d", map(float, texto.split(separador)))
+            if linhas == 0:
+                colunas = len(linha)
+            elif len(linha) != colunas:
+                raise ValueError(f"Linha {linhas + 1} de {caminho} com {len(linha)} elementos, esperado {colunas}")
+            if modo != "geral":
+                acima, abaixo = any(linha[linhas + 1:]), any(linha[:linhas])
+                if linhas >= colunas or (acima and abaixo) or (acima and modo == "inferior") \
+                        or (abaixo and modo == "superior"):
+                    novo = "geral"
+                elif modo == "diagonal" and (acima or abaixo):
+                    novo = "superior" if acima else "inferior"
+                else:
+                    novo = modo
+                if novo != modo:
+                    dados = _mudar_modo_csv(dados, modo, novo, linhas, colunas)
+                    modo = novo
+            dados.extend(_empacotar_linha_csv(linha, modo, linhas))
+            linhas += 1
+    if modo != "geral" and (linhas != colunas or linhas == 0):
+        dados, modo = _mudar_modo_csv(dados, modo, "geral", linhas, colunas), "geral"
+    if modo == "diagonal":
+        return MatrizDiagonal(linhas, dados, nome)
+    if modo == "inferior":
+        return MatrizTriangularInferior(linhas, dados, nome)
+    if modo == "superior":
+        return MatrizTriangularSuperior(linhas, dados, nome)
+    if not detectar:
+        return MatrizGeral(linhas, colunas, dados, nome)
+    return _estruturar(dados, linhas, colunas, False, False, nome)
+
+def ler_matriz_texto(caminho: str, nome: str = "") -> Matriz:
+    # Números separados por espaços, uma linha da matriz por linha do arquivo
+    return ler_csv(caminho, nome, separador=None)
+
+def ler_matrix_market(caminho: str, nome: str = "", detectar: bool = True) -> Matriz:
+    with open(caminho) as arquivo:
+        cabecalho = arquivo.readline().split()
+        if len(cabecalho) != 5 or cabecalho[0] != "%%MatrixMarket" or cabecalho[1].lower() != "matrix":
+            raise ValueError(f"{caminho} não é um arquivo Matrix Market de matriz")
+        formato, campo, simetria = (t.lower() for t in cabecalho[2:])
+        if formato not in ("coordinate", "array") or campo not in ("real", "integer", "pattern") \
+                or simetria not in ("general", "symmetric", "skew-symmetric") \
+                or (formato == "array" and (campo == "pattern" or simetria == "skew-symmetric")):
+            raise ValueError(f"Variante Matrix Market não suportada: {' '.join(cabecalho[2:])}")
+        texto = arquivo.readline()
+        numero = 2
+        while texto.startswith("%") or (texto and not texto.strip()):
+            texto = arquivo.readline()
+            numero += 1
+        tamanhos = [int(t) for t in texto.split()]
+        if formato == "array":
+            if len(tamanhos) != 2:
+                raise ValueError(f"Linha de dimensões inválida em {caminho}")
+            return _ler_mm_array(arquivo, *tamanhos, simetria, nome, detectar)
+        if len(tamanhos) != 3:
+            raise ValueError(f"Linha de dimensões inválida em {caminho}")
+        return _ler_mm_coordenadas(enumerate(arquivo, numero + 1), *tamanhos, campo == "pattern", simetria, nome, detectar)
+
+def _ler_mm_coordenadas(numeradas, linhas, colunas, quantidade, padrao, simetria, nome, detectar):
+    # numeradas: pares (número da linha no arquivo, texto)
+    espelhar = simetria != "general"
+    sinal_espelho = -1.0 if simetria == "skew-symmetric" else 1.0
+    total = linhas * colunas
+    esparsa = detectar and total > 0 and quantidade * (2 if espelhar else 1) <= _DENSIDADE_ESPARSA * total
+    simetrica = simetria == "symmetric" and not esparsa
+    if esparsa:
+        linhas_idx, colunas_idx, valores = array("q"), array("q"), array("d")
+    elif simetrica:
+        destino = MatrizSimetrica(linhas, nome=nome)
+        dados = destino.dados
+    else:
+        dados = array("d", bytes(8 * total))
+    inferior = superior = True
+    lidos = 0
+    for numero, texto in numeradas:
+        partes = texto.split()
+        if not partes or partes[0].startswith("%"):
+            continue
+        i, j = int(partes[0]) - 1, int(partes[1]) - 1
+        if not (0 <= i < linhas and 0 <= j < colunas):
+            raise ValueError(f"Linha {numero}: índice ({i + 1}, {j + 1}) fora das dimensões {linhas}x{colunas}")
+        valor = 1.0 if padrao else float(partes[2])
+        lidos += 1
+        if i < j:
+            inferior = False
+        elif i > j:
+            superior = False
+        if esparsa:
+            linhas_idx.append(i)
+            colunas_idx.append(j)
+            valores.append(valor)
+            if espelhar and i != j:
+                linhas_idx.append(j)
+                colunas_idx.append(i)
+                valores.append(sinal_espelho * valor)
+        elif simetrica:
+            a, b = min(i, j), max(i, j)
+            dados[destino._inicio(a) + b - a] = valor
+        else:
+            dados[i * colunas + j] = valor
+            if espelhar and i != j:
+                dados[j * colunas + i] = sinal_espelho * valor
+    if lidos != quantidade:
+        raise ValueError(f"Esperados {quantidade} elementos, lidos {lidos}")
+    diagonal = inferior and superior and linhas == colunas
+    if detectar and diagonal:
+        resultado = MatrizDiagonal(linhas, nome=nome)
+        if esparsa:
+            for i, v in zip(linhas_idx, valores):
+                resultado.diagonal[i] += v
+        else:
+            for i in range(linhas):
+                resultado.diagonal[i] = destino.get_elemento(i, i) if simetrica else dados[i * colunas + i]
+        return resultado
+    if esparsa:
+        return MatrizEsparsa.de_coo(linhas, colunas, linhas_idx, colunas_idx, valores, nome)
+    if simetrica:
+        return destino
+    if not detectar:
+        return MatrizGeral(linhas, colunas, dados, nome)
+    if espelhar:
+        inferior = superior = False
+    return _estruturar(dados, linhas, colunas, inferior, superior, nome)
+
+def _ler_mm_array(arquivo, linhas, colunas, simetria, nome, detectar):
+    # Valores por colunas (column-major); em "symmetric", só o triângulo inferior
+    valores = (float(t) for texto in arquivo if not texto.startswith("%") for t in texto.split())
+    if simetria == "symmetric":
+        resultado = MatrizSimetrica(linhas, nome=nome)
+        try:
+            for j in range(colunas):
+                inicio = resultado._inicio(j)
+                for i in range(j, linhas):
+                    resultado.dados[inicio + i - j] = next(valores)
+        except StopIteration:
+            raise ValueError("Arquivo Matrix Market com menos valores que o declarado") from None
+        return resultado
+    dados = array("d", bytes(8 * linhas * colunas))
+    inferior = superior = True
+    lidos = 0
+    for k, v in enumerate(valores):
+        if k >= linhas * colunas:
+            raise ValueError("Arquivo Matrix Market com mais valores que o declarado")
+        i, j = k % linhas, k // linhas
+        dados[i * colunas + j] = v
+        if v != 0.0:
+            if i < j:
+                inferior = False
+            elif i > j:
+                superior = False
+        lidos += 1
+    if lidos != linhas * colunas:
+        raise ValueError("Arquivo Matrix Market com menos valores que o declarado")
+    if not detectar:
+        return MatrizGeral(linhas, colunas, dados, nome)
+    return _estruturar(dados, linhas, colunas, inferior, superior, nome)
+
+def _concreta(m):
+    if isinstance(m, Expressao):
+        m = m.avaliar()
+    return m.materializar()
+
+def _linha_completa(m, i):
+    # Linha i inteira (com os zeros estruturais) montada a partir do armazenamento de m
+    if isinstance(m, MatrizGeral):
+        return _linha_densa(m, i)
+    linha = array("d", bytes(8 * m.colunas))
+    if isinstance(m, MatrizDiagonal):
+        linha[i] = m.diagonal[i]
+    elif type(m) in (MatrizTriangularInferior, MatrizTriangularSuperior):
+        inicio, fim, coluna = m._linha(i)
+        linha[coluna:coluna + fim - inicio] = array("d", m.dados[inicio:fim])
+    elif isinstance(m, MatrizEsparsa):
+        for t in range(m.ponteiros[i], m.ponteiros[i + 1]):
+            linha[m.indices[t]] = m.valores[t]
+    else:
+        for j in range(m.colunas):
+            linha[j] = m.get_elemento(i, j)
+    return linha
+
+def escrever_csv(m: Matriz, caminho: str, separador: str = ",", bloco: int = 256):
+    # Valores com repr (sem perda de precisão), gravados a cada bloco de linhas
+    m = _concreta(m)
+    with open(caminho, "w") as arquivo:
+        partes = []
+        for i in range(m.linhas):
+            partes.append(separador.join(map(repr, _linha_completa(m, i))))
+            partes.append("\n")
+            if len(partes) >= 2 * bloco:
+                arquivo.write("".join(partes))
+                partes.clear()
+        arquivo.write("".join(partes))
+
+def escrever_matriz_texto(m: Matriz, caminho: str):
+    # Formato lido por ler_matriz_texto
+    escrever_csv(m, caminho, separador=" ")
+
+def escrever_matrix_market(m: Matriz, caminho: str, bloco: int = 4096):
+    # MatrizSimetrica sai como "symmetric", com o triângulo inferior.
+    m = _concreta(m)
+    simetrica = isinstance(m, MatrizSimetrica)
+
+    def entradas():
+        if simetrica:
+            for i in range(m.linhas):
+                inicio = m._inicio(i)
+                for j, v in enumerate(m.dados[inicio:inicio + m.colunas - i], i):
+                    if v != 0.0:
+                        yield j, i, v
+        else:
+            for i, j, v in _entradas(m):
+                if v != 0.0:
+                    yield i, j, v
+    quantidade = sum(1 for _ in entradas())
+    with open(caminho, "w") as arquivo:
+        arquivo.write(f"%%MatrixMarket matrix coordinate real {'symmetric' if simetrica else 'general'}\n")
+        if m.nome:
+            arquivo.write(f"% {m.nome}\n")
+        arquivo.write(f"{m.linhas} {m.colunas} {quantidade}\n")
+        partes = []
+        for i, j, v in entradas():
+            partes.append(f"{i + 1} {j + 1} {v!r}\n")
+            if len(partes) >= bloco:
+                arquivo.write("".join(partes))
+                partes.clear()
+        arquivo.write("".join(partes))
+
+def carregar_arquivo(caminho: str, nome: str = "") -> Matriz:
+    if eh_arquivo_binario(caminho):
+        matrizes = carregar_binario(caminho)
+        if not matrizes:
+            raise ValueError(f"{caminho} não contém matrizes")
+        if nome:
+            matrizes[0].nome = nome
+        return matrizes[0]
+    if caminho.endswith(".mtx"):
+        return ler_matrix_market(caminho, nome)
+    if caminho.endswith(".csv"):
+        return ler_csv(caminho, nome)
+    return ler_matriz_texto(caminho, nome)
+
+def salvar_arquivo(m: Matriz, caminho: str):
+    # Pela extensão: .cmat binário, .mtx Matrix Market, .csv CSV; as demais, texto
+    if caminho.endswith(".cmat"):
+        salvar_binario(m, caminho)
+    elif caminho.endswith(".mtx"):
+        escrever_matrix_market(m, caminho)
+    elif caminho.endswith(".csv"):
+        escrever_csv(m, caminho)
+    else:
+        escrever_matriz_texto(m, caminho)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Calculadora matricial: menu interativo ou execução de scripts de comandos")
+    parser.add_argument("script", nargs="?", help="arquivo de comandos ('-' para a entrada padrão); sem ele, abre o menu")
+    parser.add_argument("-m", "--matriz", action="append", default=[], metavar="NOME=ARQUIVO",
+                        help="carrega uma matriz antes de executar (pode ser repetido)")
+    parser.add_argument("-o", "--saida", help="arquivo para os resultados (padrão: saída padrão)")
+    parser.add_argument("--motor", choices=MOTORES, help="motor de cálculo")
+    parser.add_argument("-j", "--processos", type=int, metavar="N",
+                        help="processos para produtos, somas e transpostas grandes (motor python)")
+    parser.add_argument("--instrumentar", metavar="ARQUIVO",
+                        help="conta e cronometra as operações e grava as estatísticas em JSON ao sair ('-' = saída de erro)")
+    parser.add_argument("--compactar", type=float, nargs="?", const=0.0, metavar="TOL",
+                        help="converte resultados densos para a estrutura mais econômica (tolerância padrão 0)")
+    args = parser.parse_args(argv)
+    if args.compactar is not None:
+        definir_compactacao(args.compactar)
+    if args.instrumentar:
+        ativar_instrumentacao(args.instrumentar)
+    if args.motor:
+        definir_motor(args.motor)
+    if args.processos is not None:
+        definir_paralelismo(args.processos)
+    calc = CalculadoraMatricial()
+    try:
+        for definicao in args.matriz:
+            nome, separador, caminho = definicao.partition("=")
+            if not separador:
+                parser.error(f"--matriz espera NOME=ARQUIVO: {definicao}")
+            calc.inserir_matriz(carregar_arquivo(caminho, nome))
+        if args.script is None:
+            calc.menu()
+            return 0
+        entrada = sys.stdin if args.script == "-" else open(args.script)
+        saida = open(args.saida, "w") if args.saida else sys.stdout
+        try:
+            calc.executar_script(entrada, saida)
+        finally:
+            if entrada is not sys.stdin:
+                entrada.close()
+            if saida is not sys.stdout:
+                saida.close()
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import random
+
+import pytest
+
+from calculadorap import MOTORES, MatrizGeral, np, usar_motor
+
+@pytest.fixture(params=MOTORES)
+def motor(request):
+    if request.param == "numpy" and np is None:
+        pytest.skip("NumPy não instalado")
+    with usar_motor(request.param):
+        yield request.param
+
+def geral(m, n=None, inicio=1):
+    n = m if n is None else n
+    return MatrizGeral(m, n, [float(v) for v in range(inicio, inicio + m * n)])
+
+def geral_aleatoria(m, n=None, limite=9):
+    n = m if n is None else n
+    return MatrizGeral(m, n, [float(random.randint(-limite, limite)) for _ in range(m * n)])
+
+def produto_denso(a, b):
+    return [[sum(x * y for x, y in zip(linha, coluna)) for coluna in zip(*b)] for linha in a]
@@ -0,0 +1,28 @@
+from array import array
+
+import pytest
+
+from calculadorap import MatrizDiagonal, MatrizGeral, MatrizTriangularInferior, MatrizTriangularSuperior
+
+def test_buffer_d_usado_sem_copia():
+    dados = array("d", [1.0, 2.0, 3.0, 4.0])
+    A = MatrizGeral(2, 2, dados)
+    assert A.dados is dados
+    vista = memoryview(dados)
+    assert MatrizGeral(2, 2, vista).dados is vista
+    assert MatrizGeral(2, 2, [[1, 2], [3, 4]]).dados == dados
+
+def test_layout_empacotado_das_triangulares():
+    L = MatrizTriangularInferior(3, [[1.0], [2.0, 3.0], [4.0, 5.0, 6.0]])
+    U = MatrizTriangularSuperior(3, [[1.0, 2.0, 3.0], [4.0, 5.0], [6.0]])
+    assert L.dados.tolist() == U.dados.tolist() == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    assert L.to_array() == [[1.0, 0.0, 0.0], [2.0, 3.0, 0.0], [4.0, 5.0, 6.0]]
+    assert U.to_array() == [[1.0, 2.0, 3.0], [0.0, 4.0, 5.0], [0.0, 0.0, 6.0]]
+    assert L.tamanho_bytes() == U.tamanho_bytes() == 6 * 8
+    assert MatrizDiagonal(3, [1.0, 2.0, 3.0]).tamanho_bytes() == 3 * 8
+
+def test_tamanho_do_armazenamento_validado():
+    with pytest.raises(ValueError):
+        MatrizTriangularInferior(3, [1.0, 2.0])
+    with pytest.raises(ValueError):
+        MatrizGeral(2, 2, array("d", [1.0]))
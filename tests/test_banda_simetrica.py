@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from calculadorap import MatrizBanda, MatrizDiagonal, MatrizGeral, MatrizSimetrica
+
+def banda_aleatoria(n, inferior, superior):
+    return MatrizBanda(n, inferior, superior, [float(random.randint(-5, 5)) for _ in range((inferior + superior + 1) * n)])
+
+def simetrica_aleatoria(n):
+    return MatrizSimetrica(n, [float(random.randint(-5, 5)) for _ in range(n * (n + 1) // 2)])
+
+def densa(m):
+    return MatrizGeral(m.linhas, m.colunas, m.to_array())
+
+def test_banda_por_diagonais():
+    B = MatrizBanda(3, 1, 1, [[1.0, 2.0], [3.0, 4.0, 5.0], [6.0, 7.0]])
+    assert B.to_array() == [[3.0, 6.0, 0.0], [1.0, 4.0, 7.0], [0.0, 2.0, 5.0]]
+    with pytest.raises(ValueError):
+        B.set_elemento(0, 2, 1.0)
+
+def test_operacoes_da_banda_iguais_as_densas():
+    random.seed(3)
+    A, B = banda_aleatoria(6, 1, 2), banda_aleatoria(6, 2, 0)
+    assert isinstance(A + B, MatrizBanda) and (A + B).to_array() == (densa(A) + densa(B)).to_array()
+    assert isinstance(A * B, MatrizBanda) and (A * B).to_array() == (densa(A) * densa(B)).to_array()
+    assert A.transposta().to_array() == [list(c) for c in zip(*A.to_array())]
+
+def test_lu_da_banda_com_pivoteamento():
+    random.seed(4)
+    for _ in range(20):
+        A = banda_aleatoria(7, 2, 1)
+        assert A.determinante() == pytest.approx(densa(A).determinante(), rel=1e-9, abs=1e-9)
+    # Primeiro pivô nulo: exige troca de linhas
+    A = MatrizBanda(3, 1, 1, [[1.0, 1.0], [0.0, 2.0, 3.0], [1.0, 1.0]])
+    b = [1.0, 2.0, 3.0]
+    x = A.resolver(b)
+    assert [sum(a * v for a, v in zip(linha, x)) for linha in A.to_array()] == pytest.approx(b)
+
+def test_simetrica_empacotada():
+    S = MatrizSimetrica(3, [[1.0, 2.0, 3.0], [4.0, 5.0], [6.0]])
+    assert S.to_array() == [[1.0, 2.0, 3.0], [2.0, 4.0, 5.0], [3.0, 5.0, 6.0]]
+    S.set_elemento(2, 0, 9.0)
+    assert S.get_elemento(0, 2) == 9.0
+    assert isinstance(S + MatrizDiagonal(3, [1.0, 1.0, 1.0]), MatrizSimetrica)
+
+def test_determinante_da_simetrica_igual_ao_denso():
+    random.seed(5)
+    for n in (1, 2, 5, 9):
+        for _ in range(10):
+            S = simetrica_aleatoria(n)
+            assert S.determinante() == pytest.approx(densa(S).determinante(), rel=1e-9, abs=1e-9)
+    # Pivô nulo na diagonal: indefinida, recai no LU com pivoteamento
+    assert MatrizSimetrica(2, [0.0, 1.0, 0.0]).determinante() == pytest.approx(-1.0)
@@ -0,0 +1,40 @@
+import importlib.util
+import os
+
+import pytest
+
+_caminho = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "bench_operacoes.py")
+_especificacao = importlib.util.spec_from_file_location("bench_operacoes", _caminho)
+bench_operacoes = importlib.util.module_from_spec(_especificacao)
+_especificacao.loader.exec_module(bench_operacoes)
+
+def caso(operacao, tempo, calibracao=1.0, pico_bytes=4096, n=64):
+    return {"operacao": operacao, "tipos": ["geral", "geral"], "n": n, "tempo": tempo,
+            "calibracao": calibracao, "pico_bytes": pico_bytes, "blocos": 1}
+
+def comparar(resultados, referencia, tolerancia=0.5, tolerancia_memoria=0.1, tempo_minimo=1e-3):
+    regressoes = bench_operacoes.comparar(resultados, {"resultados": referencia}, tolerancia,
+                                          tolerancia_memoria, tempo_minimo)
+    return [(c["operacao"], campo, pytest.approx(anterior)) for c, campo, anterior in regressoes]
+
+def test_marca_caso_mais_lento_que_a_tolerancia():
+    referencia = [caso("soma", 0.010), caso("produto", 0.010)]
+    assert comparar([caso("soma", 0.014), caso("produto", 0.016)], referencia) == [("produto", "tempo", 0.010)]
+
+def test_tempo_convertido_pela_calibracao():
+    # A máquina atual é duas vezes mais lenta: 0.030 s equivalem a 0.015 s na referência
+    referencia = [caso("soma", 0.010)]
+    assert comparar([caso("soma", 0.030, calibracao=2.0)], referencia) == []
+    assert comparar([caso("soma", 0.020, calibracao=0.5)], referencia) == [("soma", "tempo", 0.005)]
+
+def test_ignora_tempos_abaixo_do_minimo():
+    referencia = [caso("soma", 1e-5), caso("produto", 2e-3)]
+    atuais = [caso("soma", 5e-4), caso("produto", 4e-3)]
+    assert comparar(atuais, referencia) == [("produto", "tempo", 2e-3)]
+    assert comparar(atuais, referencia, tempo_minimo=1e-2) == []
+
+def test_pico_de_memoria_e_casos_sem_referencia():
+    referencia = [caso("soma", 0.010, pico_bytes=100_000)]
+    atuais = [caso("soma", 0.010, pico_bytes=111_000), caso("soma", 0.010, n=128)]
+    assert comparar(atuais, referencia) == []
+    assert comparar([caso("soma", 0.010, pico_bytes=112_000)], referencia) == [("soma", "pico_bytes", 100_000)]
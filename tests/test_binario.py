@@ -0,0 +1,32 @@
+import os
+
+from calculadorap import (CalculadoraMatricial, MatrizDiagonal, MatrizEsparsa, MatrizGeral,
+                          MatrizTriangularInferior, carregar_binario, salvar_binario)
+
+def test_sessao_salva_sobre_o_proprio_arquivo_mapeado(tmp_path):
+    caminho = str(tmp_path / "sessao.cmat")
+    calc = CalculadoraMatricial()
+    calc.inserir_matriz(MatrizGeral(2, 3, [1, 2, 3, 4, 5, 6], "A"))
+    calc.inserir_matriz(MatrizTriangularInferior(3, [1, 2, 3, 4, 5, 6], "L"), resultado=True)
+    calc.inserir_matriz(MatrizEsparsa.de_coo(3, 3, [0, 2], [1, 0], [5.0, 6.0], "E"))
+    esperado = {nome: calc.obter_matriz(nome).to_array() for nome in ("A", "L", "E")}
+    calc.salvar_sessao(caminho)
+
+    calc.carregar_sessao(caminho)
+    calc.salvar_sessao(caminho)
+    calc.obter_matriz("A").set_elemento(0, 0, 10.0)
+    calc.salvar_sessao(caminho)
+    esperado["A"][0][0] = 10.0
+
+    outra = CalculadoraMatricial()
+    outra.carregar_sessao(caminho)
+    assert {nome: outra.obter_matriz(nome).to_array() for nome in esperado} == esperado
+    assert [f for f in os.listdir(tmp_path)] == ["sessao.cmat"]
+
+def test_sobrescrever_arquivo_mapeado_preserva_matrizes_carregadas(tmp_path):
+    caminho = str(tmp_path / "d.cmat")
+    salvar_binario(MatrizDiagonal(4, [1, 2, 3, 4], "D"), caminho)
+    carregada = carregar_binario(caminho)[0]
+    salvar_binario(MatrizGeral(1, 1, [7.0], "G"), caminho)
+    assert carregada.to_array() == MatrizDiagonal(4, [1, 2, 3, 4]).to_array()
+    assert carregar_binario(caminho)[0].to_array() == [[7.0]]
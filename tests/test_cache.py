@@ -0,0 +1,69 @@
+import gc
+import weakref
+
+from calculadorap import (CacheOperacoes, CalculadoraMatricial, MatrizDiagonal, MatrizGeral, MatrizTransposta,
+                          Vetor, somar)
+from conftest import geral
+
+def test_reaproveita_ate_o_operando_mudar():
+    calc = CalculadoraMatricial()
+    A, B = geral(2), geral(2, inicio=5)
+    primeiro = calc.calcular("soma", A, B)
+    segundo = calc.calcular("soma", A, B)
+    assert calc.cache.acertos == 1 and segundo.to_array() == (A + B).to_array()
+    assert primeiro is not segundo and primeiro.dados is not segundo.dados
+    A.set_elemento(0, 0, 10.0)
+    assert calc.calcular("soma", A, B).get_elemento(0, 0) == 15.0
+    assert calc.cache.acertos == 1
+
+def test_copia_devolvida_e_independente():
+    cache = CacheOperacoes()
+    A, B = geral(2), geral(2, inicio=5)
+    C = cache.calcular("soma", (A, B), lambda: A + B)
+    somar(C, C, out=C)
+    assert cache.calcular("soma", (A, B), lambda: A + B).to_array() == (A + B).to_array()
+    assert C._dono is None
+
+def test_entrada_sai_quando_o_operando_e_coletado():
+    cache = CacheOperacoes()
+    A, B = geral(2), geral(2, inicio=5)
+    cache.calcular("soma", (A, B), lambda: A + B)
+    assert len(cache) == 1
+    del A
+    gc.collect()
+    assert len(cache) == 0 and cache.bytes == 0
+
+def test_resultados_que_referenciam_o_operando_nao_sao_guardados():
+    cache = CacheOperacoes()
+    A, D = geral(2), MatrizDiagonal(2, [1.0, 2.0])
+    assert cache.calcular("transposta", (A,), lambda: A.transposta()).to_array() == [[1.0, 3.0], [2.0, 4.0]]
+    cache.calcular("transposta", (D,), lambda: D.transposta())
+    assert len(cache) == 0
+    referencia = weakref.ref(A)
+    del A
+    gc.collect()
+    assert referencia() is None
+
+def test_limite_de_bytes():
+    cache = CacheOperacoes(limite_bytes=40)
+    A, B = geral(2), geral(2, inicio=5)
+    cache.calcular("soma", (A, B), lambda: A + B)
+    cache.calcular("subtracao", (A, B), lambda: A - B)
+    assert len(cache) == 1 and cache.bytes == 32
+
+def test_resultado_nao_guardado_e_devolvido_sem_copia():
+    A = geral(2)
+    resultado = MatrizGeral(2, 2)
+    assert CacheOperacoes(capacidade=0).calcular("soma", (A,), lambda: resultado) is resultado
+    T = CalculadoraMatricial().calcular("transposta", A)
+    assert isinstance(T, MatrizTransposta) and T.base is A
+
+def test_operandos_vetor_e_sequencia():
+    calc = CalculadoraMatricial()
+    A = MatrizGeral(2, 2, [2.0, 0.0, 0.0, 4.0])
+    for b in (Vetor(2, [1.0, 2.0]), [1.0, 2.0]):
+        assert list(calc.calcular("resolver", A, b)) == [0.5, 0.5]
+        assert list(calc.calcular("resolver", A, b)) == [0.5, 0.5]
+    assert calc.cache.acertos == 2
+    assert list(calc.calcular("resolver", A, [2.0, 2.0])) == [1.0, 0.5]
+    assert calc.cache.acertos == 2
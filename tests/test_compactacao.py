@@ -0,0 +1,53 @@
+import pytest
+
+from calculadorap import (MatrizBanda, MatrizDiagonal, MatrizEsparsa, MatrizGeral, MatrizSimetrica,
+                          MatrizTriangularInferior, MatrizTriangularSuperior, compactar, usar_compactacao)
+
+@pytest.mark.parametrize("linhas, classe", [
+    ([[1.0, 0.0, 0.0, 0.0], [0.0, 2.0, 0.0, 0.0], [0.0, 0.0, 3.0, 0.0], [0.0, 0.0, 0.0, 4.0]], MatrizDiagonal),
+    ([[1.0, 0.0, 0.0, 0.0], [2.0, 3.0, 0.0, 0.0], [4.0, 5.0, 6.0, 0.0], [7.0, 8.0, 9.0, 1.0]], MatrizTriangularInferior),
+    ([[1.0, 2.0, 3.0, 4.0], [0.0, 5.0, 6.0, 7.0], [0.0, 0.0, 8.0, 9.0], [0.0, 0.0, 0.0, 1.0]], MatrizTriangularSuperior),
+    ([[1.0, 2.0, 0.0, 0.0], [3.0, 4.0, 5.0, 0.0], [0.0, 6.0, 7.0, 8.0], [0.0, 0.0, 9.0, 1.0]], MatrizBanda),
+    ([[1.0, 2.0, 3.0, 4.0], [2.0, 5.0, 6.0, 7.0], [3.0, 6.0, 8.0, 9.0], [4.0, 7.0, 9.0, 1.0]], MatrizSimetrica),
+    ([[1.0, 2.0, 3.0, 4.0], [5.0, 6.0, 7.0, 8.0], [9.0, 1.0, 2.0, 3.0], [4.0, 5.0, 6.0, 7.0]], MatrizGeral),
+])
+def test_estrutura_mais_economica(linhas, classe):
+    m = compactar(MatrizGeral(4, 4, linhas))
+    assert type(m) is classe and m.to_array() == linhas
+
+def test_tolerancia():
+    m = MatrizGeral(2, 2, [1.0, 1e-12, 0.0, 2.0])
+    assert type(compactar(m)) is MatrizTriangularSuperior
+    assert type(compactar(m, 1e-9)) is MatrizDiagonal
+
+def test_compactacao_automatica_dos_resultados():
+    A = MatrizGeral(2, 2, [1.0, 2.0, 0.0, 3.0])
+    B = MatrizGeral(2, 2, [1.0, -2.0, 0.0, 1.0])
+    assert type(A + B) is MatrizGeral
+    with usar_compactacao():
+        soma = A + B
+        assert type(soma) is MatrizDiagonal and soma.to_array() == [[2.0, 0.0], [0.0, 4.0]]
+        assert type(A * MatrizGeral(2, 2, [1.0, 1.0, 0.0, 1.0])) is MatrizTriangularSuperior
+
+def test_compacta_resultados_esparsos_banda_e_simetricos():
+    n = 5
+    E = MatrizEsparsa.de_coo(n, n, list(range(n)) + list(range(1, n)), list(range(n)) + list(range(n - 1)),
+                             [float(v) for v in range(1, 2 * n)])
+    F = MatrizEsparsa.de_coo(n, n, list(range(1, n)), list(range(n - 1)), [float(v) for v in range(n + 1, 2 * n)])
+    B = MatrizBanda(n, 1, 1, [float(v) for v in range(1, 3 * n + 1)])
+    S = MatrizSimetrica(n, [float(v) for v in range(1, n * (n + 1) // 2 + 1)])
+    casos = [(lambda: E + E, MatrizBanda), (lambda: E - F, MatrizDiagonal),
+             (lambda: E * MatrizDiagonal(n, [2.0] * n), MatrizBanda),
+             (lambda: B - B, MatrizDiagonal), (lambda: S - S, MatrizDiagonal)]
+    for operacao, classe in casos:
+        esperado = operacao()
+        with usar_compactacao():
+            resultado = operacao()
+        assert type(resultado) is classe and resultado.to_array() == esperado.to_array()
+
+def test_esparsa_sem_estrutura_continua_esparsa():
+    n = 2000
+    E = MatrizEsparsa.de_coo(n, n, [0, n - 1], [n - 1, 0], [1.0, 2.0])
+    assert compactar(E) is E
+    with usar_compactacao():
+        assert type(E + E) is MatrizEsparsa
@@ -0,0 +1,40 @@
+import pytest
+
+from calculadorap import MatrizGeral, Vetor
+from conftest import produto_denso
+
+pytestmark = pytest.mark.usefixtures("motor")
+
+def sistema():
+    return MatrizGeral(3, 3, [[2.0, 1.0, 1.0], [4.0, -6.0, 0.0], [-2.0, 7.0, 2.0]])
+
+def test_determinante():
+    A = sistema()
+    assert A.determinante() == pytest.approx(-16.0)
+    assert MatrizGeral(2, 2, [[0.0, 1.0], [1.0, 0.0]]).determinante() == pytest.approx(-1.0)
+    assert MatrizGeral(2, 2, [[1.0, 2.0], [2.0, 4.0]]).determinante() == 0.0
+
+def test_decomposicao_lu_reconstroi_a_matriz():
+    A = sistema()
+    permutacao, L, U = A.decomposicao_lu()
+    permutada = [A.to_array()[p] for p in permutacao]
+    assert produto_denso(L.to_array(), U.to_array()) == [pytest.approx(linha) for linha in permutada]
+
+def test_resolver_e_inversa():
+    A = sistema()
+    b = [5.0, -2.0, 9.0]
+    x = A.resolver(b)
+    assert [sum(a * v for a, v in zip(linha, x)) for linha in A.to_array()] == pytest.approx(b)
+    assert A.resolver(Vetor(3, b)).tolist() == pytest.approx(x)
+    identidade = produto_denso(A.to_array(), A.inversa().to_array())
+    assert identidade == [pytest.approx([1.0 if i == j else 0.0 for j in range(3)]) for i in range(3)]
+
+def test_fatoracao_descartada_apos_alteracao():
+    B = MatrizGeral(2, 2, [[1.0, 2.0], [3.0, 4.0]])
+    assert B.determinante() == pytest.approx(-2.0)
+    B.set_elemento(0, 0, 5.0)
+    assert B.determinante() == pytest.approx(14.0)
+
+def test_singular_nao_resolve():
+    with pytest.raises(ValueError):
+        MatrizGeral(2, 2, [[1.0, 2.0], [2.0, 4.0]]).resolver([1.0, 1.0])
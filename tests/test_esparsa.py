@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from calculadorap import MatrizDiagonal, MatrizEsparsa, MatrizGeral
+
+pytestmark = pytest.mark.usefixtures("motor")
+
+def esparsa_aleatoria(n, quantidade):
+    return MatrizEsparsa.de_coo(n, n, [random.randrange(n) for _ in range(quantidade)],
+                                [random.randrange(n) for _ in range(quantidade)],
+                                [float(random.randint(-5, 5)) for _ in range(quantidade)])
+
+def test_de_coo_soma_repetidas_e_valida_indices():
+    E = MatrizEsparsa.de_coo(2, 3, [1, 0, 1], [2, 0, 2], [1.0, 4.0, 2.0])
+    assert E.to_array() == [[4.0, 0.0, 0.0], [0.0, 0.0, 3.0]]
+    with pytest.raises(ValueError):
+        MatrizEsparsa.de_coo(2, 2, [2], [0], [1.0])
+
+def test_operacoes_iguais_as_densas():
+    random.seed(1)
+    A, B = esparsa_aleatoria(6, 10), esparsa_aleatoria(6, 10)
+    G = MatrizGeral(6, 6, [float(v) for v in range(36)])
+    densa = lambda m: MatrizGeral(6, 6, m.to_array())
+    assert isinstance(A + B, MatrizEsparsa)
+    assert (A + B).to_array() == (densa(A) + densa(B)).to_array()
+    assert (A - G).to_array() == (densa(A) - G).to_array()
+    assert (A * B).to_array() == (densa(A) * densa(B)).to_array()
+    assert (A * G).to_array() == (densa(A) * G).to_array()
+    assert A.transposta().to_array() == [list(c) for c in zip(*A.to_array())]
+
+def test_set_elemento_insere_e_altera():
+    E = MatrizEsparsa(2, 2)
+    E.set_elemento(1, 0, 5.0)
+    E.set_elemento(1, 0, 6.0)
+    assert E.nao_nulos() == 1 and E.to_array() == [[0.0, 0.0], [6.0, 0.0]]
+
+def test_determinante_sem_densificar_igual_ao_denso():
+    random.seed(2)
+    for n in (1, 3, 8, 15):
+        for _ in range(10):
+            E = esparsa_aleatoria(n, 3 * n)
+            assert E.determinante() == pytest.approx(MatrizGeral(n, n, E.to_array()).determinante(), rel=1e-9, abs=1e-9)
+    permutacao = MatrizEsparsa.de_coo(3, 3, [0, 1, 2], [1, 0, 2], [1.0, 1.0, 1.0])
+    assert permutacao.determinante() == -1.0
+    assert MatrizEsparsa.de_coo(3, 3, [0, 1], [0, 1], [1.0, 1.0]).determinante() == 0.0
+    assert MatrizEsparsa.de_matriz(MatrizDiagonal(3, [2.0, 3.0, 4.0])).determinante() == 24.0
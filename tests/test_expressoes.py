@@ -0,0 +1,43 @@
+import pytest
+
+from calculadorap import MatrizDiagonal, MatrizEsparsa, MatrizTriangularInferior, _ordem_cadeia
+from conftest import geral
+
+def test_combinacao_linear_igual_ao_calculo_imediato():
+    A, B, C = geral(3, 3), geral(3, 3, 10), geral(3, 3, 20)
+    esperado = (A + B * 2.0 - C).to_array()
+    assert (A.adiar() + B.adiar() * 2.0 - C).to_array() == esperado
+
+def test_combinacao_de_tipos_mistos():
+    D, L, G = MatrizDiagonal(3, [1.0, 2.0, 3.0]), MatrizTriangularInferior(3, [1.0] * 6), geral(3, 3)
+    assert type((D.adiar() + L).avaliar()) is MatrizTriangularInferior
+    assert (D.adiar() + L - G * 0.5).to_array() == (D + L - G * 0.5).to_array()
+
+def test_cadeia_de_produtos_reassociada():
+    A, B, C = geral(10, 100), geral(100, 5), geral(5, 50)
+    # (A B) C custa 10*100*5 + 10*5*50; A (B C) custa 100*5*50 + 10*100*50
+    assert _ordem_cadeia([10, 100, 5, 50])[0][2] == 1
+    assert (A.adiar() * B * C).to_array() == ((A * B) * C).to_array()
+
+def test_transposta_dupla_eliminada():
+    A = geral(2, 3)
+    assert A.adiar().transposta().transposta().avaliar() is A
+
+def test_termo_unico_nao_devolve_o_operando():
+    E = MatrizEsparsa.de_coo(2, 2, [0, 1], [1, 0], [3.0, 4.0], "E")
+    expressao = E.adiar() * 1.0
+    expressao.nome = "R"
+    resultado = expressao.avaliar()
+    assert resultado is not E
+    assert E.nome == "E" and resultado.nome == "R"
+    resultado.set_elemento(0, 1, 9.0)
+    assert E.get_elemento(0, 1) == 3.0
+
+def test_transposta_de_vista_nao_devolve_a_base():
+    A = geral(2, 2)
+    resultado = A.transposta().adiar().transposta().avaliar()
+    assert resultado is not A and A.nome == "" and resultado.to_array() == A.to_array()
+
+def test_dimensoes_incompativeis():
+    with pytest.raises(ValueError):
+        geral(2, 2).adiar() + geral(3, 3)
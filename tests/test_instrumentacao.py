@@ -0,0 +1,37 @@
+import json
+
+from calculadorap import (MatrizDiagonal, MatrizGeral, MatrizTriangularInferior, instrumentacao_ativa,
+                          instrumentar, usar_motor)
+
+def test_registra_so_a_operacao_externa():
+    D = MatrizDiagonal(3, [1.0, 2.0, 3.0])
+    L = MatrizTriangularInferior(3, [1.0] * 6)
+    with usar_motor("python"), instrumentar() as coletor:
+        resultado = D + L
+    dados = coletor.como_dict()
+    assert [(e["operacao"], e["esquerda"], e["direita"], e["chamadas"]) for e in dados["operacoes"]] == \
+        [("soma", "MatrizDiagonal", "MatrizTriangularInferior", 1)]
+    assert dados["operacoes"][0]["bytes"] == resultado.tamanho_bytes()
+    assert [(e["via"], e["tipo"], e["chamadas"]) for e in dados["promocoes"]] == [("_para_geral", "MatrizDiagonal", 1)]
+
+def test_escalar_e_contagem_de_acessos():
+    A = MatrizGeral(2, 2, [1.0, 2.0, 3.0, 4.0])
+    with instrumentar() as coletor:
+        A * 2.0
+        A * 2.0
+        A.get_elemento(0, 0)
+    dados = coletor.como_dict()
+    assert [(e["operacao"], e["direita"], e["chamadas"]) for e in dados["operacoes"]] == [("escalar", "float", 2)]
+    assert dados["get_elemento"] == {"MatrizGeral": 1}
+
+def test_desativada_fora_do_bloco(tmp_path):
+    ativa = instrumentacao_ativa()
+    with instrumentar() as coletor:
+        MatrizDiagonal(2, [1.0, 2.0]).traço()
+    assert instrumentacao_ativa() == ativa
+    MatrizDiagonal(2, [1.0, 2.0]).traço()
+    assert sum(e["chamadas"] for e in coletor.como_dict()["operacoes"]) == 1
+    caminho = str(tmp_path / "estatisticas.json")
+    coletor.salvar(caminho)
+    assert json.load(open(caminho, encoding="utf-8"))["operacoes"][0]["operacao"] == "traco"
+    assert "traco" in coletor.relatorio()
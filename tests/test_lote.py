@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from calculadorap import (LoteMatrizes, MatrizDiagonal, MatrizGeral, MatrizTriangularInferior,
+                          MatrizTriangularSuperior)
+from conftest import geral_aleatoria
+
+pytestmark = pytest.mark.usefixtures("motor")
+
+def inferior(n):
+    return MatrizTriangularInferior(n, [float(random.randint(-5, 5)) for _ in range(n * (n + 1) // 2)])
+
+def test_operacoes_iguais_as_individuais():
+    random.seed(8)
+    a, b = [geral_aleatoria(3, limite=5) for _ in range(4)], [geral_aleatoria(3, limite=5) for _ in range(4)]
+    lote_a, lote_b = LoteMatrizes.de_matrizes(a), LoteMatrizes.de_matrizes(b)
+    assert [m.to_array() for m in lote_a + lote_b] == [(x + y).to_array() for x, y in zip(a, b)]
+    assert [m.to_array() for m in lote_a - lote_b] == [(x - y).to_array() for x, y in zip(a, b)]
+    assert [m.to_array() for m in lote_a * lote_b] == [(x * y).to_array() for x, y in zip(a, b)]
+    assert [m.to_array() for m in lote_a * 2.0] == [(x * 2.0).to_array() for x in a]
+    assert [m.to_array() for m in lote_a.transposta()] == [x.transposta().to_array() for x in a]
+    assert lote_a.traço().tolist() == [x.traço() for x in a]
+    assert lote_a.determinante().tolist() == pytest.approx([x.determinante() for x in a])
+
+def test_mesma_matriz_para_todo_o_lote():
+    random.seed(9)
+    a, m = [geral_aleatoria(3, limite=5) for _ in range(3)], geral_aleatoria(3, limite=5)
+    lote = LoteMatrizes.de_matrizes(a)
+    assert [x.to_array() for x in lote * m] == [(y * m).to_array() for y in a]
+    assert [x.to_array() for x in lote.multiplicar_esquerda(m)] == [(m * y).to_array() for y in a]
+
+def test_tipos_estruturados():
+    random.seed(10)
+    L = [inferior(3) for _ in range(3)]
+    D = [MatrizDiagonal(3, [1.0, 2.0, 3.0]) for _ in range(3)]
+    lote_l, lote_d = LoteMatrizes.de_matrizes(L), LoteMatrizes.de_matrizes(D)
+    produto = lote_d * lote_l
+    assert produto.tipo is MatrizTriangularInferior
+    assert [x.to_array() for x in produto] == [(d * l).to_array() for d, l in zip(D, L)]
+    assert lote_l.transposta().tipo is MatrizTriangularSuperior
+    assert (lote_l + lote_d).tipo is MatrizTriangularInferior
+    assert lote_l.determinante().tolist() == [l.determinante() for l in L]
+
+def test_vista_de_cada_matriz_compartilha_o_buffer():
+    lote = LoteMatrizes.de_matrizes([MatrizGeral(2, 2, [1.0, 2.0, 3.0, 4.0])] * 2)
+    lote[1].dados[0] = 9.0
+    assert lote.dados[4] == 9.0 and len(lote) == 2
+    with pytest.raises(ValueError):
+        LoteMatrizes.de_matrizes([MatrizGeral(2, 2), MatrizDiagonal(2)])
@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from calculadorap import (MatrizBanda, MatrizDiagonal, MatrizEsparsa, MatrizGeral, MatrizSimetrica,
+                          MatrizTriangularInferior, MatrizTriangularSuperior)
+from conftest import produto_denso
+
+pytestmark = pytest.mark.usefixtures("motor")
+
+N = 5
+
+def aleatoria(classe):
+    valores = lambda k: [float(random.randint(-4, 4)) for _ in range(k)]
+    if classe is MatrizGeral:
+        return MatrizGeral(N, N, valores(N * N))
+    if classe is MatrizDiagonal:
+        return MatrizDiagonal(N, valores(N))
+    if classe is MatrizEsparsa:
+        return MatrizEsparsa.de_coo(N, N, [random.randrange(N) for _ in range(6)],
+                                    [random.randrange(N) for _ in range(6)], valores(6))
+    if classe is MatrizBanda:
+        return MatrizBanda(N, 1, 2, valores(4 * N))
+    return classe(N, valores(N * (N + 1) // 2))
+
+CLASSES = [MatrizGeral, MatrizDiagonal, MatrizTriangularInferior, MatrizTriangularSuperior,
+           MatrizEsparsa, MatrizBanda, MatrizSimetrica]
+
+@pytest.mark.parametrize("esquerda", CLASSES)
+@pytest.mark.parametrize("direita", CLASSES)
+def test_produto_de_todos_os_pares_igual_ao_denso(esquerda, direita):
+    random.seed(esquerda.__name__ + direita.__name__)
+    a, b = aleatoria(esquerda), aleatoria(direita)
+    assert (a * b).to_array() == produto_denso(a.to_array(), b.to_array())
+
+@pytest.mark.parametrize("classe", [MatrizDiagonal, MatrizTriangularInferior, MatrizTriangularSuperior])
+def test_produto_preserva_a_estrutura(classe):
+    random.seed(7)
+    assert type(aleatoria(classe) * aleatoria(classe)) is classe
+    assert type(aleatoria(MatrizDiagonal) * aleatoria(classe)) is classe
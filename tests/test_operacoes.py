@@ -0,0 +1,85 @@
+from operator import add, sub
+
+import pytest
+
+from calculadorap import (MatrizDiagonal, MatrizGeral, MatrizTriangularInferior, MatrizTriangularSuperior,
+                          multiplicar, somar, subtrair)
+from conftest import geral, produto_denso
+
+def esperado(a, b, operacao):
+    return [[operacao(x, y) for x, y in zip(la, lb)] for la, lb in zip(a.to_array(), b.to_array())]
+
+def test_inplace_com_vista_transposta_do_destino(motor):
+    A = geral(4)
+    resultado = esperado(A, A.transposta(), add)
+    A += A.transposta()
+    assert A.to_array() == resultado
+
+    A = geral(4)
+    resultado = esperado(A, A.transposta(), sub)
+    A -= A.transposta()
+    assert A.to_array() == resultado
+
+def test_out_com_vista_transposta_do_destino(motor):
+    A, B = geral(3), geral(3, inicio=20)
+    resultado = esperado(A.transposta(), B, add)
+    assert somar(A.transposta(), B, out=A) is A
+    assert A.to_array() == resultado
+
+    A = geral(3)
+    resultado = esperado(B, A.transposta(), sub)
+    subtrair(B, A.transposta(), out=A)
+    assert A.to_array() == resultado
+
+    A = geral(3)
+    resultado = (A.transposta() * B).to_array()
+    multiplicar(A.transposta(), B, out=A)
+    assert A.to_array() == resultado
+
+def test_out_com_transposta_de_diagonal_compartilhada(motor):
+    D = MatrizDiagonal(3, [1.0, 2.0, 3.0])
+    somar(D.transposta(), D.transposta(), out=D)
+    assert D.diagonal.tolist() == [2.0, 4.0, 6.0]
+
+@pytest.mark.parametrize("classe", [MatrizTriangularInferior, MatrizTriangularSuperior])
+def test_multiplicar_em_destino_empacotado(motor, classe):
+    A, B = classe(3, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]), classe(3, [2.0, -1.0, 0.5, 3.0, 1.0, -2.0])
+    D = MatrizDiagonal(3, [2.0, 3.0, 4.0])
+    out = classe(3)
+    dados = out.dados
+    assert multiplicar(A, B, out=out) is out and out.dados is dados
+    assert out.to_array() == produto_denso(A.to_array(), B.to_array())
+    multiplicar(D, A, out=out)
+    assert out.to_array() == produto_denso(D.to_array(), A.to_array())
+    multiplicar(A, 2.0, out=out)
+    assert out.dados.tolist() == [2.0 * v for v in A.dados]
+
+def test_multiplicar_em_destino_diagonal(motor):
+    D, E = MatrizDiagonal(3, [1.0, 2.0, 3.0]), MatrizDiagonal(3, [4.0, 5.0, 6.0])
+    out = MatrizDiagonal(3)
+    assert multiplicar(D, E, out=out) is out
+    assert out.diagonal.tolist() == [4.0, 10.0, 18.0]
+    multiplicar(out, out, out=out)
+    assert out.diagonal.tolist() == [16.0, 100.0, 324.0]
+
+def test_multiplicar_com_destino_compartilhado(motor):
+    A = geral(3)
+    resultado = produto_denso(A.to_array(), A.to_array())
+    multiplicar(A, A, out=A)
+    assert A.to_array() == resultado
+
+    L = MatrizTriangularInferior(3, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+    resultado = produto_denso(L.to_array(), L.to_array())
+    multiplicar(L, L, out=L)
+    assert L.to_array() == resultado
+
+def test_multiplicar_rejeita_destino_que_nao_comporta(motor):
+    L = MatrizTriangularInferior(3, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+    U = MatrizTriangularSuperior(3, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+    for a, b, out in [(L, U, L), (L, U, MatrizDiagonal(3, [7.0, 8.0, 9.0])), (geral(3), geral(3), U)]:
+        antes = out.to_array()
+        with pytest.raises(TypeError):
+            multiplicar(a, b, out=out)
+        assert out.to_array() == antes
+    with pytest.raises(ValueError):
+        multiplicar(geral(3), geral(3), out=MatrizGeral(3, 2))
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from calculadorap import (MatrizGeral, multiplicar, paralelismo_atual, usar_motor,
+                          usar_paralelismo)
+from conftest import geral_aleatoria
+
+@pytest.fixture
+def paralelo():
+    with usar_motor("python"), usar_paralelismo(2, limite=1):
+        yield
+
+def test_produto_paralelo_igual_ao_serial(paralelo):
+    random.seed(6)
+    a, b = geral_aleatoria(7, 5), geral_aleatoria(5, 6)
+    with usar_paralelismo(0):
+        esperado = (a * b).to_array()
+        esperado_transposta = (a.transposta() * a).to_array()
+    assert (a * b).to_array() == esperado
+    assert (a.transposta() * a).to_array() == esperado_transposta
+    destino = MatrizGeral(7, 6)
+    assert multiplicar(a, b, out=destino).to_array() == esperado
+
+def test_elementos_e_transposta_paralelos(paralelo):
+    random.seed(7)
+    a, b = geral_aleatoria(5, 3), geral_aleatoria(5, 3)
+    assert (a + b).to_array() == [[x + y for x, y in zip(la, lb)] for la, lb in zip(a.to_array(), b.to_array())]
+    assert (a - b).to_array() == [[x - y for x, y in zip(la, lb)] for la, lb in zip(a.to_array(), b.to_array())]
+    assert a.transposta().materializar().to_array() == [list(c) for c in zip(*a.to_array())]
+
+def test_configuracao_restaurada():
+    anterior = paralelismo_atual()
+    with usar_paralelismo(3, limite=10):
+        assert paralelismo_atual() == (3, 10)
+    assert paralelismo_atual() == anterior
+    with pytest.raises(ValueError):
+        with usar_paralelismo(-1):
+            pass
@@ -0,0 +1,43 @@
+import pytest
+
+from calculadorap import (MatrizDiagonal, MatrizEsparsa, MatrizGeral, MatrizTriangularInferior,
+                          avaliar_polinomio)
+from conftest import produto_denso
+
+pytestmark = pytest.mark.usefixtures("motor")
+
+A = MatrizGeral(2, 2, [1.0, 1.0, 1.0, 0.0])
+
+def potencia_densa(a, k):
+    resultado = [[1.0 if i == j else 0.0 for j in range(len(a))] for i in range(len(a))]
+    for _ in range(k):
+        resultado = produto_denso(resultado, a)
+    return resultado
+
+@pytest.mark.parametrize("k", [0, 1, 2, 5, 10])
+def test_potencia_igual_a_produtos_repetidos(k):
+    assert (A ** k).to_array() == potencia_densa(A.to_array(), k)
+
+def test_potencia_preserva_a_estrutura_e_nao_devolve_o_operando():
+    L = MatrizTriangularInferior(3, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+    assert type(L ** 3) is MatrizTriangularInferior
+    assert (L ** 3).to_array() == potencia_densa(L.to_array(), 3)
+    assert type(L ** 0) is MatrizTriangularInferior
+    E = MatrizEsparsa.de_coo(2, 2, [0], [1], [2.0])
+    assert E ** 1 is not E and (E ** 1).to_array() == E.to_array()
+    assert (MatrizDiagonal(2, [2.0, 3.0]) ** 3).to_array() == [[8.0, 0.0], [0.0, 27.0]]
+
+def test_potencia_negativa():
+    assert (A ** -2).to_array() == [pytest.approx(linha) for linha in potencia_densa(A.inversa().to_array(), 2)]
+    with pytest.raises(TypeError):
+        A ** 1.5
+
+def test_polinomio_de_horner():
+    coeficientes = [2.0, -1.0, 0.0, 3.0]
+    esperado = [[sum(c * p[i][j] for c, p in zip(coeficientes, (potencia_densa(A.to_array(), k) for k in range(4))))
+                 for j in range(2)] for i in range(2)]
+    assert avaliar_polinomio(A, coeficientes).to_array() == esperado
+    L = MatrizTriangularInferior(2, [1.0, 2.0, 3.0])
+    assert type(L.avaliar_polinomio([1.0, 1.0])) is MatrizTriangularInferior
+    with pytest.raises(ValueError):
+        avaliar_polinomio(A, [])
@@ -0,0 +1,24 @@
+import random
+
+import pytest
+
+from calculadorap import definir_tamanho_bloco, usar_motor
+from conftest import geral_aleatoria, produto_denso
+
+@pytest.fixture
+def bloco_pequeno():
+    definir_tamanho_bloco(3)
+    yield
+    definir_tamanho_bloco(256)
+
+@pytest.mark.parametrize("m, n, p", [(1, 1, 1), (7, 5, 4), (8, 9, 10), (3, 6, 3)])
+def test_produto_em_blocos_igual_ao_denso(bloco_pequeno, m, n, p):
+    random.seed(m * 100 + n * 10 + p)
+    a, b = geral_aleatoria(m, n), geral_aleatoria(n, p)
+    with usar_motor("python"):
+        assert (a * b).to_array() == produto_denso(a.to_array(), b.to_array())
+        assert (a.transposta() * a).to_array() == produto_denso(a.transposta().to_array(), a.to_array())
+
+def test_tamanho_de_bloco_invalido():
+    with pytest.raises(ValueError):
+        definir_tamanho_bloco(0)
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from calculadorap import CalculadoraMatricial, MatrizDiagonal, MatrizGeral
+
+def constante(n, valor, nome=""):
+    return MatrizGeral(n, n, [valor] * (n * n), nome)
+
+def test_nomes_sao_handles_estaveis():
+    calc = CalculadoraMatricial()
+    assert calc.inserir_matriz(constante(2, 1.0, "A")) == "A"
+    assert calc.inserir_matriz(constante(2, 2.0, "A")) == "A_2"
+    assert calc.inserir_matriz(constante(2, 3.0)) == "M1"
+    calc.remover_matriz("A")
+    assert calc.obter_matriz("A_2").get_elemento(0, 0) == 2.0
+    assert calc.obter_matriz(1) is calc.obter_matriz("M1")
+    with pytest.raises(KeyError):
+        calc.obter_matriz("A")
+    assert calc.bytes_em_memoria == 2 * 32
+
+def test_limite_descarta_os_resultados_menos_usados():
+    calc = CalculadoraMatricial(limite_memoria=3 * 32)
+    calc.inserir_matriz(constante(2, 1.0, "A"))
+    for nome in ("R1", "R2", "R3"):
+        calc.inserir_matriz(constante(2, 1.0, nome), resultado=True)
+    assert sorted(calc._matrizes) == ["A", "R2", "R3"]
+    assert calc.bytes_em_memoria <= calc.limite_memoria
+
+def test_despejo_em_disco_e_recarga(tmp_path):
+    calc = CalculadoraMatricial(limite_memoria=2 * 32, pasta_despejo=str(tmp_path))
+    calc.inserir_matriz(constante(2, 1.0, "R1"), resultado=True)
+    calc.inserir_matriz(MatrizDiagonal(2, [5.0, 6.0], "R2"), resultado=True)
+    calc.inserir_matriz(constante(2, 3.0, "R3"), resultado=True)
+    assert len(os.listdir(tmp_path)) == 1 and calc.bytes_em_memoria <= 2 * 32
+    assert calc.obter_matriz("R1").to_array() == [[1.0, 1.0], [1.0, 1.0]]
+    assert calc.bytes_em_memoria <= 2 * 32
+    calc.zerar_lista()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,43 @@
+import io
+
+import pytest
+
+from calculadorap import CalculadoraMatricial, MatrizGeral, escrever_csv, main
+
+SCRIPT = """
+# comentário
+identidade I 2
+C = A + I
+D = C * 2
+E = D ^ 2
+traco E
+salvar E {saida}
+"""
+
+def test_script_executa_comandos_em_ordem(tmp_path):
+    calc = CalculadoraMatricial()
+    calc.inserir_matriz(MatrizGeral(2, 2, [1.0, 2.0, 3.0, 4.0], "A"))
+    saida = io.StringIO()
+    caminho = str(tmp_path / "e.csv")
+    assert calc.executar_script(SCRIPT.format(saida=caminho).splitlines(), saida) == 6
+    C = [[2.0, 2.0], [3.0, 5.0]]
+    D = [[2 * v for v in linha] for linha in C]
+    E = [[sum(x * y for x, y in zip(linha, coluna)) for coluna in zip(*D)] for linha in D]
+    assert calc.obter_matriz("E").to_array() == E
+    assert f"traco E = {E[0][0] + E[1][1]!r}" in saida.getvalue()
+    assert open(caminho).read().splitlines() == [",".join(map(repr, linha)) for linha in E]
+
+def test_erro_informa_a_linha():
+    calc = CalculadoraMatricial()
+    with pytest.raises(ValueError, match="Linha 2"):
+        calc.executar_script(["identidade I 2", "C = I + X"], io.StringIO())
+
+def test_main_com_matriz_e_arquivo_de_saida(tmp_path):
+    escrever_csv(MatrizGeral(2, 2, [1.0, 0.0, 2.0, 3.0]), str(tmp_path / "a.csv"))
+    script = tmp_path / "s.txt"
+    script.write_text("B = transposta A\ndeterminante B\n")
+    saida = tmp_path / "saida.txt"
+    assert main([str(script), "-m", f"A={tmp_path / 'a.csv'}", "-o", str(saida)]) == 0
+    texto = saida.read_text()
+    assert "determinante B = 3.0" in texto and "2 comandos" in texto
+    assert main([str(tmp_path / "nao_existe.txt")]) == 1
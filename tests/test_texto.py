@@ -0,0 +1,57 @@
+import pytest
+
+from calculadorap import (MatrizDiagonal, MatrizEsparsa, MatrizGeral, MatrizSimetrica,
+                          MatrizTriangularInferior, MatrizTriangularSuperior, escrever_csv,
+                          escrever_matrix_market, ler_csv, ler_matrix_market)
+
+def escrever(caminho, linhas):
+    with open(caminho, "w") as arquivo:
+        arquivo.write("\n".join(linhas) + "\n")
+
+@pytest.mark.parametrize("linhas, classe", [
+    ([[1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [0.0, 0.0, 3.0]], MatrizDiagonal),
+    ([[1.0, 0.0, 0.0], [4.0, 2.0, 0.0], [5.0, 6.0, 3.0]], MatrizTriangularInferior),
+    ([[1.0, 4.0, 5.0], [0.0, 2.0, 6.0], [0.0, 0.0, 3.0]], MatrizTriangularSuperior),
+    ([[1.0, 0.0, 0.0], [0.0, 2.0, 7.0], [8.0, 0.0, 3.0]], MatrizGeral),
+    ([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]], MatrizGeral),
+])
+def test_csv_detecta_a_estrutura(tmp_path, linhas, classe):
+    caminho = str(tmp_path / "m.csv")
+    escrever(caminho, [",".join(map(str, linha)) for linha in linhas])
+    m = ler_csv(caminho)
+    assert type(m) is classe and m.to_array() == linhas
+    assert type(ler_csv(caminho, detectar=False)) is MatrizGeral
+
+def test_csv_esparsa_e_ida_e_volta(tmp_path):
+    caminho = str(tmp_path / "m.csv")
+    densa = [[0.0] * 20 for _ in range(20)]
+    densa[3][7], densa[15][2] = 1.5, -2.25
+    escrever_csv(MatrizGeral(20, 20, densa), caminho)
+    m = ler_csv(caminho)
+    assert isinstance(m, MatrizEsparsa) and m.to_array() == densa
+
+def test_matrix_market_ida_e_volta(tmp_path):
+    caminho = str(tmp_path / "m.mtx")
+    for m in (MatrizGeral(2, 3, [1.0, 0.0, 2.0, 0.0, 3.0, 4.0]),
+              MatrizSimetrica(3, [1.0, 2.0, 0.0, 4.0, 5.0, 6.0]),
+              MatrizEsparsa.de_coo(30, 30, [1, 29], [28, 0], [0.1, 7.0])):
+        escrever_matrix_market(m, caminho)
+        lida = ler_matrix_market(caminho)
+        assert type(lida) is type(m) and lida.to_array() == m.to_array()
+
+def test_matrix_market_simetrica_e_pattern(tmp_path):
+    caminho = str(tmp_path / "m.mtx")
+    escrever(caminho, ["%%MatrixMarket matrix coordinate pattern skew-symmetric", "% comentário", "3 3 1", "3 1"])
+    assert ler_matrix_market(caminho, detectar=False).to_array() == [[0.0, 0.0, -1.0], [0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]
+    escrever(caminho, ["%%MatrixMarket matrix array real general", "2 2", "1", "3", "2", "4"])
+    assert ler_matrix_market(caminho).to_array() == [[1.0, 2.0], [3.0, 4.0]]
+
+@pytest.mark.parametrize("dimensao, entrada", [(3, "0 0 5"), (3, "4 1 5"), (3, "1 4 5"), (100, "0 0 5"), (100, "1 101 5")])
+@pytest.mark.parametrize("simetria", ["general", "symmetric"])
+def test_matrix_market_indice_fora_das_dimensoes(tmp_path, dimensao, entrada, simetria):
+    # dimensão 3: armazenamento denso ou simétrico; 100: triplas da MatrizEsparsa
+    caminho = str(tmp_path / "m.mtx")
+    escrever(caminho, [f"%%MatrixMarket matrix coordinate real {simetria}", "% comentário",
+                       f"{dimensao} {dimensao} 2", "1 1 2.0", entrada])
+    with pytest.raises(ValueError, match="Linha 5"):
+        ler_matrix_market(caminho)
@@ -0,0 +1,44 @@
+import pytest
+
+from calculadorap import (MatrizDiagonal, MatrizGeral, MatrizTransposta, MatrizTriangularInferior,
+                          MatrizTriangularSuperior)
+
+pytestmark = pytest.mark.usefixtures("motor")
+
+def transposta_densa(m):
+    return [list(coluna) for coluna in zip(*m.to_array())]
+
+def test_vista_compartilha_o_armazenamento():
+    A = MatrizGeral(2, 3, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+    T = A.transposta()
+    assert isinstance(T, MatrizTransposta) and T.tamanho_bytes() == 0
+    assert T.to_array() == transposta_densa(A)
+    A.set_elemento(0, 2, 9.0)
+    assert T.get_elemento(2, 0) == 9.0
+    assert T.versao_dados() == A.versao_dados()
+    assert T.transposta() is A
+
+def test_materializar_copia():
+    A = MatrizGeral(2, 3, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+    copia = A.transposta().materializar()
+    A.set_elemento(0, 0, 7.0)
+    assert copia.get_elemento(0, 0) == 1.0
+
+def test_transposta_das_triangulares():
+    L = MatrizTriangularInferior(3, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+    assert type(L.transposta().materializar()) is MatrizTriangularSuperior
+    assert L.transposta().to_array() == transposta_densa(L)
+    U = MatrizTriangularSuperior(3, [1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+    assert type(U.transposta().materializar()) is MatrizTriangularInferior
+
+def test_operacoes_com_vistas():
+    A = MatrizGeral(2, 2, [1.0, 2.0, 3.0, 4.0])
+    B = MatrizGeral(2, 2, [5.0, 6.0, 7.0, 8.0])
+    assert (A.transposta() + B).to_array() == [[6.0, 9.0], [9.0, 12.0]]
+    assert (A.transposta() - B.transposta()).to_array() == transposta_densa(A - B)
+    assert (A.transposta() * 2.0).to_array() == transposta_densa(A * 2.0)
+
+def test_transposta_da_diagonal_e_ela_mesma():
+    D = MatrizDiagonal(2, [1.0, 2.0])
+    T = D.transposta()
+    assert T.diagonal is D.diagonal and T.versao_dados() == D.versao_dados()
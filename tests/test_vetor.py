@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from calculadorap import (MatrizBanda, MatrizDiagonal, MatrizEsparsa, MatrizGeral, MatrizSimetrica,
+                          MatrizTriangularInferior, MatrizTriangularSuperior, Vetor)
+
+pytestmark = pytest.mark.usefixtures("motor")
+
+N = 5
+
+def inteiros(k):
+    return [float(random.randint(-4, 4)) for _ in range(k)]
+
+MATRIZES = {
+    "geral": lambda: MatrizGeral(N, N, inteiros(N * N)),
+    "diagonal": lambda: MatrizDiagonal(N, inteiros(N)),
+    "inferior": lambda: MatrizTriangularInferior(N, inteiros(N * (N + 1) // 2)),
+    "superior": lambda: MatrizTriangularSuperior(N, inteiros(N * (N + 1) // 2)),
+    "esparsa": lambda: MatrizEsparsa.de_coo(N, N, [0, 2, 4], [3, 2, 0], [1.0, 2.0, 3.0]),
+    "banda": lambda: MatrizBanda(N, 1, 1, inteiros(3 * N)),
+    "simetrica": lambda: MatrizSimetrica(N, inteiros(N * (N + 1) // 2)),
+    "transposta": lambda: MatrizGeral(N, N, inteiros(N * N)).transposta(),
+}
+
+@pytest.mark.parametrize("tipo", MATRIZES)
+def test_produto_matriz_vetor_igual_ao_denso(tipo):
+    random.seed(tipo)
+    m, x = MATRIZES[tipo](), inteiros(N)
+    esperado = [sum(a * v for a, v in zip(linha, x)) for linha in m.to_array()]
+    y = m @ Vetor(N, x)
+    assert isinstance(y, Vetor) and y.tolist() == esperado
+    assert (m @ x).tolist() == esperado
+    assert [v.tolist() for v in m @ [x, x]] == [esperado, esperado]
+
+def test_operacoes_do_vetor():
+    x, y = Vetor(3, [1.0, 2.0, 2.0]), Vetor(3, [1.0, 0.0, -1.0])
+    assert (x + y).tolist() == [2.0, 2.0, 1.0]
+    assert (x - y).tolist() == [0.0, 2.0, 3.0]
+    assert (2.0 * x).tolist() == [2.0, 4.0, 4.0]
+    assert x.produto_interno(y) == -1.0 and x.norma() == 3.0
+    with pytest.raises(ValueError):
+        MatrizGeral(2, 3) @ x.tolist()[:2]